@@ -0,0 +1,231 @@
+from collections import deque
+from typing import Dict, Optional
+from .config import (
+    ADMISSION_SLOTS, ADMISSION_QUEUE_SIZE, ADMISSION_INTERACTIVE_SLOTS, ADMISSION_AGING_MS,
+    INTERACTIVE_MAX_TESTS, INTERACTIVE_MAX_TIME_LIMIT_MS
+)
+from .models import JudgeLane, JudgeRequest
+from .metrics import admission_rejections_total, admission_wait_seconds, admission_submissions
+import math, threading, time
+
+RETRY_AFTER_MAX_S = 60
+LANES = (JudgeLane.INTERACTIVE, JudgeLane.BATCH)
+
+class AdmissionRejected(Exception):
+    """Antrian admission penuh, request sebaiknya dikirim ulang setelah retry_after_s"""
+    def __init__(self, retry_after_s: int, message: str = "Judge overloaded, retry later"):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+def lane_for(payload: JudgeRequest) -> JudgeLane:
+    """
+    Lane yang dipakai payload. Request interactive yang melebihi batas lane
+    (jumlah test case, time limit, test data problem store) dijalankan di
+    lane batch supaya slot interactive tetap cepat.
+    """
+    if payload.lane != JudgeLane.INTERACTIVE:
+        return JudgeLane.BATCH
+    if (
+        payload.problem_id
+        or len(payload.test_cases) > INTERACTIVE_MAX_TESTS
+        or (payload.time_limit_ms or 0) > INTERACTIVE_MAX_TIME_LIMIT_MS
+    ):
+        return JudgeLane.BATCH
+    return JudgeLane.INTERACTIVE
+
+class Ticket:
+    """
+    Satu tempat di antrian admission. wait() blok sampai mendapat slot
+    eksekusi, release() mengembalikan slot (atau keluar dari antrian jika
+    belum sempat mendapat slot).
+    """
+    def __init__(self, controller: "AdmissionController", lane: JudgeLane):
+        self._controller = controller
+        self._event = threading.Event()
+        self.lane = lane
+        self.enqueued_at = time.perf_counter()
+        self.granted_at: Optional[float] = None
+        self.released = False
+
+    @property
+    def queue_wait_ms(self) -> float:
+        if self.granted_at is None:
+            return 0.0
+        return (self.granted_at - self.enqueued_at) * 1000
+
+    def wait(self) -> float:
+        """Tunggu slot, return lama menunggu (ms)"""
+        self._event.wait()
+        return self.queue_wait_ms
+
+    def release(self):
+        self._controller._release(self)
+
+    def __enter__(self):
+        self.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def _grant(self):
+        self.granted_at = time.perf_counter()
+        admission_wait_seconds.labels(self.lane.value).observe(self.granted_at - self.enqueued_at)
+        self._event.set()
+
+class _Lane:
+    def __init__(self):
+        self.running = 0
+        self.waiting: deque = deque()
+        self.wait_ewma_ms = 0.0
+        self.stats = {"admitted": 0, "queued": 0, "rejected": 0}
+
+class AdmissionController:
+    """
+    Batas global submission yang di-judge bersamaan (slot eksekusi) dengan
+    antrian tunggu FIFO terbatas per lane.
+
+    Lane interactive boleh memakai semua slot dan punya interactive_slots
+    slot yang tidak boleh dipakai lane batch, sehingga "Run" di editor tidak
+    menunggu di belakang judging penuh. Slot yang kosong diberikan ke
+    antrian interactive lebih dulu, kecuali submission batch terdepan sudah
+    menunggu lebih dari aging_ms (anti starvation).
+
+    reserve() tidak pernah blok: langsung mendapat slot, masuk antrian, atau
+    AdmissionRejected jika antrian lane penuh (dipakai di HTTP edge supaya
+    request ditolak cepat). reserve(force=True) selalu masuk antrian, dipakai
+    untuk pekerjaan yang sudah diterima (job queue async, item batch).
+
+    Retry-After diperkirakan dari rata-rata (EWMA) lama satu slot dipakai
+    dikali jumlah antrian per slot lane tersebut.
+    """
+
+    def __init__(
+        self,
+        slots: int = ADMISSION_SLOTS,
+        max_queue: int = ADMISSION_QUEUE_SIZE,
+        interactive_slots: int = ADMISSION_INTERACTIVE_SLOTS,
+        aging_ms: float = ADMISSION_AGING_MS
+    ):
+        self.slots = max(1, slots)
+        # Lane batch selalu punya minimal satu slot
+        self.interactive_slots = max(0, min(interactive_slots, self.slots - 1))
+        self.max_queue = max_queue
+        self.aging_s = aging_ms / 1000
+
+        self._lanes: Dict[JudgeLane, _Lane] = {lane: _Lane() for lane in LANES}
+        self._lock = threading.Lock()
+        self._hold_ewma_s = 1.0
+        for lane, state in self._lanes.items():
+            admission_submissions.labels(lane.value, "running").set_function(lambda state=state: state.running)
+            admission_submissions.labels(lane.value, "waiting").set_function(lambda state=state: len(state.waiting))
+
+    def reserve(self, lane: JudgeLane = JudgeLane.BATCH, force: bool = False) -> Ticket:
+        ticket = Ticket(self, lane)
+        state = self._lanes[lane]
+        with self._lock:
+            if not state.waiting and self._can_start(lane):
+                self._start(ticket)
+                return ticket
+            if not force and len(state.waiting) >= self.max_queue:
+                state.stats["rejected"] += 1
+                retry_after = self._retry_after(lane)
+            else:
+                state.waiting.append(ticket)
+                state.stats["queued"] += 1
+                return ticket
+        admission_rejections_total.labels(lane.value).inc()
+        raise AdmissionRejected(retry_after)
+
+    def check(self, lane: JudgeLane = JudgeLane.BATCH):
+        """AdmissionRejected jika antrian lane sudah penuh (tanpa reservasi)"""
+        state = self._lanes[lane]
+        with self._lock:
+            if len(state.waiting) < self.max_queue or self._can_start(lane):
+                return
+            state.stats["rejected"] += 1
+            retry_after = self._retry_after(lane)
+        admission_rejections_total.labels(lane.value).inc()
+        raise AdmissionRejected(retry_after)
+
+    def estimate_wait_s(self, queued: int, lane: JudgeLane = JudgeLane.BATCH) -> int:
+        """Perkiraan (detik) sampai `queued` pekerjaan di depan selesai, untuk Retry-After"""
+        estimate = self._hold_ewma_s * (queued + 1) / self._capacity(lane)
+        return max(1, min(RETRY_AFTER_MAX_S, math.ceil(estimate)))
+
+    def get_stats(self) -> dict:
+        now = time.perf_counter()
+        with self._lock:
+            lanes = {
+                lane.value: {
+                    "capacity": self._capacity(lane),
+                    "running": state.running,
+                    "waiting": len(state.waiting),
+                    "avg_wait_ms": round(state.wait_ewma_ms, 2),
+                    "oldest_wait_ms": round((now - state.waiting[0].enqueued_at) * 1000, 2) if state.waiting else 0.0,
+                    **state.stats
+                }
+                for lane, state in self._lanes.items()
+            }
+            return {
+                "slots": self.slots,
+                "interactive_reserved_slots": self.interactive_slots,
+                "max_queue": self.max_queue,
+                "running": sum(state.running for state in self._lanes.values()),
+                "avg_hold_ms": round(self._hold_ewma_s * 1000, 2),
+                "lanes": lanes
+            }
+
+    def _capacity(self, lane: JudgeLane) -> int:
+        return self.slots if lane == JudgeLane.INTERACTIVE else self.slots - self.interactive_slots
+
+    def _can_start(self, lane: JudgeLane) -> bool:
+        running = sum(state.running for state in self._lanes.values())
+        if running >= self.slots:
+            return False
+        return lane == JudgeLane.INTERACTIVE or self._lanes[lane].running < self._capacity(lane)
+
+    def _start(self, ticket: Ticket):
+        state = self._lanes[ticket.lane]
+        state.running += 1
+        state.stats["admitted"] += 1
+        ticket._grant()
+        state.wait_ewma_ms = 0.8 * state.wait_ewma_ms + 0.2 * ticket.queue_wait_ms
+
+    def _release(self, ticket: Ticket):
+        with self._lock:
+            if ticket.released:
+                return
+            ticket.released = True
+            state = self._lanes[ticket.lane]
+            if ticket.granted_at is None:
+                # Belum mendapat slot (misal request dibatalkan), cukup keluar dari antrian
+                state.waiting.remove(ticket)
+                return
+            held = time.perf_counter() - ticket.granted_at
+            self._hold_ewma_s = 0.8 * self._hold_ewma_s + 0.2 * held
+            state.running -= 1
+            self._dispatch()
+
+    def _dispatch(self):
+        """Berikan slot kosong ke antrian berikutnya (dipanggil dengan lock)"""
+        interactive = self._lanes[JudgeLane.INTERACTIVE].waiting
+        batch = self._lanes[JudgeLane.BATCH].waiting
+        while True:
+            batch_ready = bool(batch) and self._can_start(JudgeLane.BATCH)
+            interactive_ready = bool(interactive) and self._can_start(JudgeLane.INTERACTIVE)
+            if batch_ready and (
+                not interactive_ready
+                or time.perf_counter() - batch[0].enqueued_at >= self.aging_s
+            ):
+                self._start(batch.popleft())
+            elif interactive_ready:
+                self._start(interactive.popleft())
+            else:
+                return
+
+    def _retry_after(self, lane: JudgeLane) -> int:
+        return self.estimate_wait_s(len(self._lanes[lane].waiting), lane)
+
+
+admission_controller = AdmissionController()
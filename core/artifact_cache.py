@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Optional
+from .config import ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_BYTES
+import hashlib, json, os, shutil, threading, uuid
+
+META_FILE = "meta.json"
+
+@dataclass
+class CachedArtifact:
+    """Hasil compile yang tersimpan di cache"""
+    key: str
+    success: bool
+    path: str  # Directory berisi artifact (tanpa meta.json)
+    compilation_error: str = ""
+
+class ArtifactCache:
+    """
+    Cache artifact hasil compile yang di-address oleh content hash.
+    Setiap entry adalah directory <cache_dir>/<key>/ berisi artifact dan
+    meta.json. Ukuran total dibatasi max_bytes dengan eviction LRU.
+    """
+
+    def __init__(self, cache_dir: str = ARTIFACT_CACHE_DIR, max_bytes: int = ARTIFACT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size (urutan LRU)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(language: str, compiler_version: str, flags: str, source: str) -> str:
+        digest = hashlib.sha256()
+        for part in (language, compiler_version, flags, source):
+            encoded = part.encode("utf-8")
+            # Prefix panjang supaya batas antar field tidak ambigu
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedArtifact]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            if key not in self._entries:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry_dir, META_FILE)) as f:
+                meta = json.load(f)
+            os.utime(entry_dir)  # Simpan urutan LRU untuk restart berikutnya
+        except (OSError, ValueError):
+            self._drop(key)
+            return None
+
+        return CachedArtifact(
+            key=key,
+            success=meta["success"],
+            path=entry_dir,
+            compilation_error=meta.get("compilation_error", "")
+        )
+
+    def put(self, key: str, success: bool, artifact_dir: Optional[str] = None, compilation_error: str = ""):
+        """
+        Simpan hasil compile. Untuk compile sukses, isi artifact_dir disalin
+        ke cache; untuk compile error cukup pesan error-nya.
+        """
+        if not self.enabled:
+            return
+
+        tmp_dir = os.path.join(self.cache_dir, f".tmp-{uuid.uuid4().hex}")
+        try:
+            if success and artifact_dir:
+                shutil.copytree(artifact_dir, tmp_dir)
+            else:
+                os.makedirs(tmp_dir)
+            with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+                json.dump({"success": success, "compilation_error": compilation_error}, f)
+            size = self._dir_size(tmp_dir)
+            # rename atomic; gagal jika key yang sama sudah disimpan thread lain
+            os.rename(tmp_dir, os.path.join(self.cache_dir, key))
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._entries[key] = size
+            self._total_bytes += size
+            self._stats["stores"] += 1
+            evicted = self._evict_locked()
+
+        for evicted_key in evicted:
+            shutil.rmtree(os.path.join(self.cache_dir, evicted_key), ignore_errors=True)
+
+    @staticmethod
+    def materialize(artifact: CachedArtifact, dest_dir: str):
+        """
+        Salin artifact dari cache ke dest_dir. Dipakai hardlink jika bisa
+        (murah, dan entry tetap aman walau di-evict), fallback ke copy.
+        """
+        def link_or_copy(src, dst):
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+        shutil.copytree(
+            artifact.path,
+            dest_dir,
+            dirs_exist_ok=True,
+            copy_function=link_or_copy,
+            ignore=shutil.ignore_patterns(META_FILE)
+        )
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["total_bytes"] = self._total_bytes
+        stats["max_bytes"] = self.max_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _load_index(self):
+        """Bangun index LRU dari isi cache_dir (urut mtime, paling lama di depan)"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(".tmp-"):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            if entry.is_dir():
+                entries.append((entry.stat().st_mtime, entry.name, self._dir_size(entry.path)))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        for evicted_key in self._evict_locked():
+            shutil.rmtree(os.path.join(self.cache_dir, evicted_key), ignore_errors=True)
+
+    def _evict_locked(self) -> list:
+        evicted = []
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._stats["evictions"] += 1
+            evicted.append(key)
+        return evicted
+
+    def _drop(self, key: str):
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+
+artifact_cache = ArtifactCache()
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from collections import OrderedDict
+from .config import CHECKER_TIME_LIMIT_MS, CHECKER_CACHE_SIZE
+from .docker_executor_v2 import DockerExecutorV2, DockerExecutorRequest
+from .models import Verdict
+import hashlib, os, shutil, threading
+
+# Konvensi exit code testlib
+CHECKER_VERDICTS = {
+    0: Verdict.ACCEPTED,
+    1: Verdict.WRONG_ANSWER,
+    2: Verdict.PRESENTATION_ERROR,
+}
+
+@dataclass
+class PreparedChecker:
+    """Checker yang sudah di-compile dan siap dijalankan"""
+    key: str
+    language: str
+    build_dir: str
+    users: int = 0  # Judging yang sedang memakai checker (prepare() tanpa release())
+    evicted: bool = False  # Sudah keluar dari registry, build dir dihapus saat users 0
+
+@dataclass
+class CheckerResult:
+    verdict: Verdict
+    message: str
+    time_ms: float  # CPU time checker, dilaporkan terpisah dari waktu solusi
+
+class CheckerRegistry:
+    """
+    Checker hasil compile, di-key oleh bahasa + hash source code.
+    Compile memakai DockerExecutorV2.compile (artifact cache), build dir
+    disimpan di memory sehingga checker tidak perlu di-compile atau
+    di-materialize ulang untuk setiap submission. Jumlah entry dibatasi
+    max_entries dengan eviction LRU; build dir checker yang di-evict baru
+    dihapus setelah semua judging yang memakainya memanggil release().
+    """
+
+    def __init__(
+        self,
+        executor: DockerExecutorV2 = None,
+        max_entries: int = CHECKER_CACHE_SIZE,
+        time_limit_ms: float = CHECKER_TIME_LIMIT_MS
+    ):
+        self.executor = executor or DockerExecutorV2()
+        self.max_entries = max_entries
+        self.time_limit_ms = time_limit_ms
+
+        self._checkers: "OrderedDict[str, PreparedChecker]" = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, language: str, code: str) -> PreparedChecker:
+        """
+        Ambil checker yang sudah di-compile, compile jika belum ada.
+        Caller wajib memanggil release() setelah selesai memakai checker.
+        ValueError jika compile gagal.
+        """
+        key = hashlib.sha256(f"{language}\0{code}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if key in self._checkers:
+                self._checkers.move_to_end(key)
+                return self._use(self._checkers[key])
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Satu compile per checker walaupun banyak submission datang bersamaan
+        try:
+            with key_lock:
+                with self._lock:
+                    if key in self._checkers:
+                        return self._use(self._checkers[key])
+
+                compile_result = self.executor.compile(language, code)
+                if not compile_result.success:
+                    raise ValueError(f"Checker compilation failed: {compile_result.compilation_error}")
+
+                checker = PreparedChecker(key=key, language=language, build_dir=compile_result.build_dir)
+                with self._lock:
+                    self._checkers[key] = checker
+                    self._use(checker)
+                    evicted = []
+                    while len(self._checkers) > self.max_entries:
+                        old_checker = self._checkers.popitem(last=False)[1]
+                        old_checker.evicted = True
+                        if old_checker.users == 0:
+                            evicted.append(old_checker)
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+        for old_checker in evicted:
+            shutil.rmtree(old_checker.build_dir, ignore_errors=True)
+        return checker
+
+    def release(self, checker: PreparedChecker):
+        """Selesai memakai checker dari prepare(); hapus build dir jika sudah di-evict"""
+        with self._lock:
+            checker.users -= 1
+            remove = checker.evicted and checker.users == 0
+        if remove:
+            shutil.rmtree(checker.build_dir, ignore_errors=True)
+
+    @staticmethod
+    def _use(checker: PreparedChecker) -> PreparedChecker:
+        """Dipanggil dengan self._lock dipegang"""
+        checker.users += 1
+        return checker
+
+    def run(self, checker: PreparedChecker, input_path: str, expected_path: str, output_path: str = None) -> CheckerResult:
+        """
+        Jalankan checker di runner container (sandbox yang sama dengan solusi):
+            checker input.txt contestant_output.txt expected_output.txt
+        Exit code 0/1/2 -> AC/WA/PE, selain itu (crash/timeout) -> SE
+        """
+        request = DockerExecutorRequest(
+            checker.language,
+            "",
+            input_data="",
+            timeout=int(self.time_limit_ms / 1000) + 5,
+            build_dir=checker.build_dir,
+            input_path=input_path,
+            mode="check",
+            files={
+                "contestant_output.txt": output_path or os.devnull,
+                "expected_output.txt": expected_path,
+            }
+        )
+        result = self.executor.execute(request)
+        time_ms = result.time_ms_used or 0
+
+        if result.status != "CHECKED":
+            return CheckerResult(Verdict.SYSTEM_ERROR, f"Checker failed: {result.status.lower()}", time_ms)
+        if time_ms > self.time_limit_ms:
+            return CheckerResult(
+                Verdict.SYSTEM_ERROR,
+                f"Checker time limit exceeded ({time_ms}ms > {self.time_limit_ms}ms)",
+                time_ms
+            )
+        if result.return_code not in CHECKER_VERDICTS:
+            return CheckerResult(
+                Verdict.SYSTEM_ERROR,
+                f"Checker failed (exit code: {result.return_code}): {result.output}",
+                time_ms
+            )
+        return CheckerResult(CHECKER_VERDICTS[result.return_code], result.output, time_ms)
+
+
+checker_registry = CheckerRegistry()
@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from contextlib import contextmanager
+from itertools import zip_longest
+from typing import Optional, Union
+from .models import CompareMode
+import mmap, re
+
+CHUNK_BYTES = 1 << 20  # Ukuran potongan untuk perbandingan exact
+SNIPPET_BYTES = 40  # Panjang potongan output yang ditampilkan di pesan WA
+
+_WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+_NON_WHITESPACE = re.compile(rb"\S")
+_WHITESPACE_RE = re.compile(rb"\s")
+_TOKEN = re.compile(rb"\S+")
+
+@dataclass
+class CompareResult:
+    """Hasil perbandingan output, posisi (1-based) menunjuk ke output program"""
+    matched: bool
+    line: Optional[int] = None
+    column: Optional[int] = None
+    token_index: Optional[int] = None  # Hanya untuk mode token
+    expected: str = ""  # Potongan expected output di posisi beda pertama
+    actual: str = ""  # Potongan output program di posisi beda pertama
+
+    def describe(self) -> str:
+        if self.matched:
+            return "Output matches"
+        where = f"line {self.line}, column {self.column}"
+        if self.token_index is not None:
+            where = f"token {self.token_index} ({where})"
+        return f"first difference at {where}: expected {self.expected!r}, got {self.actual!r}"
+
+@contextmanager
+def open_buffer(source: Union[str, bytes]):
+    """
+    Buffer read-only untuk dibandingkan: bytes dipakai langsung, path file
+    di-mmap sehingga output besar tidak perlu dibaca ke memory Python
+    """
+    if isinstance(source, bytes):
+        yield source
+        return
+    with open(source, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # File kosong tidak bisa di-mmap
+            yield b""
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+def compare_output(expected: Union[str, bytes], actual: Union[str, bytes], mode: CompareMode = CompareMode.TOKEN) -> CompareResult:
+    """
+    Bandingkan expected output dengan output program dalam satu pass.
+    expected/actual berupa bytes atau path file.
+
+    Mode (keduanya di-strip dulu di awal/akhir):
+    - exact : byte per byte
+    - line  : per baris, trailing whitespace tiap baris diabaikan
+    - token : token dipisah whitespace (perilaku default judge)
+    """
+    with open_buffer(expected) as expected_buf, open_buffer(actual) as actual_buf:
+        expected_bounds = _strip_bounds(expected_buf)
+        actual_bounds = _strip_bounds(actual_buf)
+
+        # Fast path: identik setelah strip berarti cocok di semua mode
+        diff_offset = _first_difference(expected_buf, expected_bounds, actual_buf, actual_bounds)
+        if diff_offset is None:
+            return CompareResult(True)
+
+        if mode == CompareMode.EXACT:
+            return _mismatch(
+                expected_buf, expected_bounds[0] + diff_offset,
+                actual_buf, actual_bounds[0] + diff_offset
+            )
+        if mode == CompareMode.LINE:
+            return _compare_lines(expected_buf, expected_bounds, actual_buf, actual_bounds)
+        return _compare_tokens(expected_buf, expected_bounds, actual_buf, actual_bounds)
+
+def _strip_bounds(buffer) -> tuple:
+    """Posisi [start, end) isi buffer tanpa whitespace di awal/akhir"""
+    match = _NON_WHITESPACE.search(buffer)
+    if match is None:
+        return 0, 0
+    end = len(buffer)
+    while end > match.start() and buffer[end - 1] in _WHITESPACE:
+        end -= 1
+    return match.start(), end
+
+def _first_difference(expected_buf, expected_bounds, actual_buf, actual_bounds) -> Optional[int]:
+    """Offset (relatif terhadap start) byte pertama yang berbeda, None jika sama persis"""
+    expected_start, expected_end = expected_bounds
+    actual_start, actual_end = actual_bounds
+    length = min(expected_end - expected_start, actual_end - actual_start)
+
+    offset = 0
+    while offset < length:
+        size = min(CHUNK_BYTES, length - offset)
+        expected_chunk = expected_buf[expected_start + offset:expected_start + offset + size]
+        actual_chunk = actual_buf[actual_start + offset:actual_start + offset + size]
+        if expected_chunk != actual_chunk:
+            for idx in range(size):
+                if expected_chunk[idx] != actual_chunk[idx]:
+                    return offset + idx
+        offset += size
+
+    if expected_end - expected_start == actual_end - actual_start:
+        return None
+    return length
+
+def _compare_lines(expected_buf, expected_bounds, actual_buf, actual_bounds) -> CompareResult:
+    expected_lines = _iter_lines(expected_buf, expected_bounds)
+    actual_lines = _iter_lines(actual_buf, actual_bounds)
+    for expected_line, actual_line in zip_longest(expected_lines, actual_lines):
+        if expected_line is None or actual_line is None or expected_line[1] != actual_line[1]:
+            expected_pos, expected_text = expected_line or (expected_bounds[1], b"")
+            actual_pos, actual_text = actual_line or (actual_bounds[1], b"")
+            column = _first_index_difference(expected_text, actual_text)
+            return _mismatch(expected_buf, expected_pos + column, actual_buf, actual_pos + column)
+    return CompareResult(True)
+
+def _iter_lines(buffer, bounds):
+    """(posisi awal, isi baris tanpa trailing whitespace) untuk setiap baris"""
+    start, end = bounds
+    pos = start
+    while pos <= end:
+        newline = buffer.find(b"\n", pos, end)
+        if newline == -1:
+            newline = end
+        yield pos, buffer[pos:newline].rstrip()
+        pos = newline + 1
+
+def _compare_tokens(expected_buf, expected_bounds, actual_buf, actual_bounds) -> CompareResult:
+    expected_tokens = _iter_tokens(expected_buf, expected_bounds)
+    actual_tokens = _iter_tokens(actual_buf, actual_bounds)
+    for index, (expected_token, actual_token) in enumerate(zip_longest(expected_tokens, actual_tokens), start=1):
+        if expected_token != actual_token:
+            result = _mismatch(
+                expected_buf, _token_position(expected_buf, expected_bounds, index),
+                actual_buf, _token_position(actual_buf, actual_bounds, index)
+            )
+            result.token_index = index
+            return result
+    return CompareResult(True)
+
+def _iter_tokens(buffer, bounds):
+    for _, chunk_tokens in _iter_token_chunks(buffer, bounds):
+        yield from chunk_tokens
+
+def _iter_token_chunks(buffer, bounds):
+    """
+    (posisi awal, token) per potongan CHUNK_BYTES. Potongan diakhiri di
+    whitespace supaya tidak ada token yang terbelah
+    """
+    start, end = bounds
+    pos = start
+    while pos < end:
+        chunk_end = min(pos + CHUNK_BYTES, end)
+        if chunk_end < end:
+            match = _WHITESPACE_RE.search(buffer, chunk_end, end)
+            chunk_end = match.start() if match else end
+        yield pos, buffer[pos:chunk_end].split()
+        pos = chunk_end
+
+def _token_position(buffer, bounds, index: int) -> int:
+    """Posisi token ke-index (1-based), akhir buffer jika token tidak ada"""
+    seen = 0
+    for chunk_start, chunk_tokens in _iter_token_chunks(buffer, bounds):
+        if seen + len(chunk_tokens) >= index:
+            for count, match in enumerate(_TOKEN.finditer(buffer, chunk_start, bounds[1]), start=seen + 1):
+                if count == index:
+                    return match.start()
+        seen += len(chunk_tokens)
+    return bounds[1]
+
+def _first_index_difference(expected: bytes, actual: bytes) -> int:
+    for idx, (expected_byte, actual_byte) in enumerate(zip(expected, actual)):
+        if expected_byte != actual_byte:
+            return idx
+    return min(len(expected), len(actual))
+
+def _mismatch(expected_buf, expected_pos: int, actual_buf, actual_pos: int) -> CompareResult:
+    line, column = _line_column(actual_buf, actual_pos)
+    return CompareResult(
+        False,
+        line=line,
+        column=column,
+        expected=_snippet(expected_buf, expected_pos),
+        actual=_snippet(actual_buf, actual_pos)
+    )
+
+def _line_column(buffer, pos: int) -> tuple:
+    """Hitung baris/kolom secara bertahap (hanya dipanggil sekali saat WA)"""
+    line = 1
+    line_start = 0
+    for chunk_start in range(0, pos, CHUNK_BYTES):
+        chunk = buffer[chunk_start:min(chunk_start + CHUNK_BYTES, pos)]
+        count = chunk.count(b"\n")
+        if count:
+            line += count
+            line_start = chunk_start + chunk.rfind(b"\n") + 1
+    return line, pos - line_start + 1
+
+def _snippet(buffer, pos: int) -> str:
+    chunk = buffer[pos:pos + SNIPPET_BYTES]
+    newline = chunk.find(b"\n")
+    if newline != -1:
+        chunk = chunk[:max(newline, 1)]
+    return chunk.decode("utf-8", errors="replace")
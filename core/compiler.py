@@ -1,12 +1,37 @@
 from abc import ABC, abstractmethod
 from typing import Optional
 from dataclasses import dataclass
+from functools import lru_cache
+from .artifact_cache import ArtifactCache, artifact_cache
 
 import subprocess
+import shutil
 import os
 import logging
 
 
+@lru_cache(maxsize=None)
+def get_compiler_version(compiler: str) -> Optional[str]:
+  """Baris pertama `<compiler> --version`, dipakai sebagai bagian key cache"""
+  try:
+    result = subprocess.run([compiler, "--version"], capture_output=True, text=True, timeout=10)
+  except (OSError, subprocess.TimeoutExpired):
+    return None
+  output = (result.stdout or result.stderr).strip()
+  return output.splitlines()[0] if output else None
+
+
+def get_cached_compile(language: str, compiler: str, flags: str, code: str):
+  """Return (key, CachedArtifact atau None). key None jika cache tidak bisa dipakai"""
+  if not artifact_cache.enabled:
+    return None, None
+  version = get_compiler_version(compiler)
+  if not version:
+    return None, None
+  key = ArtifactCache.make_key(language, version, flags, code)
+  return key, artifact_cache.get(key)
+
+
 @dataclass
 class CompilationResult:
   success: bool
@@ -38,14 +63,21 @@ class CCompiler(BaseCompiler):
     source_file = os.path.join(self.temp_dir, f"{session_id}.{extension}")
     executable_file = os.path.join(self.temp_dir, f"{session_id}.out")
     
+    compiler = "gcc" if self.language == "c" else "g++"
+    
     try:
+      # cache hit -> compiler tidak dijalankan
+      cache_key, cached = get_cached_compile(extension, compiler, "", code)
+      if cached and not cached.success:
+        return CompilationResult(success=False, error_message=cached.compilation_error)
+      if cached:
+        shutil.copy2(os.path.join(cached.path, "a.out"), executable_file)
+        return CompilationResult(success=True, executable_path=executable_file)
+      
       with open(source_file, "w") as f:
         f.write(code)
       
-      if self.language == "c":
-        command = ["gcc", source_file, "-o", executable_file]
-      else : #cpp
-        command = ["g++", source_file, "-o", executable_file]
+      command = [compiler, source_file, "-o", executable_file]
       
       result = subprocess.run(
         command,
@@ -54,9 +86,12 @@ class CCompiler(BaseCompiler):
       )
       
       if result.returncode == 0:
+        if cache_key:
+          self._store_executable(cache_key, executable_file)
         return CompilationResult(success=True, executable_path=executable_file)
       else:
-        
+        if cache_key:
+          artifact_cache.put(cache_key, False, compilation_error=result.stderr)
         return CompilationResult(success=False, error_message=result.stderr)
       
     except Exception as e:
@@ -64,6 +99,16 @@ class CCompiler(BaseCompiler):
       return CompilationResult(success=False, error_message=str(e))
     
     
+  def _store_executable(self, cache_key, executable_file):
+    # layout cache sama dengan runner docker: binary bernama a.out
+    staging_dir = f"{executable_file}.cache"
+    os.makedirs(staging_dir, exist_ok=True)
+    try:
+      shutil.copy2(executable_file, os.path.join(staging_dir, "a.out"))
+      artifact_cache.put(cache_key, True, artifact_dir=staging_dir)
+    finally:
+      shutil.rmtree(staging_dir, ignore_errors=True)
+    
   def get_execution_command(self, executable_path):
     return [executable_path]
     
@@ -88,6 +133,14 @@ class JavaCompiler(BaseCompiler):
     source_file = os.path.join(session_dir, f"{class_name}.java")
     print("source_file, ", source_file)
     try:
+      # cache hit -> class file disalin, javac tidak dijalankan
+      cache_key, cached = get_cached_compile("java", "javac", "", code)
+      if cached and not cached.success:
+        return CompilationResult(success=False, error_message=cached.compilation_error)
+      if cached:
+        artifact_cache.materialize(cached, session_dir)
+        return CompilationResult(success=True, executable_path=class_name)
+      
       # Write source code
       with open(source_file, "w", encoding="utf-8") as f:
         f.write(code)
@@ -103,8 +156,12 @@ class JavaCompiler(BaseCompiler):
       
       
       if result.returncode == 0:
+        if cache_key:
+          artifact_cache.put(cache_key, True, artifact_dir=session_dir)
         return CompilationResult(success=True, executable_path=class_name)
       else:
+        if cache_key:
+          artifact_cache.put(cache_key, False, compilation_error=result.stderr)
         return CompilationResult(success=False, error_message=result.stderr)
     except Exception as e:
       return CompilationResult(success=False, error_message=str(e))
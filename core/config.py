@@ -0,0 +1,162 @@
+import os
+import tempfile
+
+# Konfigurasi judger, semua bisa di-override lewat environment variable
+
+# Batas waktu compile (detik) untuk satu submission
+COMPILE_TIMEOUT_S = int(os.getenv("SEKA_COMPILE_TIMEOUT_S", "30"))
+
+# Image runner per bahasa dan script entrypoint di dalam image
+RUNNER_IMAGES = {
+    "python": "seka-python-runner",
+    "c": "seka-c-runner",
+    "cpp": "seka-cpp-runner",
+    "java": "seka-java-runner",
+}
+
+RUNNER_SCRIPTS = {
+    "python": "/run_python_code.sh",
+    "c": "/run_c_code.sh",
+    "cpp": "/run_cpp_code.sh",
+    "java": "/run_java_code.sh",
+}
+
+# Warm container pool: jumlah container siap pakai per bahasa.
+# SEKA_POOL_SIZE berlaku untuk semua bahasa, bisa di-override per bahasa
+# misal SEKA_POOL_SIZE_JAVA=4. Isi 0 untuk mematikan pool.
+POOL_SIZE = int(os.getenv("SEKA_POOL_SIZE", "2"))
+POOL_SIZES = {
+    language: int(os.getenv(f"SEKA_POOL_SIZE_{language.upper()}", POOL_SIZE))
+    for language in RUNNER_IMAGES
+}
+
+# Entrypoint container pool per bahasa (default `sleep infinity`). Python
+# menjalankan zygote: satu interpreter yang sudah import modul umum dan
+# setiap test case di-fork dari sana. SEKA_PYTHON_ZYGOTE=0 untuk mematikan.
+POOL_ENTRYPOINTS = {}
+if os.getenv("SEKA_PYTHON_ZYGOTE", "1") != "0":
+    POOL_ENTRYPOINTS["python"] = ["python3", "/seka_zygote.py"]
+
+# Container di-recycle (dibuat ulang) setelah dipakai sebanyak ini
+POOL_MAX_USES = int(os.getenv("SEKA_POOL_MAX_USES", "50"))
+
+# Async submission queue: jumlah worker thread yang menjalankan judging
+JUDGE_WORKERS = int(os.getenv("SEKA_JUDGE_WORKERS", "4"))
+
+# Jumlah hasil submission yang disimpan di memory (yang paling lama dibuang)
+SUBMISSION_RESULTS_MAX = int(os.getenv("SEKA_SUBMISSION_RESULTS_MAX", "10000"))
+
+# Backend antrian submission async: "memory" (thread di proses API) atau
+# "sqlite" (antrian durable SQLite/WAL, dijalankan juga oleh worker.py di
+# proses/host lain yang memakai file database yang sama). Dengan "sqlite",
+# SEKA_JUDGE_WORKERS=0 membuat proses API hanya menerima submission.
+JOB_QUEUE_BACKEND = os.getenv("SEKA_JOB_QUEUE", "memory")
+JOB_QUEUE_DB = os.getenv("SEKA_JOB_QUEUE_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jobs.sqlite3"))
+# Lease job: worker memperpanjang lease (heartbeat) setiap LEASE_S / 3; job
+# yang lease-nya habis (worker mati) diambil worker lain, maksimal MAX_ATTEMPTS kali
+JOB_LEASE_S = float(os.getenv("SEKA_JOB_LEASE_S", "30"))
+JOB_MAX_ATTEMPTS = int(os.getenv("SEKA_JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_MS = float(os.getenv("SEKA_JOB_POLL_MS", "200"))
+# Job yang sudah selesai dihapus dari antrian durable setelah selama ini
+JOB_RETENTION_S = float(os.getenv("SEKA_JOB_RETENTION_S", str(7 * 24 * 3600)))
+
+# Penyimpanan permanen submission (SQLite): hasil, metrics dan hasil per test
+# case untuk riwayat/rejudge/analitik. Kosongkan untuk mematikan.
+SUBMISSION_STORE_DB = os.getenv("SEKA_SUBMISSION_STORE_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "submissions.sqlite3"))
+# Data yang lebih besar dari ini (code, output, error) disimpan terkompresi (zlib)
+SUBMISSION_STORE_COMPRESS_MIN_BYTES = int(os.getenv("SEKA_SUBMISSION_STORE_COMPRESS_MIN_BYTES", "512"))
+
+# Eksekusi test case paralel: maksimal test case yang jalan bersamaan
+# untuk satu submission, dan batas global untuk seluruh proses judger
+PARALLEL_TESTS_PER_SUBMISSION = int(os.getenv("SEKA_PARALLEL_TESTS_PER_SUBMISSION", "4"))
+MAX_PARALLEL_TESTS = int(os.getenv("SEKA_MAX_PARALLEL_TESTS", str(os.cpu_count() or 1)))
+
+# Admission control: jumlah submission yang di-judge bersamaan (slot eksekusi)
+# dan panjang antrian tunggu. Jika antrian penuh request baru langsung
+# ditolak (HTTP 503 + Retry-After) daripada di-judge di host yang overload.
+ADMISSION_SLOTS = int(os.getenv("SEKA_ADMISSION_SLOTS", str(max(1, MAX_PARALLEL_TESTS // max(1, PARALLEL_TESTS_PER_SUBMISSION)) * 2)))
+ADMISSION_QUEUE_SIZE = int(os.getenv("SEKA_ADMISSION_QUEUE_SIZE", "64"))
+# Lane "interactive" (tombol Run di web UI): slot yang hanya boleh dipakai
+# lane ini, dan batas request yang boleh masuk lane ini (lebih dari itu
+# otomatis dijalankan di lane "batch")
+ADMISSION_INTERACTIVE_SLOTS = int(os.getenv("SEKA_ADMISSION_INTERACTIVE_SLOTS", str(max(1, ADMISSION_SLOTS // 4))))
+INTERACTIVE_MAX_TESTS = int(os.getenv("SEKA_INTERACTIVE_MAX_TESTS", "10"))
+INTERACTIVE_MAX_TIME_LIMIT_MS = float(os.getenv("SEKA_INTERACTIVE_MAX_TIME_LIMIT_MS", "2000"))
+# Anti starvation: submission batch yang sudah menunggu selama ini
+# didahulukan dari antrian interactive
+ADMISSION_AGING_MS = float(os.getenv("SEKA_ADMISSION_AGING_MS", "10000"))
+# Batas submission async yang menunggu worker (POST /v2/submissions ditolak jika penuh)
+JOB_QUEUE_MAX_PENDING = int(os.getenv("SEKA_JOB_QUEUE_MAX_PENDING", "1000"))
+
+# Workspace per run (build dir, /code, slot pool) di tmpfs host supaya tidak
+# membebani disk; container jalan dengan rootfs read-only + /tmp tmpfs
+WORKSPACE_DIR = os.getenv(
+    "SEKA_WORKSPACE_DIR",
+    "/dev/shm/seka" if os.access("/dev/shm", os.W_OK) else os.path.join(tempfile.gettempdir(), "seka")
+)
+WORKSPACE_LIMIT_BYTES = int(os.getenv("SEKA_WORKSPACE_LIMIT_MB", "64")) * 1024 * 1024
+CONTAINER_TMPFS_MB = int(os.getenv("SEKA_CONTAINER_TMPFS_MB", "64"))
+
+# Backend eksekusi per bahasa: "docker" (default) atau "sandbox" (namespace +
+# seccomp + rlimit langsung di host, lihat core/sandbox.py; compile tetap di
+# Docker). Contoh: SEKA_EXECUTOR_CPP=sandbox
+EXECUTOR_BACKENDS = {
+    language: os.getenv(f"SEKA_EXECUTOR_{language.upper()}", "docker")
+    for language in RUNNER_IMAGES
+}
+# Root filesystem sandbox (hasil export runner image, di-refresh jika image berubah)
+SANDBOX_ROOTFS_DIR = os.getenv("SEKA_SANDBOX_ROOTFS_DIR", os.path.join(tempfile.gettempdir(), "seka_sandbox_rootfs"))
+# Jika judger jalan sebagai root, setiap run di sandbox memakai uid host
+# sendiri dari rentang SANDBOX_UID .. SANDBOX_UID + SANDBOX_UID_COUNT - 1
+# (dipinjam lewat lock file, berlaku juga antar proses judger di host yang sama)
+SANDBOX_UID = int(os.getenv("SEKA_SANDBOX_UID", "100000"))
+SANDBOX_UID_COUNT = int(os.getenv("SEKA_SANDBOX_UID_COUNT", "256"))
+# RLIMIT_NPROC program di sandbox (dihitung per uid, termasuk thread; dengan
+# uid per run batas ini tidak dibagi dengan run lain)
+SANDBOX_NPROC = int(os.getenv("SEKA_SANDBOX_NPROC", "256"))
+
+# Docker Engine API: satu client bersama (unix socket) dengan connection pool
+DOCKER_BASE_URL = os.getenv("DOCKER_HOST", "unix:///var/run/docker.sock")
+DOCKER_MAX_CONNECTIONS = int(os.getenv("SEKA_DOCKER_MAX_CONNECTIONS", str(max(10, MAX_PARALLEL_TESTS * 2))))
+
+# Checker (special judge): batas waktu per pemanggilan dan jumlah checker
+# hasil compile yang disimpan (warm) di memory
+CHECKER_TIME_LIMIT_MS = float(os.getenv("SEKA_CHECKER_TIME_LIMIT_MS", "10000"))
+CHECKER_CACHE_SIZE = int(os.getenv("SEKA_CHECKER_CACHE_SIZE", "64"))
+
+# Batch judging: jumlah submission satu batch yang di-compile/dijalankan bersamaan
+BATCH_WORKERS = int(os.getenv("SEKA_BATCH_WORKERS", str(os.cpu_count() or 1)))
+BATCH_MAX_SUBMISSIONS = int(os.getenv("SEKA_BATCH_MAX_SUBMISSIONS", "1000"))
+
+# Flag tambahan untuk compiler di runner image (diteruskan lewat env COMPILE_FLAGS)
+COMPILE_FLAGS = {
+    "c": os.getenv("SEKA_COMPILE_FLAGS_C", ""),
+    "cpp": os.getenv("SEKA_COMPILE_FLAGS_CPP", ""),
+    "java": os.getenv("SEKA_COMPILE_FLAGS_JAVA", ""),
+}
+
+# Cache artifact hasil compile (binary, class file, compile error),
+# key = hash(bahasa, versi compiler, flags, source). Isi 0 untuk mematikan.
+ARTIFACT_CACHE_DIR = os.getenv("SEKA_ARTIFACT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "seka_artifact_cache"))
+ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("SEKA_ARTIFACT_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Cache hasil judging (in-memory), key = hash(bahasa, code, test set, limit,
+# compare mode). Submission identik yang sedang di-judge ikut menunggu hasil
+# yang sama. Isi 0 untuk mematikan.
+VERDICT_CACHE_MAX_BYTES = int(os.getenv("SEKA_VERDICT_CACHE_MAX_MB", "64")) * 1024 * 1024
+VERDICT_CACHE_TTL_S = float(os.getenv("SEKA_VERDICT_CACHE_TTL_S", "600"))
+
+# time_ms_used adalah CPU time (cgroup). Program yang banyak idle (sleep,
+# menunggu input) tetap TLE jika wall clock > time limit * faktor ini
+WALL_TIME_LIMIT_FACTOR = float(os.getenv("SEKA_WALL_TIME_LIMIT_FACTOR", "3"))
+
+# Problem store: test data disimpan sekali di disk dan direferensikan lewat problem_id
+PROBLEMS_DIR = os.getenv("SEKA_PROBLEMS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "problems"))
+
+# Logging terstruktur (core/log.py): level, format ("json" atau "text"),
+# dan apakah isi payload (source code, stderr, output) ikut di-log
+LOG_LEVEL = os.getenv("SEKA_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("SEKA_LOG_FORMAT", "json")
+LOG_PAYLOADS = os.getenv("SEKA_LOG_PAYLOADS", "0") == "1"
+# Ukuran antrian log; jika penuh record dibuang (thread judge tidak pernah menunggu I/O)
+LOG_QUEUE_SIZE = int(os.getenv("SEKA_LOG_QUEUE_SIZE", "10000"))
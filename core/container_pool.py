@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from .config import RUNNER_IMAGES, RUNNER_SCRIPTS, POOL_SIZES, POOL_MAX_USES, POOL_ENTRYPOINTS
+from .docker_client import DockerEngine, ContainerRunResult, JUDGE_LABEL, DOCKER_ERRORS, docker_engine
+from .workspace import make_workspace, container_options
+from .metrics import containers, container_start_seconds, docker_errors_total
+from .log import get_logger, fields
+import os, queue, shutil, stat, threading, time, uuid
+
+log = get_logger("pool")
+
+# Path writable di container runner selain /build dan /code (rootfs read-only).
+# Dikosongkan setelah setiap job supaya file tidak terbawa ke submission lain.
+WIPE_DIRS = ("/tmp", "/dev/shm")
+# Ditulis ke /code hanya jika WIPE_DIRS berhasil dikosongkan
+WIPE_MARKER = ".seka_wiped"
+
+@dataclass
+class PooledContainer:
+    """Satu container runner yang sudah jalan dan menunggu job"""
+    name: str
+    language: str
+    slot_dir: str  # slot_dir/build -> /build (ro), slot_dir/io -> /code
+    uses: int = 0
+
+    @property
+    def build_dir(self) -> str:
+        return os.path.join(self.slot_dir, "build")
+
+    @property
+    def io_dir(self) -> str:
+        return os.path.join(self.slot_dir, "io")
+
+class ContainerPool:
+    """
+    Pool container runner yang sudah di-start (network none) per bahasa.
+    Job dijalankan dengan `docker exec` ke container idle, sehingga tidak
+    perlu bayar create/start/teardown container untuk setiap test case.
+    PID 1 container adalah `sleep infinity` atau entrypoint dari
+    POOL_ENTRYPOINTS (zygote Python), tidak ikut di-kill oleh `kill -9 -1`.
+    """
+
+    def __init__(
+        self,
+        images: Dict[str, str] = RUNNER_IMAGES,
+        scripts: Dict[str, str] = RUNNER_SCRIPTS,
+        sizes: Dict[str, int] = POOL_SIZES,
+        max_uses: int = POOL_MAX_USES,
+        engine: DockerEngine = docker_engine,
+        entrypoints: Dict[str, list] = POOL_ENTRYPOINTS
+    ):
+        self.engine = engine
+        self.images = images
+        self.scripts = scripts
+        self.entrypoints = entrypoints
+        self.sizes = sizes
+        self.max_uses = max_uses
+
+        self._idle: Dict[str, queue.Queue] = {language: queue.Queue() for language in images}
+        self._lock = threading.Lock()
+        self._started = False
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "recycles": 0,
+            "started": 0,
+            "start_failures": 0,
+        }
+        for language, idle in self._idle.items():
+            containers.labels(language, "idle").set_function(idle.qsize)
+
+    def start(self):
+        """Start container sesuai ukuran pool yang dikonfigurasi"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        for language, size in self.sizes.items():
+            for _ in range(size):
+                container = self._start_container(language)
+                if container:
+                    self._idle[language].put(container)
+
+    def shutdown(self):
+        """Hentikan dan hapus semua container idle"""
+        with self._lock:
+            self._started = False
+
+        for idle in self._idle.values():
+            while True:
+                try:
+                    container = idle.get_nowait()
+                except queue.Empty:
+                    break
+                self._remove_container(container)
+
+    def acquire(self, language: str) -> Optional[PooledContainer]:
+        """Ambil container idle, None jika pool kosong (miss)"""
+        if not self._started or language not in self._idle:
+            return None
+
+        try:
+            container = self._idle[language].get_nowait()
+        except queue.Empty:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        containers.labels(language, "in_use").inc()
+        return container
+
+    def release(self, container: PooledContainer, healthy: bool = True):
+        """
+        Kembalikan container ke pool setelah job selesai.
+        Container yang tidak sehat (timeout, error docker, WIPE_DIRS gagal
+        dikosongkan) atau sudah dipakai max_uses kali akan di-recycle.
+        """
+        container.uses += 1
+        containers.labels(container.language, "in_use").dec()
+        if healthy:
+            healthy = self._wiped(container) and self._reset_slot(container)
+
+        if healthy and container.uses < self.max_uses and self._started:
+            self._idle[container.language].put(container)
+            return
+
+        self._count("recycles")
+        self._remove_container(container)
+        if self._started:
+            replacement = self._start_container(container.language)
+            if replacement:
+                self._idle[container.language].put(replacement)
+
+    def run(
+        self,
+        container: PooledContainer,
+        build_dir: str,
+        input_data: str,
+        timeout: int,
+        input_path: Optional[str] = None,
+        mode: str = "run",
+        files: Optional[Dict[str, str]] = None
+    ) -> ContainerRunResult:
+        """
+        Jalankan artifact di container pool (mode "run" atau "check").
+        Setelah script selesai, semua proses sisa job di-kill (kill -9 -1)
+        lalu WIPE_DIRS dikosongkan, sehingga container bersih untuk job
+        berikutnya. WIPE_MARKER hanya ditulis jika wipe berhasil; marker
+        yang mungkin dibuat program user dihapus dulu setelah semua proses
+        user mati.
+        
+        input_path (file di problem store) disalin ke slot karena container
+        yang sudah jalan tidak bisa diberi mount baru; hardlink tidak dipakai
+        supaya program user tidak bisa mengubah file di problem store.
+        files: {nama file di /code: path sumber} yang ikut disalin (checker).
+        """
+        shutil.copytree(build_dir, container.build_dir, dirs_exist_ok=True)
+        if input_path:
+            shutil.copyfile(input_path, os.path.join(container.io_dir, 'input.txt'))
+        else:
+            with open(os.path.join(container.io_dir, 'input.txt'), 'w') as f:
+                f.write(input_data)
+        for name, source_path in (files or {}).items():
+            shutil.copyfile(source_path, os.path.join(container.io_dir, name))
+
+        script = self.scripts[container.language]
+        marker = f'/code/{WIPE_MARKER}'
+        wipe = f'rm -rf {marker} && find {" ".join(WIPE_DIRS)} -mindepth 1 -delete && : > {marker}'
+        command = ['sh', '-c', f'{script} {mode}; rc=$?; kill -9 -1 2>/dev/null; {wipe}; exit $rc']
+        return self.engine.exec_run(container.name, command, timeout)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["idle"] = {language: idle.qsize() for language, idle in self._idle.items()}
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _start_container(self, language: str) -> Optional[PooledContainer]:
+        slot_dir = make_workspace(f"seka_pool_{language}_")
+        container = PooledContainer(
+            name=f"seka-pool-{language}-{uuid.uuid4().hex[:8]}",
+            language=language,
+            slot_dir=slot_dir
+        )
+        os.makedirs(container.build_dir)
+        os.makedirs(container.io_dir)
+
+        entrypoint = self.entrypoints.get(language)
+        start = time.perf_counter()
+        try:
+            self.engine.client.containers.run(
+                self.images[language],
+                None if entrypoint else ['infinity'],
+                entrypoint=entrypoint or 'sleep',
+                name=container.name,
+                detach=True,
+                network_mode='none',
+                cgroupns='private',
+                volumes=[f'{container.build_dir}:/build:ro', f'{container.io_dir}:/code'],
+                labels={JUDGE_LABEL: "1"},
+                **container_options()
+            )
+        except DOCKER_ERRORS as e:
+            docker_errors_total.labels("pool_start").inc()
+            log.error("gagal start container", extra=fields(language=language, error=str(e)))
+            self._count("start_failures")
+            shutil.rmtree(slot_dir, ignore_errors=True)
+            return None
+
+        container_start_seconds.labels(self.images[language], "pool").observe(time.perf_counter() - start)
+        self._count("started")
+        return container
+
+    def _remove_container(self, container: PooledContainer):
+        try:
+            self.engine.client.api.remove_container(container.name, force=True)
+        except DOCKER_ERRORS as e:
+            docker_errors_total.labels("remove").inc()
+            log.warning("gagal menghapus container", extra=fields(container=container.name, error=str(e)))
+        shutil.rmtree(container.slot_dir, ignore_errors=True)
+
+    @staticmethod
+    def _wiped(container: PooledContainer) -> bool:
+        """True jika job terakhir berhasil mengosongkan WIPE_DIRS"""
+        try:
+            wiped = stat.S_ISREG(os.lstat(os.path.join(container.io_dir, WIPE_MARKER)).st_mode)
+        except OSError:
+            wiped = False
+        if not wiped:
+            log.warning("gagal mengosongkan path writable", extra=fields(container=container.name))
+        return wiped
+
+    @staticmethod
+    def _reset_slot(container: PooledContainer) -> bool:
+        """
+        Kosongkan /build dan /code milik container.
+        Directory-nya sendiri tidak dihapus karena masih di-bind mount.
+        Return False jika gagal, container akan di-recycle.
+        """
+        try:
+            for directory in (container.build_dir, container.io_dir):
+                for entry in os.scandir(directory):
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+        except OSError as e:
+            log.warning("gagal reset slot", extra=fields(container=container.name, error=str(e)))
+            return False
+        return True
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+
+container_pool = ContainerPool()
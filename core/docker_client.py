@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from .config import DOCKER_BASE_URL, DOCKER_MAX_CONNECTIONS
+from .metrics import container_start_seconds, docker_errors_total
+from .log import get_logger, fields
+import docker, requests, threading, time
+
+log = get_logger("docker")
+
+JUDGE_LABEL = "seka.judge"  # Label semua container judge, dipakai filter event stream
+EXIT_RECHECK_S = 2.0  # Interval cek state langsung jika event exit terlewat
+
+# Error dari daemon (APIError, ImageNotFound, ...) atau koneksi ke socket
+DOCKER_ERRORS = (docker.errors.DockerException, requests.exceptions.RequestException)
+
+@dataclass
+class ContainerRunResult:
+    returncode: int
+    stderr: str = ""  # stdout tidak diambil, runner script menulis output ke /code
+
+class ContainerTimeout(Exception):
+    """Container/exec tidak selesai dalam batas waktu"""
+
+class _ExitWaiter:
+    def __init__(self):
+        self.event = threading.Event()
+        self.exit_code: Optional[int] = None
+
+class DockerEngine:
+    """
+    Satu client Docker Engine API (unix socket, connection pool) yang dipakai
+    bersama oleh executor dan container pool, menggantikan fork CLI `docker`
+    untuk setiap test case.
+
+    Exit container dan exec dilacak lewat satu event stream (/events, event
+    die dan exec_die) yang dibaca thread background; thread yang menunggu
+    hanya menunggu threading.Event, tidak ada blocking wait per container.
+    """
+
+    def __init__(self, base_url: str = DOCKER_BASE_URL, max_connections: int = DOCKER_MAX_CONNECTIONS):
+        self.base_url = base_url
+        self.max_connections = max_connections
+
+        self._client: Optional[docker.DockerClient] = None
+        self._waiters: Dict[str, _ExitWaiter] = {}
+        self._lock = threading.Lock()
+        self._events_thread: Optional[threading.Thread] = None
+        self._events_ready = threading.Event()
+        self._events_stream = None
+        self._closed = False
+
+    @property
+    def client(self) -> docker.DockerClient:
+        """Client dibuat saat pertama dipakai (butuh daemon untuk negosiasi versi API)"""
+        with self._lock:
+            if self._client is None:
+                self._client = docker.DockerClient(base_url=self.base_url, max_pool_size=self.max_connections)
+            return self._client
+
+    def run(
+        self,
+        image: str,
+        command: List[str],
+        volumes: List[str],
+        timeout: float,
+        environment: Optional[Dict[str, str]] = None,
+        **host_options
+    ) -> ContainerRunResult:
+        """
+        Create, start, tunggu exit, ambil stderr, lalu hapus container
+        (pengganti `docker run --rm`). ContainerTimeout jika melewati timeout,
+        container tetap dihapus paksa.
+        """
+        self._ensure_events()
+        start = time.perf_counter()
+        try:
+            container = self.client.containers.create(
+                image,
+                command,
+                volumes=volumes,
+                environment=environment,
+                labels={JUDGE_LABEL: "1"},
+                **host_options
+            )
+        except DOCKER_ERRORS:
+            docker_errors_total.labels("create").inc()
+            raise
+        waiter = self._register(container.id)
+        try:
+            try:
+                container.start()
+            except DOCKER_ERRORS:
+                docker_errors_total.labels("start").inc()
+                raise
+            container_start_seconds.labels(image, "run").observe(time.perf_counter() - start)
+            exit_code = self._wait(waiter, timeout, lambda: self._container_exit_code(container.id))
+            stderr = container.logs(stdout=False, stderr=True).decode("utf-8", errors="replace")
+            return ContainerRunResult(exit_code, stderr)
+        finally:
+            self._unregister(container.id)
+            try:
+                container.remove(force=True)
+            except DOCKER_ERRORS as e:
+                docker_errors_total.labels("remove").inc()
+                log.warning("gagal menghapus container", extra=fields(container=container.short_id, error=str(e)))
+
+    def exec_run(self, container_name: str, command: List[str], timeout: float) -> ContainerRunResult:
+        """
+        Jalankan command di container yang sudah jalan (pengganti `docker exec`).
+        Output command tidak diambil, runner script menulis hasil ke /code.
+        """
+        self._ensure_events()
+        try:
+            exec_id = self.client.api.exec_create(container_name, command)["Id"]
+        except DOCKER_ERRORS:
+            docker_errors_total.labels("exec").inc()
+            raise
+        waiter = self._register(exec_id)
+        try:
+            self.client.api.exec_start(exec_id, detach=True)
+            exit_code = self._wait(waiter, timeout, lambda: self._exec_exit_code(exec_id))
+            return ContainerRunResult(exit_code)
+        except DOCKER_ERRORS:
+            docker_errors_total.labels("exec").inc()
+            raise
+        finally:
+            self._unregister(exec_id)
+
+    def close(self):
+        self._closed = True
+        if self._events_stream is not None:
+            self._events_stream.close()
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def _wait(self, waiter: _ExitWaiter, timeout: float, inspect: Callable[[], Optional[int]]) -> int:
+        """
+        Tunggu exit code dari event stream. Jika event terlewat (misal event
+        stream sedang reconnect), state dicek langsung setiap EXIT_RECHECK_S.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining > 0 and waiter.event.wait(min(remaining, EXIT_RECHECK_S)):
+                return waiter.exit_code
+            exit_code = inspect()
+            if exit_code is not None:
+                return exit_code
+            if remaining <= 0:
+                raise ContainerTimeout(f"Timed out after {timeout}s")
+
+    def _container_exit_code(self, container_id: str) -> Optional[int]:
+        state = self.client.api.inspect_container(container_id)["State"]
+        return None if state["Running"] else state["ExitCode"]
+
+    def _exec_exit_code(self, exec_id: str) -> Optional[int]:
+        state = self.client.api.exec_inspect(exec_id)
+        return None if state["Running"] else state["ExitCode"]
+
+    def _register(self, key: str) -> _ExitWaiter:
+        waiter = _ExitWaiter()
+        with self._lock:
+            self._waiters[key] = waiter
+        return waiter
+
+    def _unregister(self, key: str):
+        with self._lock:
+            self._waiters.pop(key, None)
+
+    def _ensure_events(self):
+        """Start thread event stream jika belum jalan, tunggu sampai tersambung"""
+        with self._lock:
+            if self._events_thread is None or not self._events_thread.is_alive():
+                self._events_ready.clear()
+                self._events_thread = threading.Thread(
+                    target=self._events_loop,
+                    name="seka-docker-events",
+                    daemon=True
+                )
+                self._events_thread.start()
+        self._events_ready.wait(timeout=5)
+
+    def _events_loop(self):
+        while not self._closed:
+            try:
+                self._events_stream = self.client.events(
+                    decode=True,
+                    filters={"type": "container", "event": ["die", "exec_die"], "label": JUDGE_LABEL}
+                )
+                self._events_ready.set()
+                for event in self._events_stream:
+                    self._dispatch(event)
+            except Exception as e:
+                # Thread ini tidak boleh mati, waiter akan fallback ke cek state
+                if self._closed:
+                    break
+                docker_errors_total.labels("events").inc()
+                log.warning("event stream terputus, reconnect", extra=fields(error=str(e)))
+                time.sleep(1)
+
+    def _dispatch(self, event: dict):
+        action = event.get("Action", "")
+        attributes = event.get("Actor", {}).get("Attributes", {})
+        if action == "die":
+            key = event.get("Actor", {}).get("ID")
+        elif action.startswith("exec_die"):
+            key = attributes.get("execID")
+        else:
+            return
+
+        with self._lock:
+            waiter = self._waiters.get(key)
+        if waiter:
+            waiter.exit_code = int(attributes.get("exitCode", -1))
+            waiter.event.set()
+
+
+docker_engine = DockerEngine()
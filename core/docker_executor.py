@@ -5,6 +5,7 @@ import shutil
 from typing import Optional
 from dataclasses import dataclass
 import re
+from .docker_client import docker_engine
 
 @dataclass
 class ExecutionResult:
@@ -17,7 +18,7 @@ class ExecutionResult:
 class DockerExecutor:
     def __init__(self, timeout: int = 5):
         self.timeout = timeout
-        self.client = docker.from_env()
+        self.client = docker_engine.client  # Client Engine API bersama
         
         # Mapping bahasa ke image Docker
         self.image_map = {
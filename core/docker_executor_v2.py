@@ -1,15 +1,38 @@
 from dataclasses import dataclass
-import tempfile, os, subprocess, shutil
+from typing import Dict, Optional
+from .config import COMPILE_TIMEOUT_S, COMPILE_FLAGS, RUNNER_IMAGES
+from .container_pool import ContainerPool, PooledContainer, container_pool
+from .artifact_cache import ArtifactCache, artifact_cache
+from .docker_client import DockerEngine, ContainerRunResult, ContainerTimeout, DOCKER_ERRORS, docker_engine
+from .workspace import make_workspace, make_workspace_file, workspace_usage, workspace_exceeded, container_options
+from .config import WORKSPACE_LIMIT_BYTES
+from .log import get_logger, fields, payload as log_payload
+import os, shutil, threading, time
+
+log = get_logger("executor")
+
+OUTPUT_PREVIEW_BYTES = 1024  # Potongan output program yang disimpan di ExecutionResult.output
 
 @dataclass
 class ExecutionResult:
-    output: str
+    output: str  # Preview output (maksimal OUTPUT_PREVIEW_BYTES), output lengkap di output_path
     status: str  # "completed", "timeout", "error", "compilation_error"
     return_code: int
     mem_kb_used: float | None = None
-    time_ms_used: float | None = None
+    time_ms_used: float | None = None  # CPU time dari cgroup (fallback: wall clock)
+    wall_time_ms: float | None = None
     error_output: str = ""  # Stderr output
     compilation_error: str = ""  # Compilation error message
+    output_path: Optional[str] = None  # File output lengkap, dihapus lewat cleanup_output()
+    workspace_bytes: Optional[int] = None  # Total byte yang ditulis program di /code
+
+@dataclass
+class CompileResult:
+    success: bool
+    build_dir: Optional[str] = None  # Directory berisi artifact hasil compile
+    compilation_error: str = ""
+    time_ms: float = 0.0
+    cached: bool = False  # True jika artifact diambil dari cache (compiler tidak dijalankan)
     
 @dataclass
 class DockerExecutorRequest:
@@ -17,15 +40,28 @@ class DockerExecutorRequest:
     code: str
     input_data: str
     timeout: int = 10
+    build_dir: Optional[str] = None  # Jika diisi, jalankan artifact tanpa compile ulang
+    input_path: Optional[str] = None  # File input di problem store (menggantikan input_data)
+    mode: str = "run"  # "run" atau "check" (artifact adalah checker, butuh build_dir)
+    files: Optional[Dict[str, str]] = None  # File tambahan di /code: {nama: path sumber}
+    time_limit_ms: Optional[float] = None  # Dipakai backend sandbox untuk RLIMIT_CPU
+    memory_limit_kb: Optional[float] = None  # Dipakai backend sandbox untuk RLIMIT_AS/STACK
 
 class DockerExecutorV2:
-    def __init__(self):
-        self.images = {
-            "python": "seka-python-runner",
-            "c" : "seka-c-runner",
-            "cpp" : "seka-cpp-runner",
-            "java" : "seka-java-runner"
-        }
+    # Image ID per bahasa, dipakai sebagai "versi compiler" di key cache
+    _image_ids = {}
+    _image_ids_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool: ContainerPool = container_pool,
+        cache: ArtifactCache = artifact_cache,
+        engine: DockerEngine = docker_engine
+    ):
+        self.images = RUNNER_IMAGES
+        self.pool = pool
+        self.artifact_cache = cache
+        self.engine = engine
         
         self.filenames = {
             "python": "main.py",
@@ -34,103 +70,189 @@ class DockerExecutorV2:
             "java" : "Main.java"
         }
 
+        # Bahasa yang butuh tahap compile di container
+        self.compiled_languages = {"c", "cpp", "java"}
+
+    def compile(self, language: str, code: str, timeout: int = COMPILE_TIMEOUT_S) -> CompileResult:
+        """
+        Compile source code sekali per submission.
+        Artifact (a.out / *.class / main.py) disimpan di build_dir dan
+        dipakai ulang oleh setiap test case lewat execute(build_dir=...)
+        """
+        if language not in self.images:
+            return CompileResult(False, compilation_error=f"Language not supported: {language}")
+
+        start_time = time.perf_counter()
+        build_dir = make_workspace("seka_build_")
+        try:
+            code_path = os.path.join(build_dir, self.filenames[language])
+            with open(code_path, 'w') as f:
+                f.write(code)
+
+            # Python tidak perlu compile, cukup source code-nya
+            if language not in self.compiled_languages:
+                return CompileResult(True, build_dir=build_dir, time_ms=self._elapsed_ms(start_time))
+
+            # Cek cache artifact dulu, jika hit compiler tidak dijalankan sama sekali
+            flags = COMPILE_FLAGS.get(language, "")
+            cache_key = self._cache_key(language, flags, code)
+            cached = self.artifact_cache.get(cache_key) if cache_key else None
+            if cached and not cached.success:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                return CompileResult(
+                    False,
+                    compilation_error=cached.compilation_error,
+                    time_ms=self._elapsed_ms(start_time),
+                    cached=True
+                )
+            if cached:
+                try:
+                    self.artifact_cache.materialize(cached, build_dir)
+                    return CompileResult(True, build_dir=build_dir, time_ms=self._elapsed_ms(start_time), cached=True)
+                except OSError as e:
+                    # Entry di-evict saat disalin, compile ulang
+                    log.warning("artifact cache materialize gagal", extra=fields(error=str(e)))
+
+            result = self.engine.run(
+                self.images[language],
+                ['compile'],
+                # Build dir juga di-mount di /build (path yang sama dengan saat run),
+                # archive AppCDS Java hanya valid untuk classpath yang sama
+                volumes=[f'{build_dir}:/code', f'{build_dir}:/build'],
+                timeout=timeout,
+                **container_options({'COMPILE_FLAGS': flags})
+            )
+
+            if result.returncode != 0:
+                compile_error_file = os.path.join(build_dir, 'compile_error.txt')
+                compile_error = ""
+                if os.path.exists(compile_error_file):
+                    with open(compile_error_file) as f:
+                        compile_error = f.read().strip()
+                shutil.rmtree(build_dir, ignore_errors=True)
+                if cache_key and compile_error:
+                    self.artifact_cache.put(cache_key, False, compilation_error=compile_error)
+                return CompileResult(
+                    False,
+                    compilation_error=compile_error or result.stderr.strip(),
+                    time_ms=self._elapsed_ms(start_time)
+                )
+
+            if cache_key:
+                self.artifact_cache.put(cache_key, True, artifact_dir=build_dir)
+            return CompileResult(True, build_dir=build_dir, time_ms=self._elapsed_ms(start_time))
+
+        except ContainerTimeout:
+            shutil.rmtree(build_dir, ignore_errors=True)
+            return CompileResult(
+                False,
+                compilation_error=f"Compilation timed out (>{timeout}s)",
+                time_ms=self._elapsed_ms(start_time)
+            )
+        except Exception as e:
+            log.exception("compile gagal", extra=fields(language=language))
+            shutil.rmtree(build_dir, ignore_errors=True)
+            return CompileResult(False, compilation_error=str(e), time_ms=self._elapsed_ms(start_time))
+
+    def _cache_key(self, language: str, flags: str, code: str) -> Optional[str]:
+        """Key cache artifact, None jika versi compiler (image ID) tidak diketahui"""
+        if not self.artifact_cache.enabled:
+            return None
+        image_id = self._image_id(language)
+        if not image_id:
+            return None
+        return ArtifactCache.make_key(language, image_id, flags, code)
+
+    def _image_id(self, language: str) -> Optional[str]:
+        with self._image_ids_lock:
+            if language in self._image_ids:
+                return self._image_ids[language]
+        try:
+            image_id = self.engine.client.images.get(self.images[language]).id
+        except DOCKER_ERRORS:
+            return None
+        with self._image_ids_lock:
+            self._image_ids[language] = image_id
+        return image_id
+
+    def cleanup_build(self, compile_result: CompileResult):
+        """Hapus artifact hasil compile setelah semua test case selesai"""
+        if compile_result.build_dir:
+            shutil.rmtree(compile_result.build_dir, ignore_errors=True)
+
+    def cleanup_output(self, result: ExecutionResult):
+        """Hapus file output setelah dibandingkan"""
+        if result.output_path:
+            try:
+                os.unlink(result.output_path)
+            except OSError:
+                pass
+
     def execute(self, payload: DockerExecutorRequest):
         if payload.language not in self.images:
             return ExecutionResult("Languages not supported", "error", 1)
+        
+        # Pakai warm container jika ada yang idle, fallback ke docker run
+        if payload.build_dir:
+            container = self.pool.acquire(payload.language)
+            if container:
+                pooled_result = self._execute_pooled(container, payload)
+                if pooled_result is not None:
+                    return pooled_result
+        
         try:
-            temp_dir = tempfile.mkdtemp()
+            temp_dir = make_workspace("seka_run_")
             
-            filename = self.filenames[payload.language]
-            code_path = os.path.join(temp_dir, filename)
             input_path = os.path.join(temp_dir, 'input.txt')
 
-            with open(code_path, 'w') as f:
-                f.write(payload.code)
-                
             with open(input_path, 'w') as f:
-                f.write(payload.input_data)
+                if not payload.input_path:
+                    f.write(payload.input_data)
+            for name, source_path in (payload.files or {}).items():
+                shutil.copyfile(source_path, os.path.join(temp_dir, name))
             
             docker_image = self.images[payload.language]
             
-            command = [
-                'docker', 'run', '--rm', '-v', f'{temp_dir}:/code', docker_image
-            ]
-            result = subprocess.run(command, capture_output=True, text=True, timeout=payload.timeout)
-            print("Result execute", result)
+            # Input dari problem store di-mount langsung (read-only), tidak disalin
+            input_mount = [f'{payload.input_path}:/code/input.txt:ro'] if payload.input_path else []
             
-            # CASE 1 TIMEOUT
-            if result.returncode == 124:
-                return ExecutionResult("Time Limit Exceeded", "timeout", 124)\
-            # CASE 2 ERROR 
-            elif result.returncode != 0:
-                # Check for compilation error
-                compile_error_file = os.path.join(temp_dir, 'compile_error.txt')
-                if os.path.exists(compile_error_file) and result.returncode == 1:
-                    print('compile_error_file', compile_error_file)
-                    with open(compile_error_file) as f:
-                        compile_error = f.read().strip()
-                        print('compile_error', compile_error)
-                        if compile_error and compile_error != "":
-                            return ExecutionResult(
-                                "",
-                                status="COMPILE_ERROR",
-                                return_code=1,
-                                compilation_error=compile_error
-                            )
-                # If not compilation error, it's runtime error
-                return ExecutionResult(
-                    "",
-                    status="RUNTIME_ERROR",
-                    return_code=result.returncode,
-                    error_output=result.stderr
-                )
-                
-            # CASE 3 SUCCESS
+            if payload.build_dir:
+                # Artifact sudah di-compile, mount read-only dan jalankan saja
+                volumes = [f'{payload.build_dir}:/build:ro', f'{temp_dir}:/code', *input_mount]
+                command = [payload.mode]
             else:
-                output_file = os.path.join(temp_dir, 'output.txt')
-                metrics_file = os.path.join(temp_dir, 'metrics.txt')
-                
-                if os.path.exists(output_file):
-                    with open(output_file) as f:
-                        output = f.read().strip()
-                else:
-                    output = ""
-                
-                # Read metrics
-                if os.path.exists(metrics_file):
-                    with open(metrics_file) as f:
-                        metrics = f.read().strip()
-                else:
-                    metrics = ""
-                    
-                metric_lines = metrics.splitlines()
-                for line in metric_lines:
-                    if line.startswith('MEM:'):
-                        mem_used = float(f"{float(line.split(':')[1]):.2f}")
-                        mem_used = max(0.01, mem_used)  # Minimum 0.01 KB
-
-                    if line.startswith('TIME:'):
-                        time_used = float(line.split(':')[1])
-                        time_used = max(0.01, time_used)  # Minimum 0.01 ms
-                        
-                
-                return ExecutionResult(
-                    output, 
-                    status="SUCCESS", 
-                    return_code=result.returncode, 
-                    mem_kb_used=mem_used, 
-                    time_ms_used=time_used,
-                )
+                filename = self.filenames[payload.language]
+                code_path = os.path.join(temp_dir, filename)
+                with open(code_path, 'w') as f:
+                    f.write(payload.code)
+
+                volumes = [f'{temp_dir}:/code', *input_mount]
+                command = None  # Mode lama: compile lalu run
+            result = self.engine.run(
+                docker_image,
+                command,
+                volumes=volumes,
+                timeout=payload.timeout,
+                cgroupns='private',
+                **container_options()
+            )
+            log.debug("execute", extra=fields(
+                language=payload.language,
+                returncode=result.returncode,
+                stderr=log_payload(result.stderr)
+            ))
+            
+            return self._parse_result(result, temp_dir, mode=payload.mode)
 
-        except subprocess.TimeoutExpired:
+        except ContainerTimeout:
             return ExecutionResult(
                 "",
                 status="TIMEOUT",
                 return_code=124,
                 error_output="Process timed out"
             )
-        except Exception as e:
-            print("ERROR di Execute", e)
+        except Exception:
+            log.exception("execute gagal", extra=fields(language=payload.language))
             return ExecutionResult(
                 "",
                 status="ERROR",
@@ -138,5 +260,182 @@ class DockerExecutorV2:
             )
         finally:
             shutil.rmtree(temp_dir)
+
+    def _execute_pooled(self, container: PooledContainer, payload: DockerExecutorRequest) -> Optional[ExecutionResult]:
+        """
+        Jalankan satu test case di container dari pool.
+        Return None jika docker exec sendiri gagal (container mati),
+        supaya caller fallback ke docker run biasa.
+        """
+        healthy = False
+        try:
+            result = self.pool.run(
+                container,
+                payload.build_dir,
+                payload.input_data,
+                payload.timeout,
+                input_path=payload.input_path,
+                mode=payload.mode,
+                files=payload.files
+            )
+            healthy = True
+            # memory.peak cgroup berlaku seumur container, hanya valid untuk job pertama
+            return self._parse_result(result, container.io_dir, fresh_container=container.uses == 0, mode=payload.mode)
+        except ContainerTimeout:
+            # Proses user masih jalan di container, container harus di-recycle
+            return ExecutionResult(
+                "",
+                status="TIMEOUT",
+                return_code=124,
+                error_output="Process timed out"
+            )
+        except DOCKER_ERRORS as e:
+            # Container mati / exec ditolak daemon
+            log.warning("pool exec gagal, fallback ke docker run", extra=fields(container=container.name, error=str(e)))
+            return None
+        except Exception:
+            log.exception("execute (pool) gagal", extra=fields(container=container.name))
+            return None
+        finally:
+            self.pool.release(container, healthy)
+
+    def _parse_result(
+        self,
+        result: ContainerRunResult,
+        work_dir: str,
+        fresh_container: bool = True,
+        mode: str = "run"
+    ) -> ExecutionResult:
+        """
+        Baca status, output dan metrics dari directory /code milik satu run
+        
+        Metrics:
+        - CG_CPU_USEC / CG_MEM_PEAK: cpu.stat dan memory.peak cgroup v2 container
+        - TIME / MEM: wall clock dan max RSS GNU time (fallback tanpa cgroup v2)
+        memory.peak hanya dipakai jika container baru (bukan container pool
+        yang sudah pernah menjalankan job lain).
+        
+        Mode "check": exit code checker dikembalikan apa adanya (status
+        CHECKED), output berisi pesan checker (stdout + stderr).
+        """
+        # CASE 1 TIMEOUT
+        if result.returncode == 124:
+            return ExecutionResult("Time Limit Exceeded", "timeout", 124)
+        
+        # CASE 1b WORKSPACE PENUH (ulimit -f / total file yang ditulis program)
+        workspace_bytes, _ = usage = workspace_usage(work_dir)
+        if workspace_exceeded(result.returncode, usage):
+            return ExecutionResult(
+                "",
+                status="WORKSPACE_LIMIT",
+                return_code=result.returncode,
+                error_output=f"Workspace limit exceeded ({workspace_bytes} bytes written, limit {WORKSPACE_LIMIT_BYTES})",
+                workspace_bytes=workspace_bytes
+            )
         
-        
\ No newline at end of file
+        if mode == "check":
+            mem_used, time_used, wall_time = self._read_metrics(work_dir, fresh_container)
+            message = ""
+            for name in ('output.txt', 'error.txt'):
+                message_file = os.path.join(work_dir, name)
+                if os.path.exists(message_file):
+                    with open(message_file, 'rb') as f:
+                        message += f.read(OUTPUT_PREVIEW_BYTES).decode('utf-8', errors='replace')
+            return ExecutionResult(
+                message.strip(),
+                status="CHECKED",
+                return_code=result.returncode,
+                mem_kb_used=mem_used,
+                time_ms_used=time_used,
+                wall_time_ms=wall_time
+            )
+        # CASE 2 ERROR 
+        elif result.returncode != 0:
+            # Check for compilation error
+            compile_error_file = os.path.join(work_dir, 'compile_error.txt')
+            if os.path.exists(compile_error_file) and result.returncode == 1:
+                with open(compile_error_file) as f:
+                    compile_error = f.read().strip()
+                    if compile_error and compile_error != "":
+                        return ExecutionResult(
+                            "",
+                            status="COMPILE_ERROR",
+                            return_code=1,
+                            compilation_error=compile_error
+                        )
+            # If not compilation error, it's runtime error
+            return ExecutionResult(
+                "",
+                status="RUNTIME_ERROR",
+                return_code=result.returncode,
+                error_output=result.stderr
+            )
+            
+        # CASE 3 SUCCESS
+        else:
+            output_file = os.path.join(work_dir, 'output.txt')
+            
+            # Output tidak dibaca penuh ke memory: file dipindah keluar dari
+            # work_dir (yang akan dihapus/di-reset) dan dibandingkan secara streaming
+            output = ""
+            output_path = None
+            if os.path.exists(output_file):
+                with open(output_file, 'rb') as f:
+                    output = f.read(OUTPUT_PREVIEW_BYTES).decode('utf-8', errors='replace').strip()
+                output_path = make_workspace_file("seka_output_")
+                shutil.move(output_file, output_path)
+            
+            mem_used, time_used, wall_time = self._read_metrics(work_dir, fresh_container)
+            
+            return ExecutionResult(
+                output, 
+                status="SUCCESS", 
+                return_code=result.returncode, 
+                mem_kb_used=mem_used, 
+                time_ms_used=time_used,
+                wall_time_ms=wall_time,
+                output_path=output_path,
+                workspace_bytes=workspace_bytes,
+            )
+
+    def _read_metrics(self, work_dir: str, fresh_container: bool) -> tuple:
+        """(memory KB, CPU time ms, wall clock ms) dari metrics.txt"""
+        metrics_file = os.path.join(work_dir, 'metrics.txt')
+        # Read metrics
+        if os.path.exists(metrics_file):
+            with open(metrics_file) as f:
+                metrics = f.read().strip()
+        else:
+            metrics = ""
+            
+        mem_used = None
+        time_used = None
+        cgroup_cpu_ms = None
+        cgroup_mem_kb = None
+        metric_lines = metrics.splitlines()
+        for line in metric_lines:
+            if line.startswith('MEM:'):
+                mem_used = float(f"{float(line.split(':')[1]):.2f}")
+                mem_used = max(0.01, mem_used)  # Minimum 0.01 KB
+
+            if line.startswith('TIME:'):
+                time_used = float(line.split(':')[1])
+                time_used = max(0.01, time_used)  # Minimum 0.01 ms
+            
+            if line.startswith('CG_CPU_USEC:'):
+                cgroup_cpu_ms = float(line.split(':')[1]) / 1000
+            
+            if line.startswith('CG_MEM_PEAK:'):
+                cgroup_mem_kb = float(line.split(':')[1]) / 1024
+        
+        wall_time = time_used
+        if cgroup_cpu_ms is not None:
+            time_used = max(0.01, round(cgroup_cpu_ms, 2))
+        if cgroup_mem_kb is not None and fresh_container:
+            mem_used = max(0.01, round(cgroup_mem_kb, 2))
+        
+        return mem_used, time_used, wall_time
+
+    @staticmethod
+    def _elapsed_ms(start_time: float) -> float:
+        return (time.perf_counter() - start_time) * 1000
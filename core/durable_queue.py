@@ -0,0 +1,370 @@
+from .models import JudgeRequest, JudgeLane
+from .config import (
+    JUDGE_WORKERS, JOB_QUEUE_MAX_PENDING, JOB_QUEUE_DB, JOB_LEASE_S, JOB_MAX_ATTEMPTS,
+    JOB_POLL_MS, JOB_RETENTION_S
+)
+from .admission import AdmissionController, AdmissionRejected, admission_controller, lane_for
+from .job_queue import Submission, SubmissionStatus
+from .metrics import queue_depth, admission_rejections_total
+from .log import get_logger, fields, log_context
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+import json, os, socket, sqlite3, threading, time, uuid
+
+log = get_logger("durable_queue")
+
+PURGE_INTERVAL_S = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error_message TEXT,
+    created_at TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    finished_ts REAL,
+    worker_id TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority, seq);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (status, lease_expires);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, finished_ts);
+"""
+
+# Job interactive diambil worker lebih dulu
+PRIORITIES = {JudgeLane.INTERACTIVE: 0, JudgeLane.BATCH: 1}
+
+@dataclass
+class LeasedJob:
+    id: str
+    payload: JudgeRequest
+    created_ts: float
+    started_ts: float
+    attempts: int
+
+class DurableJobQueue:
+    """
+    Antrian judging durable di SQLite (WAL), interface sama dengan JobQueue.
+
+    Proses API hanya menulis job; worker (thread lokal sebanyak worker_count
+    dan/atau proses worker.py di host lain yang memakai file database yang
+    sama) mengambil job dengan lease. Selama job di-judge, lease diperpanjang
+    (heartbeat) oleh satu thread per proses. Job yang lease-nya habis karena
+    worker mati dikembalikan ke antrian, setelah max_attempts kali dianggap
+    FAILED. Hasil ditulis kembali ke database hanya jika worker masih
+    memegang lease job tersebut.
+    """
+
+    def __init__(
+        self,
+        judge_fn: Callable,
+        path: str = JOB_QUEUE_DB,
+        worker_count: int = JUDGE_WORKERS,
+        lease_s: float = JOB_LEASE_S,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        poll_ms: float = JOB_POLL_MS,
+        max_pending: int = JOB_QUEUE_MAX_PENDING,
+        retention_s: float = JOB_RETENTION_S,
+        admission: AdmissionController = admission_controller,
+        worker_id: Optional[str] = None
+    ):
+        self.judge_fn = judge_fn
+        self.path = path
+        self.worker_count = worker_count
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.poll_s = poll_ms / 1000
+        self.max_pending = max_pending
+        self.retention_s = retention_s
+        self.admission = admission
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+        self._local = threading.local()
+        self._stop = threading.Event()
+        # Heartbeat punya event sendiri: tetap jalan selama job aktif setelah stop()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._active = set()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+        queue_depth.set_function(self._pending_count)
+
+    def start(self):
+        """Start worker thread lokal (tidak ada jika worker_count 0) dan heartbeat"""
+        if self._workers or self.worker_count <= 0:
+            return
+        self._stop.clear()
+        self._heartbeat_stop.clear()
+        for idx in range(self.worker_count):
+            self._workers.append(self._spawn(self._worker_loop, f"seka-durable-worker-{idx}"))
+        self._heartbeat_thread = self._spawn(self._heartbeat_loop, "seka-durable-heartbeat")
+
+    def stop(self):
+        """Sinyal berhenti mengambil job baru (tidak blok, aman dari signal handler)"""
+        self._stop.set()
+        self._wakeup.set()
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """
+        Berhenti mengambil job baru; job yang sedang jalan diselesaikan dulu.
+        Lease job tetap diperpanjang sampai semua worker selesai, baru
+        heartbeat dihentikan. timeout (per worker) hanya untuk membatasi
+        waktu shutdown: job yang belum selesai akan diambil ulang worker
+        lain setelah lease-nya habis.
+        """
+        self.stop()
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+        self._workers = []
+
+        with self._lock:
+            active = list(self._active)
+        if active:
+            log.warning("shutdown dengan job yang belum selesai", extra=fields(submission_ids=active))
+        self._heartbeat_stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+
+    def submit(self, payload: JudgeRequest) -> Submission:
+        pending = self._pending_count()
+        if pending >= self.max_pending:
+            lane = lane_for(payload)
+            admission_rejections_total.labels(lane.value).inc()
+            raise AdmissionRejected(self.admission.estimate_wait_s(pending, lane))
+
+        submission = Submission(id=str(uuid.uuid4()), payload=payload)
+        self._db().execute(
+            "INSERT INTO jobs (id, payload, priority, status, created_at, created_ts) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                submission.id,
+                payload.model_dump_json(),
+                PRIORITIES[lane_for(payload)],
+                SubmissionStatus.PENDING,
+                submission.created_at,
+                time.time()
+            )
+        )
+        self._wakeup.set()
+        return submission
+
+    def get(self, submission_id: str) -> Optional[Submission]:
+        row = self._db().execute(
+            "SELECT id, payload, status, result, error_message, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+            (submission_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return Submission(
+            id=row[0],
+            payload=JudgeRequest.model_validate_json(row[1]),
+            status=row[2],
+            result=json.loads(row[3]) if row[3] else None,
+            error_message=row[4],
+            created_at=row[5],
+            started_at=row[6],
+            finished_at=row[7]
+        )
+
+    def get_stats(self) -> dict:
+        db = self._db()
+        counts = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        active_workers = db.execute(
+            "SELECT COUNT(DISTINCT worker_id) FROM jobs WHERE status = ? AND lease_expires >= ?",
+            (SubmissionStatus.JUDGING, time.time())
+        ).fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "workers": len(self._workers),
+            "active_workers": active_workers,
+            "queue_depth": counts.get(SubmissionStatus.PENDING, 0),
+            "pending": counts.get(SubmissionStatus.PENDING, 0),
+            "judging": counts.get(SubmissionStatus.JUDGING, 0),
+            "finished": counts.get(SubmissionStatus.FINISHED, 0),
+            "failed": counts.get(SubmissionStatus.FAILED, 0)
+        }
+
+    def run_forever(self):
+        """Dipakai worker.py: jalankan worker sampai stop() dipanggil"""
+        self.start()
+        while not self._stop.wait(1):
+            pass
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _spawn(target: Callable, name: str) -> threading.Thread:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job = self._lease()
+            except sqlite3.Error:
+                log.exception("lease job gagal")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_s)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job: LeasedJob):
+        with self._lock:
+            self._active.add(job.id)
+        try:
+            with log_context(submission_id=job.id):
+                result = self.judge_fn(job.payload)
+            result.queue_wait_ms += max(0.0, job.started_ts - job.created_ts) * 1000
+            self._finish(job.id, SubmissionStatus.FINISHED, result=json.dumps(result.to_dict()))
+        except Exception as e:
+            log.exception("judge submission gagal", extra=fields(submission_id=job.id, attempt=job.attempts))
+            self._finish(job.id, SubmissionStatus.FAILED, error_message=str(e))
+        finally:
+            with self._lock:
+                self._active.discard(job.id)
+
+    def _heartbeat_loop(self):
+        last_purge = 0.0
+        while not self._heartbeat_stop.wait(self.lease_s / 3):
+            with self._lock:
+                active = list(self._active)
+            try:
+                if active:
+                    self._heartbeat(active)
+                if time.monotonic() - last_purge >= PURGE_INTERVAL_S:
+                    self._purge()
+                    last_purge = time.monotonic()
+            except sqlite3.Error:
+                log.exception("heartbeat gagal")
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        """Satu koneksi per thread (autocommit, transaksi eksplisit di _transaction)"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        """Transaksi write (BEGIN IMMEDIATE) sehingga dua worker tidak mengambil job yang sama"""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _pending_count(self) -> int:
+        return self._db().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = ?", (SubmissionStatus.PENDING,)
+        ).fetchone()[0]
+
+    def _has_work(self, now: float) -> bool:
+        """Cek tanpa lock write: ada job PENDING atau lease yang sudah habis"""
+        db = self._db()
+        return db.execute(
+            "SELECT 1 FROM jobs WHERE status = ? LIMIT 1", (SubmissionStatus.PENDING,)
+        ).fetchone() is not None or db.execute(
+            "SELECT 1 FROM jobs WHERE status = ? AND lease_expires < ? LIMIT 1", (SubmissionStatus.JUDGING, now)
+        ).fetchone() is not None
+
+    def _lease(self) -> Optional[LeasedJob]:
+        now = time.time()
+        if not self._has_work(now):
+            return None
+
+        with self._transaction() as db:
+            # Lease habis = worker mati / hang: kembalikan ke antrian atau FAILED
+            failed = db.execute(
+                "UPDATE jobs SET status = ?, error_message = ?, finished_at = ?, finished_ts = ?, worker_id = NULL, lease_expires = NULL "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (
+                    SubmissionStatus.FAILED,
+                    f"Worker lost {self.max_attempts} times while judging",
+                    datetime.now().isoformat(),
+                    now,
+                    SubmissionStatus.JUDGING,
+                    now,
+                    self.max_attempts
+                )
+            ).rowcount
+            requeued = db.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires = NULL WHERE status = ? AND lease_expires < ?",
+                (SubmissionStatus.PENDING, SubmissionStatus.JUDGING, now)
+            ).rowcount
+            if failed or requeued:
+                log.warning("lease habis", extra=fields(requeued=requeued, failed=failed))
+
+            row = db.execute(
+                "SELECT id, payload, created_ts, attempts FROM jobs WHERE status = ? ORDER BY priority, seq LIMIT 1",
+                (SubmissionStatus.PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, started_at = ? WHERE id = ?",
+                (SubmissionStatus.JUDGING, self.worker_id, now + self.lease_s, datetime.now().isoformat(), row[0])
+            )
+
+        return LeasedJob(
+            id=row[0],
+            payload=JudgeRequest.model_validate_json(row[1]),
+            created_ts=row[2],
+            started_ts=now,
+            attempts=row[3] + 1
+        )
+
+    def _heartbeat(self, job_ids: List[str]):
+        placeholders = ",".join("?" * len(job_ids))
+        extended = self._db().execute(
+            f"UPDATE jobs SET lease_expires = ? WHERE worker_id = ? AND status = ? AND id IN ({placeholders})",
+            (time.time() + self.lease_s, self.worker_id, SubmissionStatus.JUDGING, *job_ids)
+        ).rowcount
+        if extended < len(job_ids):
+            log.warning("lease hilang, hasil job akan dibuang", extra=fields(jobs=len(job_ids) - extended))
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None, error_message: Optional[str] = None):
+        updated = self._db().execute(
+            "UPDATE jobs SET status = ?, result = ?, error_message = ?, finished_at = ?, finished_ts = ?, "
+            "worker_id = NULL, lease_expires = NULL WHERE id = ? AND worker_id = ? AND status = ?",
+            (status, result, error_message, datetime.now().isoformat(), time.time(), job_id, self.worker_id, SubmissionStatus.JUDGING)
+        ).rowcount
+        if not updated:
+            # Lease sudah diambil worker lain (heartbeat terlambat), hasil worker itu yang dipakai
+            log.warning("hasil dibuang, lease sudah tidak dipegang", extra=fields(submission_id=job_id))
+
+    def _purge(self):
+        deleted = self._db().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_ts < ?",
+            (SubmissionStatus.FINISHED, SubmissionStatus.FAILED, time.time() - self.retention_s)
+        ).rowcount
+        if deleted:
+            log.info("job lama dihapus", extra=fields(deleted=deleted))
@@ -0,0 +1,155 @@
+from .models import JudgeRequest
+from .config import JUDGE_WORKERS, SUBMISSION_RESULTS_MAX, JOB_QUEUE_MAX_PENDING
+from .admission import AdmissionController, AdmissionRejected, admission_controller, lane_for
+from .metrics import queue_depth, admission_rejections_total
+from .log import get_logger, fields, log_context
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from typing import Callable, Optional
+from datetime import datetime
+import queue, threading, time, uuid
+
+log = get_logger("queue")
+
+class SubmissionStatus:
+    PENDING = "PENDING"
+    JUDGING = "JUDGING"
+    FINISHED = "FINISHED"
+    FAILED = "FAILED"
+
+@dataclass
+class Submission:
+    """Satu submission di antrian judging"""
+    id: str
+    payload: JudgeRequest
+    status: str = SubmissionStatus.PENDING
+    result: Optional[dict] = None
+    error_message: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.perf_counter, repr=False)
+
+    def to_dict(self):
+        return {
+            "submission_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error_message": self.error_message,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class JobQueue:
+    """
+    Antrian judging in-process.
+    submit() langsung mengembalikan submission ID, worker thread
+    menjalankan judge_fn di background dan menyimpan JudgeResult.to_dict()
+    
+    Jika sudah ada max_pending submission yang menunggu worker, submit()
+    melempar AdmissionRejected (Retry-After diperkirakan dari admission).
+    """
+
+    def __init__(
+        self,
+        judge_fn: Callable,
+        worker_count: int = JUDGE_WORKERS,
+        max_results: int = SUBMISSION_RESULTS_MAX,
+        max_pending: int = JOB_QUEUE_MAX_PENDING,
+        admission: AdmissionController = admission_controller
+    ):
+        self.judge_fn = judge_fn
+        self.worker_count = worker_count
+        self.max_results = max_results
+        self.max_pending = max_pending
+        self.admission = admission
+
+        self._queue: queue.Queue = queue.Queue()
+        self._submissions: "OrderedDict[str, Submission]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+        queue_depth.set_function(self._queue.qsize)
+
+    def start(self):
+        if self._workers:
+            return
+        for idx in range(self.worker_count):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"seka-judge-worker-{idx}",
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def shutdown(self):
+        """Kirim sinyal berhenti ke semua worker (job yang sedang jalan diselesaikan dulu)"""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._workers = []
+
+    def submit(self, payload: JudgeRequest) -> Submission:
+        pending = self._queue.qsize()
+        if pending >= self.max_pending:
+            lane = lane_for(payload)
+            admission_rejections_total.labels(lane.value).inc()
+            raise AdmissionRejected(self.admission.estimate_wait_s(pending, lane))
+        submission = Submission(id=str(uuid.uuid4()), payload=payload)
+        with self._lock:
+            self._submissions[submission.id] = submission
+            self._evict_finished()
+        self._queue.put(submission)
+        return submission
+
+    def get(self, submission_id: str) -> Optional[Submission]:
+        with self._lock:
+            return self._submissions.get(submission_id)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            statuses = [s.status for s in self._submissions.values()]
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize(),
+            "pending": statuses.count(SubmissionStatus.PENDING),
+            "judging": statuses.count(SubmissionStatus.JUDGING),
+            "finished": statuses.count(SubmissionStatus.FINISHED),
+            "failed": statuses.count(SubmissionStatus.FAILED)
+        }
+
+    def _worker_loop(self):
+        while True:
+            submission = self._queue.get()
+            if submission is None:
+                break
+
+            submission.status = SubmissionStatus.JUDGING
+            submission.started_at = datetime.now().isoformat()
+            queued_ms = (time.perf_counter() - submission.enqueued_at) * 1000
+            try:
+                with log_context(submission_id=submission.id):
+                    result = self.judge_fn(submission.payload)
+                result.queue_wait_ms += queued_ms
+                submission.result = result.to_dict()
+                submission.status = SubmissionStatus.FINISHED
+            except Exception as e:
+                log.exception("judge submission gagal", extra=fields(submission_id=submission.id))
+                submission.error_message = str(e)
+                submission.status = SubmissionStatus.FAILED
+            finally:
+                submission.finished_at = datetime.now().isoformat()
+
+    def _evict_finished(self):
+        """Buang hasil submission paling lama yang sudah selesai jika melebihi max_results"""
+        overflow = len(self._submissions) - self.max_results
+        if overflow <= 0:
+            return
+        for submission_id in list(self._submissions):
+            if overflow <= 0:
+                break
+            if self._submissions[submission_id].status in (SubmissionStatus.FINISHED, SubmissionStatus.FAILED):
+                del self._submissions[submission_id]
+                overflow -= 1
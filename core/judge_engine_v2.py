@@ -1,8 +1,96 @@
 from .docker_executor_v2 import DockerExecutorV2, DockerExecutorRequest, ExecutionResult
-from .models import JudgeRequest, TestCase, Verdict
-from dataclasses import dataclass, field
-from typing import Optional, List
+from .sandbox_executor import SandboxExecutor
+from .models import JudgeRequest, BatchJudgeRequest, TestCase, Verdict, CompareMode
+from .comparator import compare_output
+from .problem_store import Problem, ProblemStore, StoredTestCase, problem_store
+from .checker import CheckerRegistry, PreparedChecker, checker_registry
+from .admission import AdmissionController, Ticket, admission_controller, lane_for
+from .verdict_cache import VerdictCache, verdict_cache, HIT, MISS
+from .submission_store import SubmissionStore, submission_store
+from .log import get_logger, fields, payload as log_payload, log_context, current_context, run_in_context
+from .metrics import compile_seconds, run_seconds, compare_seconds, submissions_total, test_cases_total, submissions_in_flight, verdict_cache_requests_total
+from .config import PARALLEL_TESTS_PER_SUBMISSION, MAX_PARALLEL_TESTS, WALL_TIME_LIMIT_FACTOR, BATCH_WORKERS, EXECUTOR_BACKENDS
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional, List
 from datetime import datetime
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+log = get_logger("judge")
+
+# Verdict yang bisa berubah karena beban host (TLE) atau kesalahan judge (SE)
+# tidak disimpan di verdict cache, hanya dibagi ke request identik yang
+# sedang menunggu
+UNSTABLE_VERDICTS = (Verdict.TIME_LIMIT_EXCEEDED, Verdict.SYSTEM_ERROR)
+
+def _preview(text: str) -> str:
+    return text[:100] + "..." if len(text) > 100 else text
+
+class FairSemaphore:
+    """
+    Semaphore FIFO: slot yang dilepas langsung diberikan ke thread yang
+    menunggu paling lama, sehingga test case jalan sesuai urutan antrian
+    (threading.Semaphore bisa "diserobot" thread yang baru datang).
+    """
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+        waiter.wait()
+    
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._value += 1
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
+# Batas global test case yang jalan bersamaan (semua submission)
+global_test_slots = FairSemaphore(MAX_PARALLEL_TESTS)
+
+class FailFastState:
+    """
+    Nomor test case non-AC paling kecil untuk stop_on_first_failure.
+    Hanya test case SETELAH nomor ini yang di-skip, test case sebelumnya
+    tetap dijalankan walaupun selesai belakangan (eksekusi paralel).
+    """
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.first_failure: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def should_skip(self, case_number: int) -> bool:
+        first_failure = self.first_failure
+        return first_failure is not None and case_number > first_failure
+    
+    def record(self, case_number: int, verdict: Verdict):
+        if not self.enabled or verdict == Verdict.ACCEPTED:
+            return
+        with self._lock:
+            if self.first_failure is None or case_number < self.first_failure:
+                self.first_failure = case_number
 
 @dataclass
 class TestCaseResult:
@@ -15,6 +103,7 @@ class TestCaseResult:
     expected_output: str
     actual_output: str
     error_message: Optional[str] = None
+    checker_time_ms: float = 0.0  # Waktu checker (tidak termasuk time_ms solusi)
     
     def to_dict(self):
         return {
@@ -22,10 +111,11 @@ class TestCaseResult:
             "verdict": self.verdict.value,
             "time_ms": round(self.time_ms, 2) if self.time_ms else 0,
             "memory_kb": round(self.memory_kb, 2) if self.memory_kb else 0,
-            "input_data": self.input_data[:100] + "..." if len(self.input_data) > 100 else self.input_data,
-            "expected_output": self.expected_output[:100] + "..." if len(self.expected_output) > 100 else self.expected_output,
-            "actual_output": self.actual_output[:100] + "..." if len(self.actual_output) > 100 else self.actual_output,
-            "error_message": self.error_message
+            "input_data": _preview(self.input_data),
+            "expected_output": _preview(self.expected_output),
+            "actual_output": _preview(self.actual_output),
+            "error_message": self.error_message,
+            "checker_time_ms": round(self.checker_time_ms, 2)
         }
 
 @dataclass
@@ -42,6 +132,16 @@ class JudgeResult:
     avg_time_ms: float
     max_memory_kb: float
     
+    # Phase timing (wall clock)
+    compile_time_ms: float = 0.0
+    execution_time_ms: float = 0.0
+    compile_cached: bool = False
+    checker_time_ms: float = 0.0
+    skipped_cases: int = 0
+    queue_wait_ms: float = 0.0  # Menunggu slot admission (dan antrian async)
+    lane: str = "batch"  # Lane admission (interactive / batch)
+    cached: bool = False  # Hasil dari verdict cache atau judging identik yang sedang jalan
+    
     # Details
     test_results: List[TestCaseResult] = field(default_factory=list)
     error_message: Optional[str] = None
@@ -53,10 +153,18 @@ class JudgeResult:
             "score": round(self.score, 2),
             "total_cases": self.total_cases,
             "passed_cases": self.passed_cases,
+            "skipped_cases": self.skipped_cases,
             "total_time_ms": round(self.total_time_ms, 2),
             "max_time_ms": round(self.max_time_ms, 2),
             "avg_time_ms": round(self.avg_time_ms, 2),
             "max_memory_kb": round(self.max_memory_kb, 2),
+            "compile_time_ms": round(self.compile_time_ms, 2),
+            "execution_time_ms": round(self.execution_time_ms, 2),
+            "compile_cached": self.compile_cached,
+            "checker_time_ms": round(self.checker_time_ms, 2),
+            "queue_wait_ms": round(self.queue_wait_ms, 2),
+            "lane": self.lane,
+            "cached": self.cached,
             "test_results": [tr.to_dict() for tr in self.test_results],
             "error_message": self.error_message,
             "judged_at": self.judged_at
@@ -64,15 +172,138 @@ class JudgeResult:
 
 
 class JudgeEngineV2:
-    def __init__(self):
-        self.docker_executor = DockerExecutorV2()
+    def __init__(
+        self,
+        problems: ProblemStore = problem_store,
+        checkers: CheckerRegistry = checker_registry,
+        admission: AdmissionController = admission_controller,
+        cache: VerdictCache = verdict_cache,
+        store: SubmissionStore = submission_store
+    ):
+        # Backend sandbox hanya dipakai jika ada bahasa yang memilihnya (SEKA_EXECUTOR_<LANG>)
+        self.docker_executor = SandboxExecutor() if "sandbox" in EXECUTOR_BACKENDS.values() else DockerExecutorV2()
+        self.problem_store = problems
+        self.checkers = checkers
+        self.admission = admission
+        self.verdict_cache = cache
+        self.submission_store = store
     
-    def execute(self, payload: JudgeRequest) -> JudgeResult:
+    def execute(
+        self,
+        payload: JudgeRequest,
+        on_test_result: Optional[Callable[[TestCaseResult], None]] = None,
+        problem: Optional[Problem] = None,
+        ticket: Optional[Ticket] = None
+    ) -> JudgeResult:
         """
         Main execution method untuk judging
+        
+        on_test_result (opsional) dipanggil untuk setiap TestCaseResult
+        begitu test case tersebut selesai (urutan selesai, bukan urutan case),
+        dipakai untuk streaming hasil ke client.
+        
+        problem (opsional) menggantikan test set dari payload, dipakai
+        batch judging supaya test set cukup disiapkan sekali.
+        
+        ticket (opsional) adalah reservasi admission dari HTTP edge (yang
+        bisa menolak request); tanpa ticket submission tetap mengantri slot.
+        
+        Hasil request identik diambil dari verdict cache, atau ditunggu dari
+        judging yang sedang jalan, tanpa memakai slot eksekusi (cached=True).
         """
+        # Correlation ID dari caller (job queue, batch) atau dibuat di sini,
+        # juga dipakai sebagai ID di submission store
+        submission_id = current_context().get("submission_id") or uuid.uuid4().hex[:12]
+        # Versi problem dipegang sampai judging selesai (upload ulang tidak mengubah test set)
+        leased = None
+        if problem is None:
+            leased = problem = self._try_acquire_problem(payload)
         try:
-            test_cases = payload.test_cases
+            result = self._lookup_or_judge(submission_id, payload, on_test_result, problem, ticket)
+        finally:
+            if leased is not None:
+                self.problem_store.release(leased)
+        self.submission_store.record(submission_id, payload, result)
+        return result
+    
+    def _lookup_or_judge(
+        self,
+        submission_id: str,
+        payload: JudgeRequest,
+        on_test_result: Optional[Callable[[TestCaseResult], None]],
+        problem: Optional[Problem],
+        ticket: Optional[Ticket]
+    ) -> JudgeResult:
+        key = self._cache_key(payload, problem)
+        if key is None:
+            return self._judge(submission_id, payload, on_test_result, problem, ticket)
+        
+        status, entry = self.verdict_cache.acquire(key)
+        verdict_cache_requests_total.labels(status).inc()
+        if status == MISS:
+            try:
+                result = self._judge(submission_id, payload, on_test_result, problem, ticket)
+            except BaseException as e:
+                self.verdict_cache.complete(key, entry, error=e)
+                raise
+            cached = self._cache_entry(result)
+            self.verdict_cache.complete(
+                key,
+                entry,
+                cached,
+                size=len(json.dumps(cached.to_dict())),
+                store=self._cacheable(result)
+            )
+            return result
+        
+        if ticket is not None:
+            ticket.release()
+        with log_context(submission_id=submission_id):
+            log.info("verdict cache", extra=fields(result=status, language=payload.language))
+            cached = entry if status == HIT else entry.wait()
+        result = replace(cached, cached=True, lane=lane_for(payload).value)
+        if on_test_result:
+            for test_result in result.test_results:
+                on_test_result(test_result)
+        return result
+    
+    def has_cached_verdict(self, payload: JudgeRequest) -> bool:
+        """Hasil payload sudah ada di verdict cache (request tidak butuh slot admission)"""
+        key = self._cache_key(payload, self._try_resolve_problem(payload))
+        return key is not None and self.verdict_cache.contains(key)
+    
+    def _judge(
+        self,
+        submission_id: str,
+        payload: JudgeRequest,
+        on_test_result: Optional[Callable[[TestCaseResult], None]],
+        problem: Optional[Problem],
+        ticket: Optional[Ticket]
+    ) -> JudgeResult:
+        if ticket is None:
+            ticket = self.admission.reserve(lane_for(payload), force=True)
+        with ticket:
+            submissions_in_flight.inc()
+            try:
+                with log_context(submission_id=submission_id):
+                    final_result = self._execute(payload, on_test_result, problem)
+            finally:
+                submissions_in_flight.dec()
+        final_result.queue_wait_ms = ticket.queue_wait_ms
+        final_result.lane = ticket.lane.value
+        submissions_total.labels(payload.language, final_result.verdict.value).inc()
+        return final_result
+    
+    def _execute(
+        self,
+        payload: JudgeRequest,
+        on_test_result: Optional[Callable[[TestCaseResult], None]],
+        problem: Optional[Problem]
+    ) -> JudgeResult:
+        try:
+            if problem is None:
+                problem = self._resolve_problem(payload)
+            test_cases = problem.test_cases if problem else payload.test_cases
             code = payload.code
             language = payload.language
             
@@ -80,74 +311,84 @@ class JudgeEngineV2:
             global_time_limit = payload.time_limit_ms or 5000  # 5 second
             global_memory_limit = payload.memory_limit_kb or 256000  # 256 MB
             
-            print(f'\n{"="*60}')
-            print(f'🔍 Starting Judge Process')
-            print(f'Language: {language}')
-            print(f'Test Cases: {len(test_cases)}')
-            print(f'Time Limit: {global_time_limit}ms')
-            print(f'Memory Limit: {global_memory_limit}KB')
-            print(f'{"="*60}\n')
+            log.info("judge start", extra=fields(
+                language=language,
+                problem_id=payload.problem_id,
+                test_cases=len(test_cases),
+                time_limit_ms=global_time_limit,
+                memory_limit_kb=global_memory_limit,
+                code=log_payload(code)
+            ))
             
-            test_results = []
+            # Compile sekali untuk semua test case
+            compile_result = self.docker_executor.compile(language, code)
+            log.info("compile", extra=fields(
+                success=compile_result.success,
+                time_ms=round(compile_result.time_ms, 2),
+                cached=compile_result.cached,
+                compilation_error=log_payload(compile_result.compilation_error)
+            ))
+            compile_seconds.labels(language, str(compile_result.cached).lower()).observe(compile_result.time_ms / 1000)
             
-            # Execute each test case
-            for idx, test_case in enumerate(test_cases, start=1):
-                print(f'📝 Test Case {idx}/{len(test_cases)}:')
-                
-                # Get limits (per-test or global)
-                time_limit = global_time_limit
-                memory_limit =  global_memory_limit
-                
-                # Execute test case
-                executor_payload = DockerExecutorRequest(
-                    language,
-                    code,
-                    input_data=test_case.input,
-                    timeout=int(time_limit / 1000) + 5  # Convert to seconds + buffer
+            if not compile_result.success:
+                final_result = self._compilation_error_result(
+                    test_cases,
+                    compile_result.compilation_error
                 )
+                if on_test_result:
+                    for test_result in final_result.test_results:
+                        on_test_result(test_result)
+                final_result.compile_time_ms = compile_result.time_ms
+                final_result.compile_cached = compile_result.cached
+                return final_result
+            
+            run_start = time.perf_counter()
+            checker = None
+            try:
+                # Checker di-compile sekali dan disimpan di registry (warm)
+                if problem and problem.checker:
+                    checker = self.checkers.prepare(problem.checker.language, problem.checker.code)
                 
-                execute_result = self.docker_executor.execute(executor_payload)
-                
-                # Evaluate result
-                test_result = self.evaluate_result(
-                    idx, 
-                    test_case, 
-                    execute_result,
-                    time_limit,
-                    memory_limit
+                test_results = self._run_test_cases(
+                    payload,
+                    test_cases,
+                    compile_result.build_dir,
+                    global_time_limit,
+                    global_memory_limit,
+                    checker,
+                    on_test_result
                 )
-                
-                test_results.append(test_result)
-                
-                # Print result
-                print(f'{test_result.verdict.value} | '
-                      f'Time: {test_result.time_ms}ms | '
-                      f'Memory: {test_result.memory_kb}KB')
-                
-                if test_result.error_message:
-                    print(f'   ⚠️  {test_result.error_message}')
-                
-                print()
+            finally:
+                if checker is not None:
+                    self.checkers.release(checker)
+                self.docker_executor.cleanup_build(compile_result)
             
             # Calculate overall result
             final_result = self.calculate_final_result(test_results, len(test_cases))
+            final_result.compile_time_ms = compile_result.time_ms
+            final_result.compile_cached = compile_result.cached
+            final_result.execution_time_ms = (time.perf_counter() - run_start) * 1000
             
-            print(f'\n{"="*60}')
-            print(f' Final Verdict: {final_result.verdict.value}')
-            print(f' Score: {final_result.score}/100')
-            print(f' Passed: {final_result.passed_cases}/{final_result.total_cases}')
-            print(f' Max Time: {final_result.max_time_ms}ms')
-            print(f' Max Memory: {final_result.max_memory_kb}KB')
-            print(f'{"="*60}\n')
+            log.info("judge done", extra=fields(
+                verdict=final_result.verdict.value,
+                score=final_result.score,
+                passed=final_result.passed_cases,
+                total=final_result.total_cases,
+                max_time_ms=final_result.max_time_ms,
+                max_memory_kb=final_result.max_memory_kb,
+                compile_time_ms=round(final_result.compile_time_ms, 2),
+                execution_time_ms=round(final_result.execution_time_ms, 2),
+                checker_time_ms=round(final_result.checker_time_ms, 2) if checker else None
+            ))
             
             return final_result
             
         except Exception as e:
-            print(f'Critical Error: {str(e)}')
+            log.exception("judge gagal")
             return JudgeResult(
                 verdict=Verdict.RUNTIME_ERROR,
                 score=0.0,
-                total_cases=len(payload.test_cases),
+                total_cases=len(problem.test_cases) if problem else len(payload.test_cases),
                 passed_cases=0,
                 total_time_ms=0.0,
                 max_time_ms=0.0,
@@ -157,13 +398,334 @@ class JudgeEngineV2:
                 error_message=f"Critical error: {str(e)}"
             )
     
+    def execute_batch(
+        self,
+        batch: BatchJudgeRequest,
+        on_submission_result: Callable[[str, JudgeResult], None]
+    ) -> dict:
+        """
+        Judge banyak submission dengan satu test set.
+        
+        Test set disiapkan sekali (test case inline ditulis ke problem store
+        sementara sehingga setiap run cukup me-mount file input), lalu
+        submission dijalankan paralel sampai BATCH_WORKERS. Jumlah test case
+        yang benar-benar jalan tetap dibatasi global_test_slots.
+        on_submission_result dipanggil begitu satu submission selesai.
+        
+        Di log dan submission store, ID submission batch adalah
+        "<batch_id>:<submission_id>" supaya tidak bentrok antar batch.
+        """
+        start_time = time.perf_counter()
+        batch_id = uuid.uuid4().hex[:12]
+        batch_dir = None
+        leased = None
+        try:
+            if batch.problem_id:
+                problem = leased = self.problem_store.acquire(batch.problem_id)
+                if problem is None:
+                    raise ValueError(f"Problem not found: {batch.problem_id}")
+            else:
+                batch_dir = tempfile.mkdtemp(prefix="seka_batch_")
+                problem = ProblemStore(batch_dir).put("batch", batch.test_cases)
+            
+            log.info("batch start", extra=fields(batch_id=batch_id, submissions=len(batch.submissions), test_cases=len(problem.test_cases)))
+            
+            verdict_counts = {}
+            workers = max(1, min(BATCH_WORKERS, len(batch.submissions)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seka-batch") as pool:
+                futures = {
+                    pool.submit(
+                        self._execute_batch_item,
+                        f"{batch_id}:{submission.submission_id or idx}",
+                        batch.to_judge_request(submission),
+                        problem
+                    ): submission.submission_id or str(idx)
+                    for idx, submission in enumerate(batch.submissions, start=1)
+                }
+                for future in as_completed(futures):
+                    result = future.result()
+                    verdict_counts[result.verdict.value] = verdict_counts.get(result.verdict.value, 0) + 1
+                    on_submission_result(futures[future], result)
+            
+            return {
+                "batch_id": batch_id,
+                "total_submissions": len(batch.submissions),
+                "total_cases": len(problem.test_cases),
+                "verdicts": verdict_counts,
+                "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 2)
+            }
+        finally:
+            if leased is not None:
+                self.problem_store.release(leased)
+            if batch_dir:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+    
+    def _execute_batch_item(self, submission_id: str, payload: JudgeRequest, problem: Problem) -> JudgeResult:
+        with log_context(submission_id=submission_id):
+            return self.execute(payload, None, problem)
+    
+    def _resolve_problem(self, payload: JudgeRequest) -> Optional[Problem]:
+        """
+        Problem dari problem store jika payload.problem_id diisi,
+        None jika test case dikirim inline
+        """
+        if not payload.problem_id:
+            return None
+        
+        problem = self.problem_store.get(payload.problem_id)
+        if problem is None:
+            raise ValueError(f"Problem not found: {payload.problem_id}")
+        return problem
+    
+    def _try_resolve_problem(self, payload: JudgeRequest) -> Optional[Problem]:
+        """Seperti _resolve_problem, tetapi error dibiarkan dilaporkan _execute"""
+        try:
+            return self._resolve_problem(payload)
+        except ValueError:
+            return None
+    
+    def _try_acquire_problem(self, payload: JudgeRequest) -> Optional[Problem]:
+        """
+        Seperti _try_resolve_problem, tetapi versi problem dipegang (lease)
+        sampai problem_store.release()
+        """
+        if not payload.problem_id:
+            return None
+        try:
+            return self.problem_store.acquire(payload.problem_id)
+        except ValueError:
+            return None
+    
+    def _cache_key(self, payload: JudgeRequest, problem: Optional[Problem]) -> Optional[str]:
+        """
+        Key verdict cache. Test set di-hash dari isi (hash input/expected dan
+        checker), jadi problem yang diganti otomatis mendapat key baru dan
+        test case inline yang sama dengan problem store berbagi key.
+        None jika cache mati atau problem_id tidak ditemukan.
+        """
+        if not self.verdict_cache.enabled or (payload.problem_id and problem is None):
+            return None
+        if problem:
+            tests = [f"{tc.input_sha256}:{tc.expected_sha256}" for tc in problem.test_cases]
+            checker = problem.checker.sha256 if problem.checker else ""
+        else:
+            tests = [
+                f"{hashlib.sha256(tc.input.encode('utf-8')).hexdigest()}:{hashlib.sha256(tc.expected_output.encode('utf-8')).hexdigest()}"
+                for tc in payload.test_cases
+            ]
+            checker = ""
+        return self.verdict_cache.make_key(
+            payload.language,
+            payload.code,
+            ",".join(tests),
+            checker,
+            str(payload.time_limit_ms),
+            str(payload.memory_limit_kb),
+            payload.compare_mode.value,
+            str(payload.stop_on_first_failure)
+        )
+    
+    @staticmethod
+    def _cache_entry(result: JudgeResult) -> JudgeResult:
+        """
+        Salinan hasil untuk cache: field per request direset dan data test
+        case dipotong seperti di to_dict() supaya entry tetap kecil
+        """
+        return replace(
+            result,
+            queue_wait_ms=0.0,
+            test_results=[
+                replace(
+                    test_result,
+                    input_data=_preview(test_result.input_data),
+                    expected_output=_preview(test_result.expected_output),
+                    actual_output=_preview(test_result.actual_output)
+                )
+                for test_result in result.test_results
+            ]
+        )
+    
+    @staticmethod
+    def _cacheable(result: JudgeResult) -> bool:
+        # Tanpa test_results berarti judging crash (lihat _execute)
+        if not result.test_results or result.verdict in UNSTABLE_VERDICTS:
+            return False
+        return not any(test_result.verdict in UNSTABLE_VERDICTS for test_result in result.test_results)
+    
+    def _run_test_cases(
+        self,
+        payload: JudgeRequest,
+        test_cases: List[TestCase],
+        build_dir: str,
+        global_time_limit: float,
+        global_memory_limit: float,
+        checker: Optional[PreparedChecker] = None,
+        on_test_result: Optional[Callable[[TestCaseResult], None]] = None
+    ) -> List[TestCaseResult]:
+        """
+        Jalankan semua test case terhadap artifact yang sudah di-compile.
+        Test case dijalankan paralel sampai PARALLEL_TESTS_PER_SUBMISSION,
+        hasil tetap dikembalikan sesuai urutan test case.
+        
+        Jika payload.stop_on_first_failure, test case yang belum jalan
+        setelah ada test case non-AC dilaporkan sebagai SKIPPED.
+        """
+        workers = min(PARALLEL_TESTS_PER_SUBMISSION, len(test_cases))
+        fail_fast = FailFastState(payload.stop_on_first_failure)
+        
+        if workers <= 1:
+            return [
+                self._run_single_test(payload, build_dir, idx, len(test_cases), test_case, global_time_limit, global_memory_limit, checker, fail_fast, on_test_result)
+                for idx, test_case in enumerate(test_cases, start=1)
+            ]
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seka-test") as pool:
+            futures = [
+                pool.submit(
+                    *run_in_context(self._run_single_test),
+                    payload,
+                    build_dir,
+                    idx,
+                    len(test_cases),
+                    test_case,
+                    global_time_limit,
+                    global_memory_limit,
+                    checker,
+                    fail_fast,
+                    on_test_result
+                )
+                for idx, test_case in enumerate(test_cases, start=1)
+            ]
+            return [future.result() for future in futures]
+    
+    def _run_single_test(
+        self,
+        payload: JudgeRequest,
+        build_dir: str,
+        idx: int,
+        total_cases: int,
+        test_case: TestCase,
+        time_limit: float,
+        memory_limit: float,
+        checker: Optional[PreparedChecker],
+        fail_fast: FailFastState,
+        on_test_result: Optional[Callable[[TestCaseResult], None]] = None
+    ) -> TestCaseResult:
+        """
+        Jalankan dan evaluasi satu test case
+        """
+        with log_context(test=idx):
+            test_result = self._evaluate_single_test(payload, build_dir, idx, total_cases, test_case, time_limit, memory_limit, checker, fail_fast)
+        if on_test_result:
+            on_test_result(test_result)
+        return test_result
+    
+    def _evaluate_single_test(
+        self,
+        payload: JudgeRequest,
+        build_dir: str,
+        idx: int,
+        total_cases: int,
+        test_case: TestCase,
+        time_limit: float,
+        memory_limit: float,
+        checker: Optional[PreparedChecker],
+        fail_fast: FailFastState
+    ) -> TestCaseResult:
+        if fail_fast.should_skip(idx):
+            return self._skipped_result(idx, test_case)
+        
+        # Execute test case
+        executor_payload = DockerExecutorRequest(
+            payload.language,
+            payload.code,
+            input_data="" if isinstance(test_case, StoredTestCase) else test_case.input,
+            timeout=int(time_limit / 1000) + 5,  # Convert to seconds + buffer
+            build_dir=build_dir,
+            input_path=test_case.input_path if isinstance(test_case, StoredTestCase) else None,
+            time_limit_ms=time_limit,
+            memory_limit_kb=memory_limit
+        )
+        
+        with global_test_slots:
+            # Cek lagi, bisa saja ada test case gagal selama menunggu slot
+            if fail_fast.should_skip(idx):
+                return self._skipped_result(idx, test_case)
+            run_start = time.perf_counter()
+            execute_result = self.docker_executor.execute(executor_payload)
+            run_seconds.labels(payload.language).observe(time.perf_counter() - run_start)
+        
+        # Evaluate result
+        try:
+            test_result = self.evaluate_result(
+                idx, 
+                test_case, 
+                execute_result,
+                time_limit,
+                memory_limit,
+                payload.compare_mode,
+                checker
+            )
+        finally:
+            self.docker_executor.cleanup_output(execute_result)
+        
+        log.debug("test case", extra=fields(
+            total=total_cases,
+            verdict=test_result.verdict.value,
+            time_ms=test_result.time_ms,
+            memory_kb=test_result.memory_kb,
+            error=log_payload(test_result.error_message)
+        ))
+        
+        test_cases_total.labels(payload.language, test_result.verdict.value).inc()
+        if checker:
+            compare_seconds.labels("checker").observe(test_result.checker_time_ms / 1000)
+        fail_fast.record(idx, test_result.verdict)
+        
+        return test_result
+    
+    def _skipped_result(self, case_number: int, test_case: TestCase) -> TestCaseResult:
+        return TestCaseResult(
+            case_number=case_number,
+            verdict=Verdict.SKIPPED,
+            time_ms=0,
+            memory_kb=0,
+            input_data=test_case.input,
+            expected_output=test_case.expected_output,
+            actual_output="",
+            error_message="Skipped: previous test case failed (stop_on_first_failure)"
+        )
+    
+    def _compilation_error_result(self, test_cases: List[TestCase], compilation_error: str) -> JudgeResult:
+        """
+        Semua test case langsung CE tanpa dijalankan
+        """
+        test_results = [
+            TestCaseResult(
+                case_number=idx,
+                verdict=Verdict.COMPILATION_ERROR,
+                time_ms=0,
+                memory_kb=0,
+                input_data=test_case.input,
+                expected_output=test_case.expected_output,
+                actual_output="",
+                error_message=f"Compilation Error: {compilation_error}"
+            )
+            for idx, test_case in enumerate(test_cases, start=1)
+        ]
+        final_result = self.calculate_final_result(test_results, len(test_cases))
+        final_result.error_message = f"Compilation Error: {compilation_error}"
+        return final_result
+    
     def evaluate_result(
         self, 
         case_number: int,
         test_case: TestCase, 
         result: ExecutionResult,
         time_limit_ms: float,
-        memory_limit_kb: float
+        memory_limit_kb: float,
+        compare_mode: CompareMode = CompareMode.TOKEN,
+        checker: Optional[PreparedChecker] = None
     ) -> TestCaseResult:
         """
         Evaluasi hasil eksekusi satu test case
@@ -175,6 +737,10 @@ class JudgeEngineV2:
         4. Memory Limit Exceeded (MLE)
         5. Wrong Answer (WA)
         6. Accepted (AC)
+        
+        Output Limit Exceeded (OLE) dicek setelah TLE dari exit code.
+        Jika problem punya checker, langkah 6 diputuskan oleh checker
+        (AC/WA/PE, atau SE jika checker gagal).
         """
         
         # 1. Check Compilation Error
@@ -216,6 +782,19 @@ class JudgeEngineV2:
                 error_message=f"Time Limit Exceeded (>{time_limit_ms}ms)"
             )
         
+        # 3b. Check workspace penuh (output/file yang ditulis terlalu besar)
+        if result.status == "WORKSPACE_LIMIT":
+            return TestCaseResult(
+                case_number=case_number,
+                verdict=Verdict.OUTPUT_LIMIT_EXCEEDED,
+                time_ms=result.time_ms_used or 0,
+                memory_kb=result.mem_kb_used or 0,
+                input_data=test_case.input,
+                expected_output=test_case.expected_output,
+                actual_output="",
+                error_message=f"Output Limit Exceeded: {result.error_output}"
+            )
+        
         # 4. Check Time Limit Exceeded (dari metrics)
         if result.time_ms_used and result.time_ms_used > time_limit_ms:
             return TestCaseResult(
@@ -229,6 +808,20 @@ class JudgeEngineV2:
                 error_message=f"Time Limit Exceeded ({result.time_ms_used}ms > {time_limit_ms}ms)"
             )
         
+        # 4b. Wall clock (program idle/sleep tidak memakai CPU time)
+        wall_time_limit_ms = time_limit_ms * WALL_TIME_LIMIT_FACTOR
+        if result.wall_time_ms and result.wall_time_ms > wall_time_limit_ms:
+            return TestCaseResult(
+                case_number=case_number,
+                verdict=Verdict.TIME_LIMIT_EXCEEDED,
+                time_ms=result.time_ms_used or 0,
+                memory_kb=result.mem_kb_used or 0,
+                input_data=test_case.input,
+                expected_output=test_case.expected_output,
+                actual_output=result.output,
+                error_message=f"Time Limit Exceeded (wall clock {result.wall_time_ms}ms > {wall_time_limit_ms}ms)"
+            )
+        
         # 5. Check Memory Limit Exceeded
         if result.mem_kb_used and result.mem_kb_used > memory_limit_kb:
             return TestCaseResult(
@@ -243,10 +836,23 @@ class JudgeEngineV2:
             )
         
         # 6. Compare Output (AC or WA)
+        # expected/actual di sini hanya untuk ditampilkan, perbandingan memakai
+        # file output lengkap (dan file expected untuk test case problem store)
         expected = test_case.expected_output.strip()
         actual = result.output.strip()
         
-        if self._compare_output(expected, actual):
+        if checker:
+            return self._evaluate_with_checker(case_number, test_case, result, checker, expected, actual)
+        
+        compare_start = time.perf_counter()
+        comparison = compare_output(
+            test_case.expected_path if isinstance(test_case, StoredTestCase) else test_case.expected_output.encode('utf-8'),
+            result.output_path or result.output.encode('utf-8'),
+            compare_mode
+        )
+        compare_seconds.labels(compare_mode.value).observe(time.perf_counter() - compare_start)
+        
+        if comparison.matched:
             return TestCaseResult(
                 case_number=case_number,
                 verdict=Verdict.ACCEPTED,
@@ -266,48 +872,59 @@ class JudgeEngineV2:
                 input_data=test_case.input,
                 expected_output=expected,
                 actual_output=actual,
-                error_message="Wrong Answer: Output does not match expected output"
+                error_message=f"Wrong Answer: {comparison.describe()}"
             )
     
-    def _compare_output(self, expected: str, actual: str) -> bool:
+    def _evaluate_with_checker(
+        self,
+        case_number: int,
+        test_case: StoredTestCase,
+        result: ExecutionResult,
+        checker: PreparedChecker,
+        expected: str,
+        actual: str
+    ) -> TestCaseResult:
         """
-        Compare output dengan beberapa mode:
-        1. Exact match (after strip)
-        2. Line by line comparison (ignore trailing spaces)
-        3. Token by token comparison (untuk numeric output)
+        Verdict dari checker problem. Checker memakai slot global yang sama
+        dengan solusi karena sama-sama memakai CPU.
         """
+        with global_test_slots:
+            check = self.checkers.run(checker, test_case.input_path, test_case.expected_path, result.output_path)
         
-        # Mode 1: Exact match
-        if expected == actual:
-            return True
-        
-        # Mode 2: Line by line (ignore trailing spaces per line)
-        expected_lines = [line.rstrip() for line in expected.split('\n')]
-        actual_lines = [line.rstrip() for line in actual.split('\n')]
-        
-        if expected_lines == actual_lines:
-            return True
-        
-        # Mode 3: Token comparison (split by whitespace)
-        expected_tokens = expected.split()
-        actual_tokens = actual.split()
+        error_message = None
+        if check.verdict == Verdict.SYSTEM_ERROR:
+            error_message = check.message
+        elif check.verdict != Verdict.ACCEPTED:
+            error_message = f"Checker: {check.message}" if check.message else f"Checker verdict: {check.verdict.value}"
         
-        if expected_tokens == actual_tokens:
-            return True
-        
-        return False
+        return TestCaseResult(
+            case_number=case_number,
+            verdict=check.verdict,
+            time_ms=result.time_ms_used or 0,
+            memory_kb=result.mem_kb_used or 0,
+            input_data=test_case.input,
+            expected_output=expected,
+            actual_output=actual,
+            error_message=error_message,
+            checker_time_ms=check.time_ms
+        )
     
     def calculate_final_result(self, test_results: List[TestCaseResult], total_cases: int) -> JudgeResult:
         """
         Calculate final verdict and score based on all test results
         
         Verdict Priority (highest to lowest):
+        0. SE (System Error, checker gagal)
         1. CE (Compilation Error)
         2. RE (Runtime Error)
         3. TLE (Time Limit Exceeded)
         4. MLE (Memory Limit Exceeded)
+        4b. OLE (Output Limit Exceeded)
         5. WA (Wrong Answer)
+        5b. PE (Presentation Error, dari checker)
         6. AC (Accepted)
+        
+        SKIPPED tidak dihitung passed dan tidak mempengaruhi verdict.
         """
         
         # Count verdicts
@@ -316,7 +933,9 @@ class JudgeEngineV2:
             verdict_counts[result.verdict] = verdict_counts.get(result.verdict, 0) + 1
         
         # Determine final verdict by priority
-        if Verdict.COMPILATION_ERROR in verdict_counts:
+        if Verdict.SYSTEM_ERROR in verdict_counts:
+            final_verdict = Verdict.SYSTEM_ERROR
+        elif Verdict.COMPILATION_ERROR in verdict_counts:
             final_verdict = Verdict.COMPILATION_ERROR
         elif Verdict.RUNTIME_ERROR in verdict_counts:
             final_verdict = Verdict.RUNTIME_ERROR
@@ -324,13 +943,18 @@ class JudgeEngineV2:
             final_verdict = Verdict.TIME_LIMIT_EXCEEDED
         elif Verdict.MEMORY_LIMIT_EXCEEDED in verdict_counts:
             final_verdict = Verdict.MEMORY_LIMIT_EXCEEDED
+        elif Verdict.OUTPUT_LIMIT_EXCEEDED in verdict_counts:
+            final_verdict = Verdict.OUTPUT_LIMIT_EXCEEDED
         elif Verdict.WRONG_ANSWER in verdict_counts:
             final_verdict = Verdict.WRONG_ANSWER
+        elif Verdict.PRESENTATION_ERROR in verdict_counts:
+            final_verdict = Verdict.PRESENTATION_ERROR
         else:
             final_verdict = Verdict.ACCEPTED
         
         # Calculate passed cases
         passed_cases = verdict_counts.get(Verdict.ACCEPTED, 0)
+        skipped_cases = verdict_counts.get(Verdict.SKIPPED, 0)
         
         # Calculate score (0-100)
         score = (passed_cases / total_cases * 100) if total_cases > 0 else 0
@@ -343,6 +967,7 @@ class JudgeEngineV2:
         max_time_ms = max(times) if times else 0
         avg_time_ms = (total_time_ms / len(times)) if times else 0
         max_memory_kb = max(memories) if memories else 0
+        checker_time_ms = sum(r.checker_time_ms for r in test_results)
         
         return JudgeResult(
             verdict=final_verdict,
@@ -353,14 +978,32 @@ class JudgeEngineV2:
             max_time_ms=max_time_ms,
             avg_time_ms=avg_time_ms,
             max_memory_kb=max_memory_kb,
+            checker_time_ms=checker_time_ms,
+            skipped_cases=skipped_cases,
             test_results=test_results
         )
     
 
-def judge_code_v2(payload: JudgeRequest):
+# Engine dipakai bersama semua request (stateless, aman untuk banyak thread)
+judge_engine = JudgeEngineV2()
+
+def judge_code_v2(
+    payload: JudgeRequest,
+    on_test_result: Optional[Callable[[TestCaseResult], None]] = None,
+    ticket: Optional[Ticket] = None
+):
     """
     Main entry point for judging
     """
-    judge_engine = JudgeEngineV2()
-    result = judge_engine.execute(payload)
+    result = judge_engine.execute(payload, on_test_result, ticket=ticket)
     return result
+
+def has_cached_verdict_v2(payload: JudgeRequest) -> bool:
+    """Hasil payload sudah ada di verdict cache (tidak perlu reservasi admission)"""
+    return judge_engine.has_cached_verdict(payload)
+
+def judge_batch_v2(batch: BatchJudgeRequest, on_submission_result: Callable[[str, JudgeResult], None]) -> dict:
+    """
+    Entry point batch judging, return ringkasan batch
+    """
+    return judge_engine.execute_batch(batch, on_submission_result)
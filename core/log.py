@@ -0,0 +1,147 @@
+"""
+Logging terstruktur untuk pipeline judging.
+
+Semua logger ada di bawah "seka" (get_logger). Thread judge hanya
+memasukkan record ke antrian (QueueHandler); format dan tulis ke stderr
+dilakukan satu thread QueueListener, jadi worker tidak saling menunggu di
+stdout. Jika antrian penuh record dibuang dan dihitung (dropped).
+
+Correlation ID (submission_id, test) disimpan di contextvars lewat
+log_context() dan otomatis ikut di setiap record, termasuk dari thread
+ThreadPoolExecutor selama task di-submit dengan context (run_in_context).
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+from .config import LOG_LEVEL, LOG_FORMAT, LOG_PAYLOADS, LOG_QUEUE_SIZE
+from .metrics import log_records_dropped
+import contextvars, json, logging, logging.handlers, queue, sys, threading
+
+ROOT_LOGGER = "seka"
+
+_context: contextvars.ContextVar = contextvars.ContextVar("seka_log_context", default={})
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+def fields(**kwargs) -> dict:
+    """
+    Field terstruktur untuk satu record: log.info("...", extra=fields(time_ms=12)).
+    Field bernilai None tidak ditulis (misal payload() yang dimatikan).
+    """
+    return {"fields": {key: value for key, value in kwargs.items() if value is not None}}
+
+def payload(value: Optional[str]) -> Optional[str]:
+    """Isi payload (source code, stderr, output) hanya di-log jika SEKA_LOG_PAYLOADS=1"""
+    if not LOG_PAYLOADS or value is None:
+        return None
+    return value
+
+@contextmanager
+def log_context(**values):
+    token = _context.set({**_context.get(), **values})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+def current_context() -> dict:
+    return _context.get()
+
+def run_in_context(fn, *args):
+    """
+    Bungkus task ThreadPoolExecutor supaya correlation ID thread pemanggil
+    ikut ke thread worker: pool.submit(*run_in_context(fn, a, b))
+    """
+    return (contextvars.copy_context().run, fn, *args)
+
+class _ContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.context = _context.get()
+        return True
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Format message (dan traceback) di thread pemanggil, formatter
+        # akhir dijalankan di thread listener
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **getattr(record, "context", {}),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created).isoformat(sep=" ", timespec="milliseconds")
+        extra = {**getattr(record, "context", {}), **getattr(record, "fields", {})}
+        line = f"{ts} {record.levelname:<7} {record.name} {record.getMessage()}"
+        if extra:
+            line += " " + " ".join(f"{key}={value}" for key, value in extra.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[_NonBlockingQueueHandler] = None
+_lock = threading.Lock()
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, queue_size: int = LOG_QUEUE_SIZE):
+    """Pasang handler antrian di logger "seka" dan start thread listener (idempotent)"""
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            return
+
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+
+        _handler = _NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+        _handler.addFilter(_ContextFilter())
+
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.setLevel(level)
+        logger.addHandler(_handler)
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(_handler.queue, output)
+        _listener.start()
+        log_records_dropped.set_function(dropped_records)
+
+def shutdown_logging():
+    """Stop listener setelah semua record di antrian ditulis"""
+    global _listener, _handler
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger(ROOT_LOGGER).removeHandler(_handler)
+        _listener, _handler = None, None
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler else 0
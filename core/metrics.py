@@ -0,0 +1,248 @@
+from typing import Callable, Dict, Optional, Sequence, Tuple
+import bisect, math, threading
+
+# Format text exposition Prometheus (dipakai endpoint /metrics)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket histogram durasi (detik): dari exec ~1 ms sampai compile Java beberapa detik
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric"):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    """
+    Satu metric dengan label. Child per kombinasi label dibuat sekali lalu
+    di-cache, sehingga hot path hanya lookup dict + operasi di bawah lock
+    milik child itu sendiri (tidak ada lock global).
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Registry = registry):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def labels(self, *values):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        raise NotImplementedError
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+    def set_function(self, function: Callable[[], float]):
+        """Nilai dihitung saat scrape (misal ukuran queue), bukan di hot path"""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            return float(self.function())
+        with self._lock:
+            return self.value
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def samples(self):
+        for key, child in self._items():
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def samples(self):
+        for key, child in self._items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.get())}"
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Bucket terakhir = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS, registry: Registry = registry):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def samples(self):
+        for key, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+# Metric pipeline judging
+compile_seconds = Histogram(
+    "seka_compile_duration_seconds",
+    "Waktu compile satu submission (termasuk cache hit)",
+    ["language", "cached"]
+)
+container_start_seconds = Histogram(
+    "seka_container_start_duration_seconds",
+    "Waktu create + start container runner (docker run atau container pool)",
+    ["image", "source"]
+)
+run_seconds = Histogram(
+    "seka_run_duration_seconds",
+    "Waktu eksekusi satu test case di executor (wall clock, termasuk overhead container)",
+    ["language"]
+)
+compare_seconds = Histogram(
+    "seka_compare_duration_seconds",
+    "Waktu membandingkan output satu test case (comparator atau checker)",
+    ["mode"]
+)
+submissions_total = Counter(
+    "seka_submissions",
+    "Submission yang selesai di-judge per bahasa dan verdict akhir",
+    ["language", "verdict"]
+)
+test_cases_total = Counter(
+    "seka_test_cases",
+    "Test case yang selesai di-judge per bahasa dan verdict",
+    ["language", "verdict"]
+)
+submissions_in_flight = Gauge(
+    "seka_submissions_in_flight",
+    "Submission yang sedang di-judge"
+).labels()
+containers = Gauge(
+    "seka_containers",
+    "Container runner di pool per bahasa dan state (idle / in_use)",
+    ["language", "state"]
+)
+queue_depth = Gauge(
+    "seka_queue_depth",
+    "Submission async yang menunggu worker"
+).labels()
+docker_errors_total = Counter(
+    "seka_docker_errors",
+    "Error dari Docker Engine API per operasi",
+    ["operation"]
+)
+admission_submissions = Gauge(
+    "seka_admission_submissions",
+    "Submission di admission control per lane dan state (running / waiting)",
+    ["lane", "state"]
+)
+admission_wait_seconds = Histogram(
+    "seka_admission_wait_seconds",
+    "Lama submission menunggu slot eksekusi per lane",
+    ["lane"]
+)
+admission_rejections_total = Counter(
+    "seka_admission_rejections",
+    "Request yang ditolak karena antrian admission penuh per lane",
+    ["lane"]
+)
+verdict_cache_requests_total = Counter(
+    "seka_verdict_cache_requests",
+    "Lookup verdict cache per hasil (hit / shared = menunggu judging identik / miss)",
+    ["result"]
+)
+submission_store_dropped_total = Counter(
+    "seka_submission_store_dropped",
+    "Hasil judging yang tidak tersimpan di submission store (queue_full / write_error)",
+    ["reason"]
+)
+log_records_dropped = Gauge(
+    "seka_log_records_dropped",
+    "Record log yang dibuang karena antrian logging penuh"
+).labels()
+
+def render() -> str:
+    return registry.render()
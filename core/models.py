@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from enum import Enum
 from typing import List, Optional
 
@@ -14,20 +14,94 @@ class Verdict(str, Enum):
   WRONG_ANSWER = "WA"
   TIME_LIMIT_EXCEEDED = "TLE"
   MEMORY_LIMIT_EXCEEDED = "MLE"
+  OUTPUT_LIMIT_EXCEEDED = "OLE"  # Program memenuhi workspace (output/file terlalu besar)
   RUNTIME_ERROR = "RTE"
   COMPILATION_ERROR = "CE"
   PRESENTATION_ERROR = "PE"
+  SYSTEM_ERROR = "SE"  # Kesalahan di sisi judge (misal checker crash), bukan salah peserta
+  SKIPPED = "SKIPPED"  # Tidak dijalankan karena stop_on_first_failure
   PENDING = "PENDING"
   JUDGING = "JUDGING"
 
+class CompareMode(str, Enum):
+  """Cara membandingkan output program dengan expected output"""
+  EXACT = "exact"  # Byte per byte (setelah strip)
+  LINE = "line"  # Per baris, trailing whitespace diabaikan
+  TOKEN = "token"  # Token dipisah whitespace
+
+class JudgeLane(str, Enum):
+  """Kelas penjadwalan submission di admission control"""
+  INTERACTIVE = "interactive"  # "Run" sample di editor: sedikit test case, limit pendek
+  BATCH = "batch"  # Judging penuh dan rejudge
+
 class TestCase(BaseModel):
   input: str
   expected_output: str
   
 class JudgeRequest(BaseModel):
   code: str
-  test_cases: List[TestCase]
+  test_cases: List[TestCase] = []
+  problem_id: Optional[str] = None  # Pakai test data dari problem store, bukan test_cases inline
   language: str = "c"
   time_limit_ms: Optional[float] = 1000  # Global time limit
   memory_limit_kb: Optional[float] = 256000  # Global memory limit
+  stop_on_first_failure: bool = False  # Berhenti setelah test case pertama yang tidak AC
+  compare_mode: CompareMode = CompareMode.TOKEN
+  lane: JudgeLane = JudgeLane.BATCH
+  user_id: Optional[str] = None  # Pemilik submission di riwayat (submission store)
+
+  @model_validator(mode="after")
+  def check_test_source(self):
+    _check_test_source(self.test_cases, self.problem_id)
+    return self
+
+class BatchSubmission(BaseModel):
+  submission_id: Optional[str] = None  # Default: nomor urut di batch (mulai 1)
+  code: str
+  language: str = "c"
+  user_id: Optional[str] = None
+
+class BatchJudgeRequest(BaseModel):
+  """Banyak submission dinilai dengan satu test set yang sama"""
+  submissions: List[BatchSubmission]
+  test_cases: List[TestCase] = []
+  problem_id: Optional[str] = None
+  time_limit_ms: Optional[float] = 1000
+  memory_limit_kb: Optional[float] = 256000
+  stop_on_first_failure: bool = False
+  compare_mode: CompareMode = CompareMode.TOKEN
+
+  @model_validator(mode="after")
+  def check_test_source(self):
+    _check_test_source(self.test_cases, self.problem_id)
+    return self
+
+  def to_judge_request(self, submission: BatchSubmission) -> JudgeRequest:
+    return JudgeRequest(
+      code=submission.code,
+      language=submission.language,
+      test_cases=self.test_cases,
+      problem_id=self.problem_id,
+      time_limit_ms=self.time_limit_ms,
+      memory_limit_kb=self.memory_limit_kb,
+      stop_on_first_failure=self.stop_on_first_failure,
+      compare_mode=self.compare_mode,
+      user_id=submission.user_id
+    )
+
+def _check_test_source(test_cases: List[TestCase], problem_id: Optional[str]):
+  if problem_id and test_cases:
+    raise ValueError("Use either test_cases or problem_id, not both")
+  if not problem_id and not test_cases:
+    raise ValueError("test_cases or problem_id is required")
+
+class CheckerSpec(BaseModel):
+  """Checker (special judge): dipanggil dengan argumen input, output peserta, expected output"""
+  language: str = "cpp"  # cpp atau python
+  code: str
+
+class ProblemRequest(BaseModel):
+  problem_id: str
+  test_cases: List[TestCase]
+  checker: Optional[CheckerSpec] = None
   
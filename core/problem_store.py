@@ -0,0 +1,345 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+from datetime import datetime
+from .config import PROBLEMS_DIR
+import fcntl, hashlib, json, os, re, shutil, threading, uuid
+
+PROBLEM_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "current"  # Nama versi aktif di directory problem
+VERSION_PREFIX = "v-"
+ACQUIRE_ATTEMPTS = 3  # Versi bisa diganti dan dihapus di antara baca CURRENT_FILE dan lock
+PREVIEW_BYTES = 1024  # Potongan input/expected yang dibaca untuk ditampilkan di hasil
+CHECKER_FILENAMES = {"cpp": "main.cpp", "python": "main.py"}  # Bahasa checker yang didukung
+
+@dataclass
+class StoredTestCase:
+    """Test case yang datanya ada di problem store (bukan inline di request)"""
+    case_number: int
+    input_path: str
+    expected_path: str
+    input_sha256: str
+    expected_sha256: str
+
+    @property
+    def input(self) -> str:
+        return self._preview(self.input_path)
+
+    @property
+    def expected_output(self) -> str:
+        return self._preview(self.expected_path)
+
+    @staticmethod
+    def _preview(path: str) -> str:
+        with open(path, "rb") as f:
+            return f.read(PREVIEW_BYTES).decode("utf-8", errors="replace")
+
+@dataclass
+class StoredChecker:
+    """Source code checker (special judge) milik satu problem"""
+    language: str
+    source_path: str
+    sha256: str
+
+    @property
+    def code(self) -> str:
+        with open(self.source_path) as f:
+            return f.read()
+
+@dataclass
+class Problem:
+    problem_id: str
+    test_cases: List[StoredTestCase] = field(default_factory=list)
+    created_at: str = ""
+    checker: Optional[StoredChecker] = None
+    version: str = ""
+    lease_fd: Optional[int] = field(default=None, repr=False, compare=False)  # Lihat ProblemStore.acquire
+
+    def to_dict(self):
+        return {
+            "problem_id": self.problem_id,
+            "total_cases": len(self.test_cases),
+            "created_at": self.created_at,
+            "checker": {"language": self.checker.language, "sha256": self.checker.sha256} if self.checker else None,
+            "test_cases": [
+                {
+                    "case_number": tc.case_number,
+                    "input_sha256": tc.input_sha256,
+                    "expected_sha256": tc.expected_sha256,
+                    "input_bytes": os.path.getsize(tc.input_path),
+                    "expected_bytes": os.path.getsize(tc.expected_path),
+                }
+                for tc in self.test_cases
+            ]
+        }
+
+class ProblemStore:
+    """
+    Registry problem di disk, setiap upload disimpan di versi sendiri:
+        <root>/<problem_id>/current                  (nama versi aktif)
+        <root>/<problem_id>/v-<hex>/manifest.json
+        <root>/<problem_id>/v-<hex>/tests/<n>.in
+        <root>/<problem_id>/v-<hex>/tests/<n>.out
+        <root>/<problem_id>/v-<hex>/checker/main.cpp|main.py  (opsional)
+    Manifest berisi hash SHA-256 input/expected output.
+
+    Judging memegang versi lewat acquire()/release() (flock shared pada
+    directory versi, berlaku juga antar proses), sehingga upload ulang atau
+    delete tidak mengubah test data judging yang sedang jalan. Versi yang
+    bukan versi aktif dihapus begitu tidak ada lagi yang memegangnya.
+    """
+
+    def __init__(self, root: str = PROBLEMS_DIR):
+        self.root = root
+        self._cache: Dict[str, Problem] = {}
+        self._lock = threading.Lock()
+
+    def put(self, problem_id: str, test_cases: List, checker=None) -> Problem:
+        """
+        Simpan (atau ganti) test data problem sebagai versi baru.
+        test_cases: objek dengan .input dan .expected_output
+        checker (opsional): objek dengan .language dan .code
+        """
+        self._validate_id(problem_id)
+        if checker and checker.language not in CHECKER_FILENAMES:
+            raise ValueError(f"Checker language not supported: {checker.language}")
+        problem_dir = self._problem_dir(problem_id)
+        os.makedirs(problem_dir, exist_ok=True)
+        self._current_version(problem_id)  # Pindahkan layout lama dulu supaya ikut di-sweep
+
+        version = f"{VERSION_PREFIX}{uuid.uuid4().hex}"
+        tmp_dir = os.path.join(problem_dir, f".tmp-{uuid.uuid4().hex}")
+        tests_dir = os.path.join(tmp_dir, "tests")
+        os.makedirs(tests_dir)
+
+        manifest = {"problem_id": problem_id, "created_at": datetime.now().isoformat(), "test_cases": []}
+        try:
+            for idx, test_case in enumerate(test_cases, start=1):
+                input_data = test_case.input.encode("utf-8")
+                expected_data = test_case.expected_output.encode("utf-8")
+                with open(os.path.join(tests_dir, f"{idx}.in"), "wb") as f:
+                    f.write(input_data)
+                with open(os.path.join(tests_dir, f"{idx}.out"), "wb") as f:
+                    f.write(expected_data)
+                manifest["test_cases"].append({
+                    "case_number": idx,
+                    "input_sha256": hashlib.sha256(input_data).hexdigest(),
+                    "expected_sha256": hashlib.sha256(expected_data).hexdigest(),
+                })
+
+            if checker:
+                checker_dir = os.path.join(tmp_dir, "checker")
+                os.makedirs(checker_dir)
+                checker_data = checker.code.encode("utf-8")
+                with open(os.path.join(checker_dir, CHECKER_FILENAMES[checker.language]), "wb") as f:
+                    f.write(checker_data)
+                manifest["checker"] = {
+                    "language": checker.language,
+                    "sha256": hashlib.sha256(checker_data).hexdigest(),
+                }
+
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f)
+
+            # Versi baru aktif begitu CURRENT_FILE diganti (atomic), versi lama dihapus jika tidak dipakai
+            with self._problem_lock(problem_id):
+                os.rename(tmp_dir, os.path.join(problem_dir, version))
+                self._set_current(problem_id, version)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self._sweep(problem_id)
+        return self.get(problem_id)
+
+    def get(self, problem_id: str) -> Optional[Problem]:
+        """Versi aktif problem (tanpa lease, untuk info saja), None jika tidak ada"""
+        self._validate_id(problem_id)
+        version = self._current_version(problem_id)
+        if version is None:
+            return None
+        return self._load(problem_id, version)
+
+    def acquire(self, problem_id: str) -> Optional[Problem]:
+        """
+        Versi aktif problem yang dipegang sampai release(): file test data
+        versi ini tidak dihapus walau problem di-upload ulang atau dihapus.
+        None jika problem tidak ada.
+        """
+        self._validate_id(problem_id)
+        for _ in range(ACQUIRE_ATTEMPTS):
+            version = self._current_version(problem_id)
+            if version is None:
+                return None
+            version_dir = os.path.join(self._problem_dir(problem_id), version)
+            try:
+                fd = os.open(version_dir, os.O_RDONLY | os.O_DIRECTORY)
+            except FileNotFoundError:
+                continue  # Sudah diganti dan dihapus, baca CURRENT_FILE lagi
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+                # Sweep bisa menghapus versi ini tepat sebelum lock didapat
+                if os.path.exists(os.path.join(version_dir, MANIFEST_FILE)):
+                    return replace(self._load(problem_id, version), lease_fd=fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            os.close(fd)
+        raise ValueError(f"Problem {problem_id} sedang diganti, coba lagi")
+
+    def release(self, problem: Problem):
+        """Lepas versi yang dipegang acquire(), hapus jika sudah bukan versi aktif"""
+        if problem.lease_fd is None:
+            return
+        os.close(problem.lease_fd)  # flock ikut dilepas
+        problem.lease_fd = None
+        if self._current_version(problem.problem_id) != problem.version:
+            self._sweep(problem.problem_id)
+
+    def delete(self, problem_id: str) -> bool:
+        """Hapus problem; versi yang masih dipegang judging dihapus setelah di-release"""
+        self._validate_id(problem_id)
+        if self._current_version(problem_id) is None:
+            return False
+        try:
+            os.unlink(os.path.join(self._problem_dir(problem_id), CURRENT_FILE))
+        except FileNotFoundError:
+            return False
+        with self._lock:
+            self._cache.pop(problem_id, None)
+        self._sweep(problem_id)
+        return True
+
+    def _load(self, problem_id: str, version: str) -> Problem:
+        with self._lock:
+            cached = self._cache.get(problem_id)
+            if cached is not None and cached.version == version:
+                return cached
+
+        version_dir = os.path.join(self._problem_dir(problem_id), version)
+        with open(os.path.join(version_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        tests_dir = os.path.join(version_dir, "tests")
+        checker = None
+        if manifest.get("checker"):
+            checker = StoredChecker(
+                language=manifest["checker"]["language"],
+                source_path=os.path.join(version_dir, "checker", CHECKER_FILENAMES[manifest["checker"]["language"]]),
+                sha256=manifest["checker"]["sha256"],
+            )
+        problem = Problem(
+            problem_id=problem_id,
+            created_at=manifest.get("created_at", ""),
+            checker=checker,
+            version=version,
+            test_cases=[
+                StoredTestCase(
+                    case_number=entry["case_number"],
+                    input_path=os.path.join(tests_dir, f"{entry['case_number']}.in"),
+                    expected_path=os.path.join(tests_dir, f"{entry['case_number']}.out"),
+                    input_sha256=entry["input_sha256"],
+                    expected_sha256=entry["expected_sha256"],
+                )
+                for entry in manifest["test_cases"]
+            ]
+        )
+        with self._lock:
+            self._cache[problem_id] = problem
+        return problem
+
+    def _current_version(self, problem_id: str) -> Optional[str]:
+        version = self._read_current(problem_id)
+        if version is None and os.path.exists(os.path.join(self._problem_dir(problem_id), MANIFEST_FILE)):
+            return self._migrate_unversioned(problem_id)
+        return version
+
+    def _read_current(self, problem_id: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self._problem_dir(problem_id), CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def _problem_lock(self, problem_id: str):
+        """
+        flock exclusive pada directory problem (antar proses): ganti versi,
+        pindah layout lama, dan sweep tidak berjalan bersamaan
+        """
+        fd = os.open(self._problem_dir(problem_id), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def _set_current(self, problem_id: str, version: str):
+        problem_dir = self._problem_dir(problem_id)
+        tmp_path = os.path.join(problem_dir, f".{CURRENT_FILE}-{uuid.uuid4().hex}")
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(problem_dir, CURRENT_FILE))
+
+    def _migrate_unversioned(self, problem_id: str) -> Optional[str]:
+        """Problem dari layout lama (manifest langsung di directory problem) dipindah ke satu versi"""
+        problem_dir = self._problem_dir(problem_id)
+        with self._problem_lock(problem_id):
+            current = self._read_current(problem_id)
+            if current is not None:
+                return current  # Sudah dipindah proses lain
+            version = f"{VERSION_PREFIX}{uuid.uuid4().hex}"
+            version_dir = os.path.join(problem_dir, version)
+            os.makedirs(version_dir)
+            for name in ("tests", "checker", MANIFEST_FILE):
+                if os.path.exists(os.path.join(problem_dir, name)):
+                    os.rename(os.path.join(problem_dir, name), os.path.join(version_dir, name))
+            self._set_current(problem_id, version)
+            return version
+
+    def _sweep(self, problem_id: str):
+        """
+        Hapus versi yang bukan versi aktif dan tidak sedang dipegang (flock
+        exclusive non-blocking gagal selama masih ada lease). Directory
+        problem ikut dihapus jika problem sudah di-delete dan kosong.
+        """
+        problem_dir = self._problem_dir(problem_id)
+        try:
+            with self._problem_lock(problem_id):
+                self._sweep_locked(problem_dir, self._read_current(problem_id))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _sweep_locked(problem_dir: str, current: Optional[str]):
+        for name in os.listdir(problem_dir):
+            if not name.startswith(VERSION_PREFIX) or name == current:
+                continue
+            try:
+                fd = os.open(os.path.join(problem_dir, name), os.O_RDONLY | os.O_DIRECTORY)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                shutil.rmtree(os.path.join(problem_dir, name), ignore_errors=True)
+            except BlockingIOError:
+                pass  # Masih dipakai judging, dihapus saat release
+            finally:
+                os.close(fd)
+        if current is None:
+            try:
+                os.rmdir(problem_dir)
+            except OSError:
+                pass
+
+    def _problem_dir(self, problem_id: str) -> str:
+        return os.path.join(self.root, problem_id)
+
+    @staticmethod
+    def _validate_id(problem_id: str):
+        if not PROBLEM_ID_PATTERN.match(problem_id or ""):
+            raise ValueError(f"Invalid problem_id: {problem_id!r}")
+
+
+problem_store = ProblemStore()
@@ -0,0 +1,386 @@
+"""
+Sandbox native: menjalankan program hasil compile langsung di host dengan
+Linux namespace (user, pid, mount, net, ipc, uts), seccomp, dan setrlimit,
+dengan root filesystem read-only dari runner image.
+
+File ini dijalankan sebagai proses terpisah (spawner) oleh SandboxExecutor:
+    python3 core/sandbox.py <socket path>
+Spawner single-threaded sehingga aman untuk fork; setiap request (satu
+baris JSON lewat unix socket) di-fork menjadi proses monitor yang membuat
+namespace, menjalankan program, dan membalas satu baris JSON hasilnya.
+Hanya memakai stdlib supaya startup spawner murah.
+
+Susunan proses per run:
+    monitor (uid diturunkan)           -> unshare user/pid/net/ipc/uts, timeout wall clock
+      init   (PID 1 di namespace baru)  -> unshare mount, mount, pivot_root, reap
+        program (rlimit + seccomp)      -> execve
+"""
+import ctypes, json, os, platform, resource, select, signal, socket, struct, sys, time
+
+CLONE_NEWNS = 0x00020000
+CLONE_NEWUTS = 0x04000000
+CLONE_NEWIPC = 0x08000000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWPID = 0x20000000
+CLONE_NEWNET = 0x40000000
+CLONE_NEWCGROUP = 0x02000000
+NAMESPACE_FLAGS = CLONE_NEWUSER | CLONE_NEWNS | CLONE_NEWPID | CLONE_NEWNET | CLONE_NEWIPC | CLONE_NEWUTS
+
+MS_RDONLY = 1
+MS_NOSUID = 2
+MS_NODEV = 4
+MS_NOEXEC = 8
+MS_REMOUNT = 32
+MS_NOATIME = 1024
+MS_NODIRATIME = 2048
+MS_BIND = 4096
+MS_REC = 16384
+MS_PRIVATE = 1 << 18
+MS_RELATIME = 1 << 21
+MNT_DETACH = 2
+
+DEVICES = ("null", "zero", "random", "urandom")  # Device host yang di-bind ke /dev sandbox
+
+# Flag mount yang "terkunci" di user namespace: remount harus mempertahankannya
+_LOCKED_MOUNT_FLAGS = {
+    os.ST_NOSUID: MS_NOSUID,
+    os.ST_NODEV: MS_NODEV,
+    os.ST_NOEXEC: MS_NOEXEC,
+    os.ST_NOATIME: MS_NOATIME,
+    os.ST_NODIRATIME: MS_NODIRATIME,
+    os.ST_RELATIME: MS_RELATIME,
+}
+
+PR_SET_DUMPABLE = 4
+PR_SET_NO_NEW_PRIVS = 38
+PR_SET_SECCOMP = 22
+SECCOMP_MODE_FILTER = 2
+SECCOMP_RET_KILL_PROCESS = 0x80000000
+SECCOMP_RET_ERRNO = 0x00050000
+SECCOMP_RET_ALLOW = 0x7FFF0000
+
+# Syscall yang ditolak (EPERM): mount/namespace, module/kexec, tracing, keyring, dll.
+# clone3 dijawab ENOSYS supaya libc fallback ke clone yang flag-nya bisa dicek.
+_ARCHES = {
+    "x86_64": {
+        "audit_arch": 0xC000003E,
+        "clone": 56,
+        "clone3": 435,
+        "x32_bit": 0x40000000,
+        "denied": [
+            101, 165, 166, 155, 161, 169, 246, 320, 175, 313, 176, 321, 298, 250, 248, 249,
+            272, 308, 167, 168, 304, 323, 310, 311, 163, 164, 227, 170, 171, 172, 173, 179,
+            135, 212, 428, 429, 430, 431, 432, 433,
+        ],
+        "pivot_root": 155,
+    },
+    "aarch64": {
+        "audit_arch": 0xC00000B7,
+        "clone": 220,
+        "clone3": 435,
+        "x32_bit": None,
+        "denied": [
+            117, 40, 39, 41, 51, 142, 104, 294, 105, 273, 106, 280, 241, 219, 217, 218,
+            97, 268, 224, 225, 265, 282, 270, 271, 89, 170, 112, 161, 162, 60, 92, 18,
+            428, 429, 430, 431, 432, 433,
+        ],
+        "pivot_root": 41,
+    },
+}
+
+EPERM = 1
+ENOSYS = 38
+
+# Program tidak di-exec langsung dari proses Python: ru_maxrss ikut membawa
+# RSS interpreter (tercatat saat execve). /bin/sh menjalankan program di
+# background lalu keluar; program (fork dari sh yang kecil) di-reparent ke
+# init dan di-wait langsung, sehingga rusage hanya milik program.
+# stdin disimpan di fd 4 dulu karena sh mengarahkan stdin job background ke /dev/null.
+LAUNCH_SCRIPT = 'exec 4<&0; "$@" <&4 3>&- 4<&- & echo $! >&3'
+
+_libc = ctypes.CDLL(None, use_errno=True)
+
+class SandboxError(Exception):
+    """Gagal menyiapkan sandbox (bukan error program user)"""
+
+def _check(ret: int, what: str):
+    if ret != 0:
+        errno = ctypes.get_errno()
+        raise SandboxError(f"{what}: {os.strerror(errno)}")
+
+def _mount(source, target, fstype, flags, data=None):
+    _check(
+        _libc.mount(
+            source.encode() if source else None,
+            target.encode(),
+            fstype.encode() if fstype else None,
+            ctypes.c_ulong(flags),
+            data.encode() if data else None
+        ),
+        f"mount {target}"
+    )
+
+def _locked_flags(path: str) -> int:
+    f_flag = os.statvfs(path).f_flag
+    return sum(ms for st, ms in _LOCKED_MOUNT_FLAGS.items() if f_flag & st)
+
+def _bind(source: str, target: str, read_only: bool, recursive: bool = False):
+    _mount(source, target, None, MS_BIND | (MS_REC if recursive else 0))
+    if read_only:
+        flags = MS_REMOUNT | MS_BIND | MS_RDONLY | MS_NOSUID | MS_NODEV | _locked_flags(target)
+        _mount(None, target, None, flags)
+
+def arch() -> dict:
+    machine = platform.machine()
+    if machine not in _ARCHES:
+        raise SandboxError(f"Arsitektur tidak didukung: {machine}")
+    return _ARCHES[machine]
+
+def seccomp_program(arch_info: dict) -> bytes:
+    """Program BPF seccomp (denylist) untuk arsitektur arch_info"""
+    def stmt(code, k):
+        return struct.pack("HBBI", code, 0, 0, k)
+
+    def jump(code, k, jt, jf):
+        return struct.pack("HBBI", code, jt, jf, k)
+
+    LD_W_ABS = 0x20
+    JEQ_K = 0x15
+    JGE_K = 0x35
+    JSET_K = 0x45
+    RET_K = 0x06
+
+    program = [
+        stmt(LD_W_ABS, 4),  # seccomp_data.arch
+        jump(JEQ_K, arch_info["audit_arch"], 1, 0),
+        stmt(RET_K, SECCOMP_RET_KILL_PROCESS),
+        stmt(LD_W_ABS, 0),  # seccomp_data.nr
+    ]
+    if arch_info["x32_bit"]:
+        program += [jump(JGE_K, arch_info["x32_bit"], 0, 1), stmt(RET_K, SECCOMP_RET_KILL_PROCESS)]
+    for nr in arch_info["denied"]:
+        program += [jump(JEQ_K, nr, 0, 1), stmt(RET_K, SECCOMP_RET_ERRNO | EPERM)]
+    program += [jump(JEQ_K, arch_info["clone3"], 0, 1), stmt(RET_K, SECCOMP_RET_ERRNO | ENOSYS)]
+
+    # clone(flags, ...) dengan flag namespace baru ditolak
+    program += [
+        jump(JEQ_K, arch_info["clone"], 0, 3),
+        stmt(LD_W_ABS, 16),  # seccomp_data.args[0] (32 bit bawah)
+        jump(JSET_K, NAMESPACE_FLAGS | CLONE_NEWCGROUP, 0, 1),
+        stmt(RET_K, SECCOMP_RET_ERRNO | EPERM),
+        stmt(RET_K, SECCOMP_RET_ALLOW),
+    ]
+    return b"".join(program)
+
+def _install_seccomp():
+    filters = seccomp_program(arch())
+
+    class SockFprog(ctypes.Structure):
+        _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_char_p)]
+
+    prog = SockFprog(len(filters) // 8, filters)
+    _check(_libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "prctl(NO_NEW_PRIVS)")
+    _check(_libc.prctl(PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.byref(prog), 0, 0), "prctl(SECCOMP)")
+
+def _write(path: str, data: str):
+    with open(path, "w") as f:
+        f.write(data)
+
+def _enter_namespaces(spec: dict):
+    """
+    Turunkan uid (jika root) lalu unshare, uid di dalam namespace adalah 0.
+    Mount namespace dibuat terpisah oleh init supaya pivot_root tidak ikut
+    mengubah root proses monitor.
+    """
+    if os.getuid() == 0:
+        os.setgroups([])
+        os.setgid(spec["uid"])
+        os.setuid(spec["uid"])
+        # Ganti uid me-reset dumpable, tanpa ini /proc/self/*_map milik root
+        _check(_libc.prctl(PR_SET_DUMPABLE, 1, 0, 0, 0), "prctl(DUMPABLE)")
+    uid, gid = os.getuid(), os.getgid()
+    _check(_libc.unshare(NAMESPACE_FLAGS & ~CLONE_NEWNS), "unshare")
+    _write("/proc/self/setgroups", "deny")
+    _write("/proc/self/uid_map", f"0 {uid} 1")
+    _write("/proc/self/gid_map", f"0 {gid} 1")
+
+def _setup_root(spec: dict):
+    """
+    Root filesystem: rootfs image (read-only) + /build (ro) + /code (rw) +
+    /tmp (tmpfs) + DEVICES. Mount point sudah dibuat saat rootfs disiapkan.
+    """
+    root = spec["root"]
+    _check(_libc.unshare(CLONE_NEWNS), "unshare(mount)")
+    _mount(None, "/", None, MS_REC | MS_PRIVATE)
+    _bind(root, root, read_only=False, recursive=True)
+    _bind(spec["build_dir"], os.path.join(root, "build"), read_only=True)
+    _bind(spec["work_dir"], os.path.join(root, "code"), read_only=False)
+    for device in DEVICES:
+        _bind(f"/dev/{device}", os.path.join(root, "dev", device), read_only=False)
+    if spec.get("input_path"):
+        _bind(spec["input_path"], os.path.join(root, "code", "input.txt"), read_only=True)
+    _mount("tmpfs", os.path.join(root, "tmp"), "tmpfs", MS_NOSUID | MS_NODEV, f"size={spec['tmpfs_mb']}m,mode=1777")
+    try:
+        _mount("proc", os.path.join(root, "proc"), "proc", MS_NOSUID | MS_NODEV | MS_NOEXEC)
+    except SandboxError:
+        pass  # /proc tidak wajib (misal host membatasi mount proc di user namespace)
+    _mount(None, root, None, MS_REMOUNT | MS_BIND | MS_RDONLY | MS_NOSUID | MS_NODEV | _locked_flags(root))
+
+    os.chdir(root)
+    _check(_libc.syscall(arch()["pivot_root"], b".", b"."), "pivot_root")
+    _check(_libc.umount2(b".", MNT_DETACH), "umount old root")
+    os.chdir("/code")
+
+def _exec_program(spec: dict, pid_fd: int):
+    """Proses launcher program user (pid program ditulis ke pid_fd), tidak pernah return"""
+    try:
+        for fd, name, flags in (
+            (0, "/code/input.txt", os.O_RDONLY),
+            (1, "/code/output.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+            (2, "/code/error.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+        ):
+            target = os.open(name, flags, 0o666)
+            os.dup2(target, fd)
+            os.close(target)
+        os.dup2(pid_fd, 3)
+        os.close(pid_fd)
+
+        limits = spec["limits"]
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu_s"], limits["cpu_s"]))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limits["fsize"], limits["fsize"]))
+        resource.setrlimit(resource.RLIMIT_NPROC, (limits["nproc"], limits["nproc"]))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if limits.get("as"):
+            resource.setrlimit(resource.RLIMIT_AS, (limits["as"], limits["as"]))
+        if limits.get("stack"):
+            resource.setrlimit(resource.RLIMIT_STACK, (limits["stack"], limits["stack"]))
+
+        for sig in (signal.SIGPIPE, signal.SIGXFSZ):
+            signal.signal(sig, signal.SIG_DFL)
+        _install_seccomp()
+        os.execve("/bin/sh", ["sh", "-c", LAUNCH_SCRIPT, "sh", *spec["argv"]], spec["env"])
+    except BaseException as e:
+        os.write(2, f"sandbox: exec {spec['argv'][0]} gagal: {e}\n".encode())
+    os._exit(127)
+
+def _sandbox_init(spec: dict, result_fd: int):
+    """PID 1 di namespace baru, tidak pernah return"""
+    result = {}
+    try:
+        _setup_root(spec)
+        pid_r, pid_w = os.pipe()
+        launcher = os.fork()
+        if launcher == 0:
+            os.close(result_fd)
+            os.close(pid_r)
+            _exec_program(spec, pid_w)
+        os.close(pid_w)
+        with os.fdopen(pid_r) as f:
+            program_pid = f.read().strip()
+        os.waitpid(launcher, 0)
+        if not program_pid:
+            raise SandboxError("launcher gagal menjalankan program")
+
+        # Sebagai PID 1, init juga me-reap proses lain yang di-reparent
+        while True:
+            waited, status, rusage = os.wait4(-1, 0)
+            if waited == int(program_pid):
+                break
+        result = {
+            "returncode": 128 + os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status),
+            "cpu_us": int((rusage.ru_utime + rusage.ru_stime) * 1_000_000),
+            "mem_kb": rusage.ru_maxrss,
+        }
+    except BaseException as e:
+        result = {"error": str(e)}
+    os.write(result_fd, json.dumps(result).encode())
+    os._exit(0)
+
+def _wait(pid: int, timeout_s: float) -> bool:
+    """Tunggu proses init, kill (beserta seluruh namespace) jika melewati timeout. True jika timeout"""
+    deadline = time.monotonic() + timeout_s
+    pidfd = os.pidfd_open(pid)
+    try:
+        while True:
+            waited, _ = os.waitpid(pid, os.WNOHANG)
+            if waited == pid:
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                return True
+            select.select([pidfd], [], [], remaining)
+    finally:
+        os.close(pidfd)
+
+def run_sandboxed(spec: dict) -> dict:
+    """
+    Jalankan satu program di sandbox (dipanggil di proses monitor).
+    Return: returncode (124 jika timeout), cpu_us, mem_kb, wall_ms,
+    atau error jika sandbox gagal disiapkan.
+    """
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    result_r, result_w = os.pipe()
+    start = time.monotonic()
+    try:
+        _enter_namespaces(spec)
+    except (OSError, SandboxError) as e:
+        return {"error": f"namespace: {e}"}
+
+    pid = os.fork()
+    if pid == 0:
+        os.close(result_r)
+        _sandbox_init(spec, result_w)
+    os.close(result_w)
+
+    timed_out = _wait(pid, spec["timeout_s"])
+    wall_ms = (time.monotonic() - start) * 1000
+    with os.fdopen(result_r, "rb") as f:
+        data = f.read()
+    result = json.loads(data) if data else {}
+    if timed_out:
+        result = {"returncode": 124, "cpu_us": result.get("cpu_us", 0), "mem_kb": result.get("mem_kb", 0)}
+    elif not result:
+        result = {"error": "sandbox init berhenti tanpa hasil"}
+    result["wall_ms"] = round(wall_ms, 2)
+    return result
+
+def serve(socket_path: str):
+    """
+    Loop spawner: satu koneksi = satu run. Spawner berhenti jika stdin
+    ditutup (proses judger yang menjalankannya sudah mati).
+    """
+    # Socket di-bind di path sementara lalu di-rename setelah listen, sehingga
+    # path socket muncul tepat saat spawner sudah siap menerima koneksi
+    bind_path = f"{socket_path}.{os.getpid()}"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(bind_path)
+    os.chmod(bind_path, 0o600)
+    server.listen(128)
+    os.rename(bind_path, socket_path)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # Monitor di-reap otomatis
+
+    while True:
+        readable, _, _ = select.select([server, sys.stdin], [], [])
+        if sys.stdin in readable and not os.read(sys.stdin.fileno(), 1):
+            break
+        if server not in readable:
+            continue
+        conn, _ = server.accept()
+        if os.fork() == 0:
+            server.close()
+            try:
+                with conn, conn.makefile("rwb") as stream:
+                    spec = json.loads(stream.readline())
+                    stream.write(json.dumps(run_sandboxed(spec)).encode() + b"\n")
+                    stream.flush()
+            finally:
+                os._exit(0)
+        conn.close()
+
+    server.close()
+    os.unlink(socket_path)
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
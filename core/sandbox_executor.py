@@ -0,0 +1,373 @@
+from typing import Dict, Optional, Tuple
+from .config import EXECUTOR_BACKENDS, SANDBOX_ROOTFS_DIR, SANDBOX_UID, SANDBOX_UID_COUNT, SANDBOX_NPROC, WORKSPACE_LIMIT_BYTES, CONTAINER_TMPFS_MB
+from .docker_executor_v2 import DockerExecutorV2, DockerExecutorRequest, ExecutionResult, OUTPUT_PREVIEW_BYTES
+from .docker_client import ContainerRunResult, DOCKER_ERRORS
+from .sandbox import DEVICES
+from .workspace import make_workspace
+from .log import get_logger, fields
+import fcntl, io, json, math, os, shutil, socket, subprocess, sys, tarfile, tempfile, threading, time, uuid
+
+log = get_logger("sandbox")
+
+SANDBOX_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox.py")
+SANDBOX_MOUNT_POINTS = ("build", "code", "tmp", "proc", "dev")  # Dibuat di rootfs saat export
+SERVER_START_TIMEOUT_S = 5
+SERVER_ATTEMPTS = 3  # Percobaan start/connect spawner sebelum menyerah
+SERVER_BACKOFF_S = 0.1  # Jeda sebelum percobaan berikutnya, dikali 2 setiap kali gagal
+CPU_LIMIT_SIGNALS = (128 + 9, 128 + 24)  # SIGKILL (hard limit) / SIGXCPU (soft limit)
+
+# Sama dengan JAVA_RUN_FLAGS di run_java_code.sh
+JAVA_RUN_FLAGS = ["-XX:+UseSerialGC", "-XX:-UsePerfData", "-Xshare:auto", "-Xlog:disable"]
+
+class SandboxUnavailable(Exception):
+    """Sandbox tidak bisa dipakai di host ini (image tidak ada, spawner tidak bisa start, dll.)"""
+
+class SandboxRunError(Exception):
+    """Satu run gagal di sandbox (launcher error, socket error), hanya run itu yang fallback ke Docker"""
+
+class _UidLeases:
+    """
+    uid host per run sandbox, supaya RLIMIT_NPROC (dihitung per uid) tidak
+    dibagi dengan run lain. Di dalam proses dijaga dengan set uid yang
+    dipakai, antar proses judger lewat flock pada satu lock file per uid.
+    """
+
+    def __init__(self, first: int, count: int, lock_dir: str):
+        self.uids = range(first, first + count)
+        self.lock_dir = lock_dir
+        self._busy = set()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[int, int]:
+        """(uid, fd lock file), fd dipakai lagi saat release"""
+        with self._lock:
+            try:
+                os.makedirs(self.lock_dir, mode=0o700, exist_ok=True)
+                for uid in self.uids:
+                    if uid in self._busy:
+                        continue
+                    fd = os.open(os.path.join(self.lock_dir, str(uid)), os.O_RDWR | os.O_CREAT, 0o600)
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        os.close(fd)
+                        continue
+                    self._busy.add(uid)
+                    return uid, fd
+            except OSError as e:
+                raise SandboxRunError(f"lock uid sandbox: {e}")
+        raise SandboxRunError("semua uid sandbox sedang dipakai")
+
+    def release(self, uid: int, fd: int):
+        with self._lock:
+            os.close(fd)  # flock ikut dilepas
+            self._busy.discard(uid)
+
+class _ChunkStream(io.RawIOBase):
+    """File-like read-only dari iterator chunk bytes (stream export Docker)"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+class SandboxExecutor(DockerExecutorV2):
+    """
+    Executor dengan backend per bahasa (EXECUTOR_BACKENDS). Bahasa dengan
+    backend "sandbox" menjalankan artifact hasil compile di sandbox native
+    (core/sandbox.py): fork/exec dari proses spawner, bukan container baru.
+    Compile, bahasa lain, dan mode lama (tanpa build_dir) tetap lewat
+    DockerExecutorV2.
+
+    Root filesystem sandbox adalah hasil export runner image bahasa itu,
+    sehingga interpreter/library sama persis dengan di container. Jika
+    sandbox tidak bisa disiapkan di host ini, executor fallback ke Docker.
+    """
+
+    def __init__(self, backends: Dict[str, str] = EXECUTOR_BACKENDS, rootfs_dir: str = SANDBOX_ROOTFS_DIR, **kwargs):
+        super().__init__(**kwargs)
+        self.sandbox_languages = {language for language, backend in backends.items() if backend == "sandbox"}
+        self.rootfs_dir = rootfs_dir
+
+        self._rootfs: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self._rootfs_lock = threading.Lock()
+        self._server: Optional[subprocess.Popen] = None
+        self._server_lock = threading.Lock()
+        self._socket_path = os.path.join(tempfile.gettempdir(), f"seka_sandbox_{os.getpid()}.sock")
+        self._disabled_reason: Optional[str] = None
+        self._uids = _UidLeases(SANDBOX_UID, SANDBOX_UID_COUNT, os.path.join(rootfs_dir, "uids"))
+
+    def execute(self, payload: DockerExecutorRequest) -> ExecutionResult:
+        """
+        Hanya SandboxUnavailable (masalah host yang permanen) yang mematikan
+        sandbox untuk seluruh proses; SandboxRunError hanya membuat run itu
+        fallback ke Docker
+        """
+        if payload.language not in self.sandbox_languages or not payload.build_dir or self._disabled_reason:
+            return super().execute(payload)
+        try:
+            return self._execute_sandboxed(payload)
+        except SandboxUnavailable as e:
+            log.warning("sandbox tidak tersedia, fallback ke Docker", extra=fields(error=str(e)))
+            self._disabled_reason = str(e)
+            return super().execute(payload)
+        except SandboxRunError as e:
+            log.warning("run sandbox gagal, fallback ke Docker", extra=fields(error=str(e)))
+            return super().execute(payload)
+
+    def _execute_sandboxed(self, payload: DockerExecutorRequest) -> ExecutionResult:
+        root, env = self._prepare_rootfs(payload.language)
+        # Program jalan sebagai uid lain (SANDBOX_UID), build dir harus bisa dibaca
+        os.chmod(payload.build_dir, 0o755)
+
+        # Tanpa root spawner tidak bisa ganti uid, program jalan sebagai uid judger
+        uid, uid_lock = self._uids.acquire() if os.getuid() == 0 else (SANDBOX_UID, None)
+        temp_dir = make_workspace("seka_run_")
+        try:
+            os.chmod(temp_dir, 0o777)
+            with open(os.path.join(temp_dir, 'input.txt'), 'w') as f:
+                if not payload.input_path:
+                    f.write(payload.input_data)
+            for name, source_path in (payload.files or {}).items():
+                shutil.copyfile(source_path, os.path.join(temp_dir, name))
+
+            limits = self._limits(payload)
+            response = self._request({
+                "root": root,
+                "build_dir": payload.build_dir,
+                "work_dir": temp_dir,
+                "input_path": payload.input_path,
+                "tmpfs_mb": CONTAINER_TMPFS_MB,
+                "uid": uid,
+                "timeout_s": payload.timeout,
+                "argv": self._command(payload),
+                "env": env,
+                "limits": limits,
+            }, timeout=payload.timeout + 10)
+            if "error" in response:
+                raise SandboxRunError(response["error"])
+
+            returncode = response["returncode"]
+            if returncode in CPU_LIMIT_SIGNALS and response["cpu_us"] >= limits["cpu_s"] * 1_000_000:
+                returncode = 124  # Di-kill RLIMIT_CPU, sama dengan timeout
+
+            # Format metrics sama dengan runner script, supaya parsing tetap satu jalur
+            with open(os.path.join(temp_dir, 'metrics.txt'), 'w') as f:
+                f.write(f"MEM:{response['mem_kb']}\n")
+                f.write(f"TIME:{response['wall_ms']}\n")
+                f.write(f"CG_CPU_USEC:{response['cpu_us']}\n")
+
+            stderr = ""
+            error_file = os.path.join(temp_dir, 'error.txt')
+            if returncode != 0 and os.path.exists(error_file):
+                with open(error_file, 'rb') as f:
+                    stderr = f.read(OUTPUT_PREVIEW_BYTES).decode('utf-8', errors='replace')
+
+            return self._parse_result(ContainerRunResult(returncode, stderr), temp_dir, mode=payload.mode)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if uid_lock is not None:
+                self._uids.release(uid, uid_lock)
+
+    def _limits(self, payload: DockerExecutorRequest) -> dict:
+        """
+        rlimit program. CPU = time limit + 1 detik (verdict TLE tetap dari CPU
+        time terukur); AS longgar (2x memory limit) supaya MLE tetap terukur,
+        tidak dipakai untuk Java karena JVM me-reserve virtual memory besar.
+        """
+        limits = {
+            "cpu_s": math.ceil(payload.time_limit_ms / 1000) + 1 if payload.time_limit_ms else payload.timeout,
+            "fsize": WORKSPACE_LIMIT_BYTES,
+            "nproc": SANDBOX_NPROC,
+        }
+        if payload.memory_limit_kb:
+            memory_bytes = int(payload.memory_limit_kb * 1024)
+            limits["stack"] = memory_bytes
+            if payload.language != "java":
+                limits["as"] = max(2 * memory_bytes, 512 * 1024 * 1024)
+        return limits
+
+    def _command(self, payload: DockerExecutorRequest) -> list:
+        """Command di dalam sandbox, sama dengan yang dijalankan runner script"""
+        args = []
+        if payload.mode == "check":
+            args = ["/code/input.txt", "/code/contestant_output.txt", "/code/expected_output.txt"]
+
+        if payload.language == "python":
+            return ["python3", "/build/main.py", *args]
+        if payload.language == "java":
+            class_path = ["-cp", "/build"]
+            if os.path.exists(os.path.join(payload.build_dir, "app.jsa")) and os.path.exists(os.path.join(payload.build_dir, "app.jar")):
+                class_path = ["-XX:SharedArchiveFile=/build/app.jsa", "-cp", "/build/app.jar"]
+            class_name = os.path.splitext(self.filenames["java"])[0]
+            return ["java", *JAVA_RUN_FLAGS, *class_path, class_name, *args]
+        return ["/build/a.out", *args]
+
+    def _prepare_rootfs(self, language: str) -> Tuple[str, Dict[str, str]]:
+        """(path rootfs, environment image), export ulang jika image berubah"""
+        with self._rootfs_lock:
+            if language in self._rootfs:
+                return self._rootfs[language]
+
+            image_id = self._image_id(language)
+            if not image_id:
+                raise SandboxUnavailable(f"Image {self.images[language]} tidak ditemukan")
+
+            root = os.path.join(self.rootfs_dir, language)
+            meta_path = f"{root}.json"
+            meta = None
+            if os.path.exists(meta_path) and os.path.isdir(root):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            if not meta or meta.get("image_id") != image_id:
+                meta = self._export_rootfs(language, image_id, root)
+                with open(meta_path, 'w') as f:
+                    json.dump(meta, f)
+
+            self._rootfs[language] = (root, meta["env"])
+            return self._rootfs[language]
+
+    def _export_rootfs(self, language: str, image_id: str, root: str) -> dict:
+        """Export filesystem runner image ke root (atomic rename), device node dilewati"""
+        log.info("export rootfs", extra=fields(image=self.images[language], root=root))
+        os.makedirs(self.rootfs_dir, exist_ok=True)
+        os.chmod(self.rootfs_dir, 0o755)
+        tmp_root = f"{root}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(tmp_root)
+        # filter="tar" tersedia di Python 3.12 (dan backport 3.8+ terbaru)
+        extract_options = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+
+        try:
+            image = self.engine.client.images.get(self.images[language])
+            container = self.engine.client.containers.create(self.images[language], entrypoint=["true"])
+            try:
+                stream = io.BufferedReader(_ChunkStream(container.export()), buffer_size=1 << 20)
+                with tarfile.open(fileobj=stream, mode="r|") as tar:
+                    for member in tar:
+                        if member.isdev():
+                            continue
+                        tar.extract(member, tmp_root, **extract_options)
+            finally:
+                container.remove(force=True)
+
+            for name in SANDBOX_MOUNT_POINTS:
+                os.makedirs(os.path.join(tmp_root, name), exist_ok=True)
+            for device in DEVICES:
+                device_path = os.path.join(tmp_root, "dev", device)
+                if not os.path.lexists(device_path):
+                    open(device_path, 'w').close()
+            os.chmod(tmp_root, 0o755)
+
+            old_root = None
+            if os.path.exists(root):
+                old_root = f"{root}.old-{uuid.uuid4().hex}"
+                os.rename(root, old_root)
+            os.rename(tmp_root, root)
+            if old_root:
+                shutil.rmtree(old_root, ignore_errors=True)
+        except (*DOCKER_ERRORS, OSError, tarfile.TarError) as e:
+            shutil.rmtree(tmp_root, ignore_errors=True)
+            raise SandboxUnavailable(f"export rootfs {language} gagal: {e}")
+
+        env = dict(item.split("=", 1) for item in image.attrs["Config"].get("Env") or [])
+        env.setdefault("PATH", "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin")
+        env["HOME"] = "/tmp"
+        return {"image_id": image_id, "env": env}
+
+    def _request(self, spec: dict, timeout: float) -> dict:
+        """
+        Kirim satu run ke spawner, tunggu hasilnya. Connect yang gagal
+        dicoba lagi dengan backoff (spawner di-restart); error setelah run
+        terkirim tidak diulang karena program mungkin sudah jalan.
+        """
+        for attempt in range(SERVER_ATTEMPTS):
+            server = self._ensure_server()
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.settimeout(timeout)
+                sock.connect(self._socket_path)
+                break
+            except OSError as e:
+                sock.close()
+                log.warning("connect spawner gagal", extra=fields(attempt=attempt + 1, error=str(e)))
+                if attempt == SERVER_ATTEMPTS - 1:
+                    raise SandboxRunError(f"spawner: {e}")
+                self._stop_server(server)
+                time.sleep(SERVER_BACKOFF_S * 2 ** attempt)
+
+        try:
+            with sock:
+                sock.sendall(json.dumps(spec).encode() + b"\n")
+                with sock.makefile("rb") as stream:
+                    line = stream.readline()
+        except OSError as e:
+            raise SandboxRunError(f"spawner: {e}")
+        if not line:
+            raise SandboxRunError("spawner tidak membalas")
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise SandboxRunError(f"balasan spawner tidak valid: {e}")
+
+    def _ensure_server(self) -> subprocess.Popen:
+        """
+        Start spawner (core/sandbox.py) jika belum jalan, dicoba SERVER_ATTEMPTS
+        kali dengan backoff sebelum sandbox dianggap tidak tersedia. stdin
+        spawner adalah pipe dari proses ini: spawner berhenti sendiri saat
+        judger mati.
+        """
+        with self._server_lock:
+            if self._server is not None and self._server.poll() is None:
+                return self._server
+
+            for attempt in range(SERVER_ATTEMPTS):
+                try:
+                    self._server = self._start_server()
+                    return self._server
+                except (OSError, SandboxRunError) as e:
+                    log.warning("start spawner gagal", extra=fields(attempt=attempt + 1, error=str(e)))
+                    if attempt == SERVER_ATTEMPTS - 1:
+                        raise SandboxUnavailable(f"spawner: {e}")
+                    time.sleep(SERVER_BACKOFF_S * 2 ** attempt)
+
+    def _start_server(self) -> subprocess.Popen:
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        server = subprocess.Popen([sys.executable, SANDBOX_SCRIPT, self._socket_path], stdin=subprocess.PIPE)
+
+        deadline = time.monotonic() + SERVER_START_TIMEOUT_S
+        while not os.path.exists(self._socket_path):
+            if server.poll() is not None:
+                raise SandboxRunError(f"spawner berhenti (exit code {server.returncode})")
+            if time.monotonic() > deadline:
+                self._kill(server)
+                raise SandboxRunError("spawner tidak siap")
+            time.sleep(0.01)
+        return server
+
+    def _stop_server(self, server: subprocess.Popen):
+        """Hentikan spawner yang tidak bisa di-connect, kecuali sudah diganti thread lain"""
+        with self._server_lock:
+            if self._server is not server:
+                return
+            self._kill(server)
+            self._server = None
+
+    @staticmethod
+    def _kill(server: subprocess.Popen):
+        server.kill()
+        server.wait()
+        server.stdin.close()
@@ -0,0 +1,377 @@
+from .models import JudgeRequest
+from .config import SUBMISSION_STORE_DB, SUBMISSION_STORE_COMPRESS_MIN_BYTES
+from .log import get_logger, fields
+from .metrics import submission_store_dropped_total
+from .job_queue import SubmissionStatus
+from datetime import datetime
+from typing import List, Optional, Tuple
+import hashlib, json, os, queue, sqlite3, threading, time, zlib
+
+log = get_logger("submission_store")
+
+WRITE_BATCH = 256  # Maksimal submission per transaksi writer
+PAGE_MAX = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    user_id TEXT,
+    problem_id TEXT,
+    language TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    score REAL NOT NULL,
+    total_cases INTEGER NOT NULL,
+    passed_cases INTEGER NOT NULL,
+    skipped_cases INTEGER NOT NULL,
+    total_time_ms REAL NOT NULL,
+    max_time_ms REAL NOT NULL,
+    avg_time_ms REAL NOT NULL,
+    max_memory_kb REAL NOT NULL,
+    compile_time_ms REAL NOT NULL,
+    execution_time_ms REAL NOT NULL,
+    compile_cached INTEGER NOT NULL,
+    checker_time_ms REAL NOT NULL,
+    queue_wait_ms REAL NOT NULL,
+    lane TEXT NOT NULL,
+    cached INTEGER NOT NULL,
+    error_message BLOB,
+    code BLOB NOT NULL,
+    tests_ref TEXT,
+    options TEXT NOT NULL,
+    judged_at TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_user ON submissions (user_id, seq);
+CREATE INDEX IF NOT EXISTS submissions_problem ON submissions (problem_id, seq);
+CREATE INDEX IF NOT EXISTS submissions_verdict ON submissions (verdict, seq);
+CREATE INDEX IF NOT EXISTS submissions_created ON submissions (created_at);
+
+CREATE TABLE IF NOT EXISTS test_results (
+    submission_seq INTEGER NOT NULL,
+    case_number INTEGER NOT NULL,
+    verdict TEXT NOT NULL,
+    time_ms REAL NOT NULL,
+    memory_kb REAL NOT NULL,
+    checker_time_ms REAL NOT NULL,
+    detail BLOB NOT NULL,
+    PRIMARY KEY (submission_seq, case_number)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+# Kolom ringkasan hasil (sama dengan key JudgeResult.to_dict())
+RESULT_COLUMNS = (
+    "verdict", "score", "total_cases", "passed_cases", "skipped_cases", "total_time_ms", "max_time_ms",
+    "avg_time_ms", "max_memory_kb", "compile_time_ms", "execution_time_ms", "compile_cached",
+    "checker_time_ms", "queue_wait_ms", "lane", "cached", "judged_at"
+)
+SUMMARY_COLUMNS = (
+    "seq", "id", "user_id", "problem_id", "language", "verdict", "score", "passed_cases", "total_cases",
+    "max_time_ms", "max_memory_kb", "cached", "created_at"
+)
+RAW, ZLIB = b"r", b"z"
+
+def pack(data: bytes, compress_min: int = SUBMISSION_STORE_COMPRESS_MIN_BYTES) -> bytes:
+    """Data besar dikompresi zlib; byte pertama menandai format"""
+    if len(data) >= compress_min:
+        compressed = zlib.compress(data, 6)
+        if len(compressed) < len(data):
+            return ZLIB + compressed
+    return RAW + data
+
+def unpack(blob: Optional[bytes]) -> Optional[bytes]:
+    if blob is None:
+        return None
+    return zlib.decompress(blob[1:]) if blob[:1] == ZLIB else blob[1:]
+
+def _pack_text(text: Optional[str]) -> Optional[bytes]:
+    return None if text is None else pack(text.encode("utf-8"))
+
+def _unpack_text(blob: Optional[bytes]) -> Optional[str]:
+    data = unpack(blob)
+    return None if data is None else data.decode("utf-8")
+
+class SubmissionStore:
+    """
+    Riwayat submission permanen di SQLite (WAL).
+
+    Thread judge hanya memasukkan hasil ke antrian (record()); satu thread
+    writer menulis per batch dalam satu transaksi, jadi judging tidak
+    menunggu disk. Code, output dan pesan error yang besar dikompresi, test
+    case inline disimpan sekali per isi (content-addressed di tabel blobs)
+    dan direferensikan lewat hash, karena satu test set biasanya dipakai
+    banyak submission. Test case dari problem store cukup lewat problem_id.
+
+    Query memakai pagination keyset (seq menurun) di atas index user,
+    problem, verdict dan waktu, sehingga tetap cepat di jutaan baris.
+    """
+
+    def __init__(self, path: str = SUBMISSION_STORE_DB):
+        self.path = path
+        self._local = threading.local()
+        self._queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def running(self) -> bool:
+        return self._writer is not None
+
+    def start(self):
+        """Buat schema dan start thread writer (idempotent)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._writer is not None:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = self._db()
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self._writer = threading.Thread(target=self._writer_loop, name="seka-submission-store", daemon=True)
+            self._writer.start()
+
+    def shutdown(self):
+        """Tulis semua hasil yang masih di antrian lalu stop writer"""
+        with self._lock:
+            if self._writer is None:
+                return
+            try:
+                self._queue.put(None, timeout=30)
+            except queue.Full:
+                log.error("writer submission store tidak berjalan, antrian tidak ditulis", extra=fields(pending=self._queue.qsize()))
+            self._writer.join(timeout=30)
+            self._writer = None
+
+    def record(self, submission_id: str, payload: JudgeRequest, result):
+        """Simpan hasil judging (JudgeResult) di background; no-op jika store tidak jalan"""
+        if self._writer is None:
+            return
+        # Riwayat tidak boleh memblok judging: jika writer tertinggal, hasil dibuang
+        try:
+            self._queue.put_nowait((submission_id, payload, result, time.time()))
+        except queue.Full:
+            submission_store_dropped_total.labels("queue_full").inc()
+            log.warning("antrian submission store penuh, hasil tidak disimpan", extra=fields(submission_id=submission_id))
+
+    def get(self, submission_id: str) -> Optional[dict]:
+        """Submission lengkap dengan hasil per test case, format sama dengan Submission.to_dict()"""
+        if not self.running:
+            return None
+        db = self._db()
+        row = db.execute(
+            f"SELECT seq, user_id, problem_id, language, code, options, error_message, created_at, "
+            f"{', '.join(RESULT_COLUMNS)} FROM submissions WHERE id = ?",
+            (submission_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        seq, user_id, problem_id, language, code, options, error_message, created_at = row[:8]
+        result = dict(zip(RESULT_COLUMNS, row[8:]))
+        result["compile_cached"] = bool(result["compile_cached"])
+        result["cached"] = bool(result["cached"])
+        result["error_message"] = _unpack_text(error_message)
+        result["test_results"] = [
+            {
+                "case_number": case_number,
+                "verdict": verdict,
+                "time_ms": time_ms,
+                "memory_kb": memory_kb,
+                "checker_time_ms": checker_time_ms,
+                **json.loads(unpack(detail))
+            }
+            for case_number, verdict, time_ms, memory_kb, checker_time_ms, detail in db.execute(
+                "SELECT case_number, verdict, time_ms, memory_kb, checker_time_ms, detail "
+                "FROM test_results WHERE submission_seq = ? ORDER BY case_number",
+                (seq,)
+            )
+        ]
+        return {
+            "submission_id": submission_id,
+            "status": SubmissionStatus.FINISHED,
+            "result": result,
+            "error_message": None,
+            "created_at": datetime.fromtimestamp(created_at).isoformat(),
+            "started_at": None,
+            "finished_at": result["judged_at"],
+            "user_id": user_id,
+            "problem_id": problem_id,
+            "language": language,
+            "code": _unpack_text(code),
+            "options": json.loads(options)
+        }
+
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        problem_id: Optional[str] = None,
+        verdict: Optional[str] = None,
+        language: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        cursor: Optional[int] = None,
+        limit: int = 50
+    ) -> dict:
+        """
+        Ringkasan submission terbaru dulu. cursor = next_cursor dari halaman
+        sebelumnya (seq), bukan offset, supaya halaman jauh tetap murah.
+        """
+        if not self.running:
+            return {"items": [], "next_cursor": None}
+        limit = max(1, min(limit, PAGE_MAX))
+        conditions, params = [], []
+        for column, value in (("user_id", user_id), ("problem_id", problem_id), ("verdict", verdict), ("language", language)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        if cursor is not None:
+            conditions.append("seq < ?")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._db().execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM submissions {where} ORDER BY seq DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+
+        items = []
+        for row in rows[:limit]:
+            item = dict(zip(SUMMARY_COLUMNS, row))
+            item["submission_id"] = item.pop("id")
+            item["cached"] = bool(item["cached"])
+            item["created_at"] = datetime.fromtimestamp(item["created_at"]).isoformat()
+            del item["seq"]
+            items.append(item)
+        return {
+            "items": items,
+            "next_cursor": rows[limit - 1][0] if len(rows) > limit else None
+        }
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _writer_loop(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stop = True
+                batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
+            try:
+                self._write(batch)
+            except Exception:
+                # Error apa pun tidak boleh menghentikan writer (record() akan membuang
+                # semua hasil), dan satu hasil rusak tidak boleh membuang satu batch
+                if len(batch) == 1:
+                    self._drop_failed(batch[0][0])
+                    continue
+                for item in batch:
+                    try:
+                        self._write([item])
+                    except Exception:
+                        self._drop_failed(item[0])
+
+    @staticmethod
+    def _drop_failed(submission_id: str):
+        submission_store_dropped_total.labels("write_error").inc()
+        log.exception("gagal menyimpan submission", extra=fields(submission_id=submission_id))
+
+    def _write(self, batch: List[Tuple]):
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for submission_id, payload, result, created_at in batch:
+                self._insert(db, submission_id, payload, result, created_at)
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _insert(self, db: sqlite3.Connection, submission_id: str, payload: JudgeRequest, judge_result, created_at: float):
+        result = judge_result.to_dict()
+        tests_ref = None
+        if not payload.problem_id:
+            tests = json.dumps([tc.model_dump() for tc in payload.test_cases], ensure_ascii=False).encode("utf-8")
+            tests_ref = hashlib.sha256(tests).hexdigest()
+            db.execute("INSERT OR IGNORE INTO blobs (sha256, data) VALUES (?, ?)", (tests_ref, pack(tests)))
+
+        options = json.dumps({
+            "time_limit_ms": payload.time_limit_ms,
+            "memory_limit_kb": payload.memory_limit_kb,
+            "compare_mode": payload.compare_mode.value,
+            "stop_on_first_failure": payload.stop_on_first_failure
+        })
+        cursor = db.execute(
+            f"INSERT INTO submissions (id, user_id, problem_id, language, error_message, code, tests_ref, options, created_at, "
+            f"{', '.join(RESULT_COLUMNS)}) VALUES ({', '.join('?' * (9 + len(RESULT_COLUMNS)))}) ON CONFLICT (id) DO NOTHING",
+            (
+                submission_id,
+                payload.user_id,
+                payload.problem_id,
+                payload.language,
+                _pack_text(result["error_message"]),
+                _pack_text(payload.code),
+                tests_ref,
+                options,
+                created_at,
+                *(result[column] for column in RESULT_COLUMNS)
+            )
+        )
+        if not cursor.rowcount:
+            return  # Submission yang sama sudah tersimpan (misal job diambil ulang)
+
+        db.executemany(
+            "INSERT INTO test_results (submission_seq, case_number, verdict, time_ms, memory_kb, checker_time_ms, detail) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    cursor.lastrowid,
+                    test["case_number"],
+                    test["verdict"],
+                    test["time_ms"],
+                    test["memory_kb"],
+                    test["checker_time_ms"],
+                    # Output program disimpan utuh (preview executor), bukan potongan to_dict()
+                    pack(json.dumps({
+                        "input_data": test["input_data"],
+                        "expected_output": test["expected_output"],
+                        "actual_output": test_result.actual_output,
+                        "error_message": test["error_message"]
+                    }, ensure_ascii=False).encode("utf-8"))
+                )
+                for test_result, test in zip(judge_result.test_results, result["test_results"])
+            ]
+        )
+
+
+submission_store = SubmissionStore()
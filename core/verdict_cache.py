@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from .config import VERDICT_CACHE_MAX_BYTES, VERDICT_CACHE_TTL_S
+import hashlib, threading, time
+
+HIT = "hit"
+SHARED = "shared"
+MISS = "miss"
+
+class _Flight:
+    """Judging yang sedang jalan untuk satu key, ditunggu request identik"""
+    def __init__(self):
+        self._event = threading.Event()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        self._event.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+class VerdictCache:
+    """
+    Cache hasil judging in-memory yang di-address oleh hash request
+    (bahasa, code, test set, limit, compare mode). Entry kedaluwarsa setelah
+    ttl_s, ukuran total dibatasi max_bytes dengan eviction LRU.
+
+    Request identik yang datang saat judging pertama masih jalan tidak
+    di-judge ulang: acquire() mengembalikan _Flight milik request pertama
+    dan hasilnya dibagi begitu complete() dipanggil.
+    """
+
+    def __init__(self, max_bytes: int = VERDICT_CACHE_MAX_BYTES, ttl_s: float = VERDICT_CACHE_TTL_S):
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._flights = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "shared": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            # Prefix panjang supaya batas antar field tidak ambigu
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def contains(self, key: str) -> bool:
+        """Cek tanpa menghitung statistik (dipakai sebelum reservasi admission)"""
+        with self._lock:
+            return self._live_entry(key) is not None
+
+    def acquire(self, key: str) -> Tuple[str, Any]:
+        """
+        (HIT, value) jika hasil ada di cache, (SHARED, flight) jika request
+        identik sedang di-judge (hasil diambil dengan flight.wait()), atau
+        (MISS, flight) dan pemanggil wajib memanggil complete() dengan flight
+        tersebut setelah selesai judging.
+        """
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return HIT, entry[0]
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats["shared"] += 1
+                return SHARED, flight
+            flight = self._flights[key] = _Flight()
+            self._stats["misses"] += 1
+            return MISS, flight
+
+    def complete(
+        self,
+        key: str,
+        flight: _Flight,
+        value: Any = None,
+        size: int = 0,
+        store: bool = True,
+        error: Optional[BaseException] = None
+    ):
+        """
+        Bagikan hasil ke request yang menunggu flight, dan simpan ke cache
+        jika store (hasil yang tidak stabil, misal TLE, cukup dibagi).
+        """
+        with self._lock:
+            if error is None and store and size <= self.max_bytes:
+                self._store_locked(key, value, size)
+            self._flights.pop(key, None)
+        flight._value = value
+        flight._error = error
+        flight._event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["in_flight"] = len(self._flights)
+            stats["total_bytes"] = self._total_bytes
+        stats["max_bytes"] = self.max_bytes
+        stats["ttl_s"] = self.ttl_s
+        lookups = stats["hits"] + stats["shared"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["shared"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _live_entry(self, key: str) -> Optional[Tuple[Any, int, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            del self._entries[key]
+            self._total_bytes -= entry[1]
+            self._stats["expired"] += 1
+            return None
+        return entry
+
+    def _store_locked(self, key: str, value: Any, size: int):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_bytes -= old[1]
+        self._entries[key] = (value, size, time.monotonic() + self.ttl_s)
+        self._total_bytes += size
+        self._stats["stores"] += 1
+        while self._total_bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            self._stats["evictions"] += 1
+
+
+verdict_cache = VerdictCache()
@@ -0,0 +1,78 @@
+from .config import WORKSPACE_DIR, WORKSPACE_LIMIT_BYTES, CONTAINER_TMPFS_MB
+import os, tempfile
+
+# File yang disiapkan judge di /code (bukan ditulis program), tidak dihitung sebagai pemakaian
+WORKSPACE_INPUT_FILES = {"input.txt", "contestant_output.txt", "expected_output.txt"}
+
+# Exit code proses yang di-kill SIGXFSZ (128 + 25), lihat ulimit -f di runner script
+SIGXFSZ_EXIT_CODE = 153
+
+def make_workspace(prefix: str) -> str:
+    """
+    Buat directory kerja satu run di WORKSPACE_DIR (default tmpfs /dev/shm).
+    Jika sisa ruang tmpfs tidak cukup untuk satu workspace penuh, fallback
+    ke temp dir biasa supaya node tidak kehabisan RAM.
+    """
+    try:
+        os.makedirs(WORKSPACE_DIR, exist_ok=True)
+        stat = os.statvfs(WORKSPACE_DIR)
+        if stat.f_bavail * stat.f_frsize >= WORKSPACE_LIMIT_BYTES:
+            return tempfile.mkdtemp(prefix=prefix, dir=WORKSPACE_DIR)
+    except OSError:
+        pass
+    return tempfile.mkdtemp(prefix=prefix)
+
+def make_workspace_file(prefix: str) -> str:
+    """File kosong di WORKSPACE_DIR (rename dari workspace murah karena satu filesystem)"""
+    try:
+        os.makedirs(WORKSPACE_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix=prefix, dir=WORKSPACE_DIR)
+    except OSError:
+        fd, path = tempfile.mkstemp(prefix=prefix)
+    os.close(fd)
+    return path
+
+def workspace_usage(path: str) -> tuple:
+    """
+    (total byte, file terbesar) yang ditulis program di workspace,
+    tidak termasuk WORKSPACE_INPUT_FILES
+    """
+    total = 0
+    largest = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            if root == path and name in WORKSPACE_INPUT_FILES:
+                continue
+            try:
+                size = os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+            total += size
+            largest = max(largest, size)
+    return total, largest
+
+def workspace_exceeded(returncode: int, usage: tuple) -> bool:
+    """
+    Run dianggap memenuhi workspace jika di-kill SIGXFSZ, ada file yang
+    mencapai batas ulimit -f (program yang menangani EFBIG sendiri, misal
+    Python/Java), atau total pemakaian melewati WORKSPACE_LIMIT_BYTES
+    """
+    total, largest = usage
+    return (
+        returncode == SIGXFSZ_EXIT_CODE
+        or largest >= WORKSPACE_LIMIT_BYTES
+        or total > WORKSPACE_LIMIT_BYTES
+    )
+
+def container_options(environment: dict = None) -> dict:
+    """
+    Opsi container runner: rootfs read-only, /tmp berupa tmpfs dengan batas
+    ukuran, dan batas file yang ditulis program (WORKSPACE_LIMIT_KB)
+    """
+    env = {"WORKSPACE_LIMIT_KB": str(WORKSPACE_LIMIT_BYTES // 1024)}
+    env.update(environment or {})
+    return {
+        "read_only": True,
+        "tmpfs": {"/tmp": f"size={CONTAINER_TMPFS_MB}m,mode=1777"},
+        "environment": env,
+    }
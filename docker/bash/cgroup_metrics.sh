@@ -0,0 +1,36 @@
+#!/bin/bash
+# Helper accounting dari cgroup v2 milik container (dipakai dengan --cgroupns private,
+# sehingga /sys/fs/cgroup adalah cgroup container itu sendiri).
+# Hanya memakai builtin bash, tidak butuh tool tambahan di image.
+CGROUP_DIR=/sys/fs/cgroup
+
+# usage_usec dari cpu.stat, kosong jika cgroup v2 tidak tersedia
+cgroup_cpu_usec() {
+    if [ -r "$CGROUP_DIR/cpu.stat" ]; then
+        while read -r key value; do
+            if [ "$key" == "usage_usec" ]; then
+                echo "$value"
+                return
+            fi
+        done < "$CGROUP_DIR/cpu.stat"
+    fi
+}
+
+# Panggil tepat sebelum program user dijalankan
+cgroup_snapshot() {
+    CG_CPU_BEFORE=$(cgroup_cpu_usec)
+}
+
+# Tulis CPU time (delta usage_usec) dan memory.peak ke file metrics
+cgroup_write_metrics() {
+    local metrics_file=$1
+    local cpu_after
+    cpu_after=$(cgroup_cpu_usec)
+
+    if [ -n "$CG_CPU_BEFORE" ] && [ -n "$cpu_after" ]; then
+        echo "CG_CPU_USEC:$((cpu_after - CG_CPU_BEFORE))" >> "$metrics_file"
+    fi
+    if [ -r "$CGROUP_DIR/memory.peak" ]; then
+        echo "CG_MEM_PEAK:$(< "$CGROUP_DIR/memory.peak")" >> "$metrics_file"
+    fi
+}
@@ -1,41 +1,61 @@
 #!/bin/bash
-set -e
+# Mode eksekusi:
+#   compile -> compile /code/main.c menjadi /code/a.out (sekali per submission)
+#   run     -> jalankan /build/a.out (hasil compile) dengan /code/input.txt
+#   (kosong)-> compile lalu run dalam satu container (mode lama)
+MODE=${1:-all}
+source /cgroup_metrics.sh
+BUILD_DIR=/code
+if [ "$MODE" == "run" ]; then
+    BUILD_DIR=/build
+fi
 
-gcc /code/main.c -o /code/a.out 2> /code/compile_error.txt
-compile_exit=$?
+compile_code() {
+    compile_exit=0
+    gcc $COMPILE_FLAGS /code/main.c -o /code/a.out 2> /code/compile_error.txt || compile_exit=$?
 
-if [ $compile_exit -ne 0 ]; then
-    echo "COMPILE_ERROR"  > /code/status.txt
-    exit $compile_exit
-fi
+    if [ $compile_exit -ne 0 ]; then
+        echo "COMPILE_ERROR"  > /code/status.txt
+        exit $compile_exit
+    fi
 
-# Jika dicompile, dan hasilnya ada, berarti cuman warning
-if [ -f /code/compile_error.txt ]; then
-    if [ -f /code/a.out ]; then
-        echo "COMPILE_WARNING" > /code/status.txt
+    # Jika dicompile, dan hasilnya ada, berarti cuman warning
+    if [ -s /code/compile_error.txt ]; then
+        if [ -f /code/a.out ]; then
+            echo "COMPILE_WARNING" > /code/status.txt
+        fi
     fi
-fi
+}
 
-#run
-start_time=$(date +%s%N)
-timeout 10 /usr/bin/time -f "MEM:%M" -o /code/metrics.txt /code/a.out < /code/input.txt > /code/output.txt 2> /code/error.txt
-exit_code=$?
-
-end_time=$(date +%s%N)
-elapsed_time=$(( (end_time-start_time) / 1000000))
-
-echo "TIME:$elapsed_time" >> /code/metrics.txt
-
-if [ $exit_code -eq 124 ]; then
-    echo "TIMEOUT" > /code/status.txt
-    exit 124
-elif [ $exit_code -ne 0 ]; then
-    echo "RUNTIME_ERROR"  > /code/status.txt
-    exit $exit_code
-elif [ $compile_exit -ne 0 ]; then
-    echo "COMPILE_ERROR" > /code/status.txt
-    exit $compile_exit
-else
-    echo "SUCCESS"  > /code/status.txt
-fi
+run_code() {
+    exit_code=0
+    # Batasi ukuran file yang ditulis program (SIGXFSZ / EFBIG) supaya workspace tidak penuh
+    if [ -n "$WORKSPACE_LIMIT_KB" ]; then
+        ulimit -f "$WORKSPACE_LIMIT_KB"
+    fi
+    cgroup_snapshot
+    start_time=$(date +%s%N)
+    timeout 10 /usr/bin/time -f "MEM:%M" -o /code/metrics.txt "$BUILD_DIR/a.out" < /code/input.txt > /code/output.txt 2> /code/error.txt || exit_code=$?
+
+    end_time=$(date +%s%N)
+    elapsed_time=$(( (end_time-start_time) / 1000000))
+
+    echo "TIME:$elapsed_time" >> /code/metrics.txt
+    cgroup_write_metrics /code/metrics.txt
+
+    if [ $exit_code -eq 124 ]; then
+        echo "TIMEOUT" > /code/status.txt
+        exit 124
+    elif [ $exit_code -ne 0 ]; then
+        echo "RUNTIME_ERROR"  > /code/status.txt
+        exit $exit_code
+    else
+        echo "SUCCESS"  > /code/status.txt
+    fi
+}
 
+case "$MODE" in
+    compile) compile_code ;;
+    run) run_code ;;
+    *) compile_code; run_code ;;
+esac
@@ -1,42 +1,95 @@
 #!/bin/bash
-set -e
-# start_time=$(date +%s%N)
+# Mode eksekusi:
+#   compile -> javac /code/*.java, class file disimpan di /code (sekali per submission),
+#              lalu dibuat archive AppCDS /code/app.jsa untuk mempercepat startup JVM
+#   run     -> jalankan class hasil compile di /build dengan /code/input.txt
+#   (kosong)-> compile lalu run dalam satu container (mode lama, tanpa AppCDS)
+#
+# JAVA_CDS=off mematikan AppCDS dan flag JVM (untuk pengukuran baseline)
+MODE=${1:-all}
+source /cgroup_metrics.sh
+BUILD_DIR=/code
+if [ "$MODE" == "run" ]; then
+    BUILD_DIR=/build
+fi
 
-#compile java
-java_file=$(find /code -name "*.java" | head -n 1)
+java_file=$(find "$BUILD_DIR" -name "*.java" | head -n 1)
 class_name=$(basename "$java_file" .java)
-javac "$java_file" 2> /code/compile_error.txt
-compile_exit=$?
-if [ $compile_exit -ne 0 ]; then
-    echo "COMPILE_ERROR"  > /code/status.txt
-    cat /code/compile_error.txt
-    exit $compile_exit
-fi
 
-# Jika dicompile, dan hasilnya ada, berarti cuman warning
-if [ -f /code/compile_error.txt ]; then
-        echo "COMPILE_WARNING" > /code/status.txt 
-fi
+# Flag untuk run pendek: SerialGC (startup lebih cepat dari G1), tanpa
+# hsperfdata, dan log JVM (misal warning CDS mismatch) tidak ikut ke stdout
+JAVA_RUN_FLAGS="-XX:+UseSerialGC -XX:-UsePerfData -Xshare:auto -Xlog:disable"
 
-# run
-start_time=$(date +%s%N)
-timeout 10 /usr/bin/time -f "MEM:%M" -o /code/metrics.txt java "$class_name" < /code/input.txt > /code/output.txt 2> /code/error.txt
-exit_code=$?
+compile_code() {
+    compile_exit=0
+    javac $COMPILE_FLAGS -d /code "$java_file" 2> /code/compile_error.txt || compile_exit=$?
+    if [ $compile_exit -ne 0 ]; then
+        echo "COMPILE_ERROR"  > /code/status.txt
+        cat /code/compile_error.txt
+        exit $compile_exit
+    fi
 
-end_time=$(date +%s%N)
-elapsed_time=$(( (end_time-start_time) / 1000000))
+    # Jika dicompile, dan hasilnya ada, berarti cuman warning
+    if [ -s /code/compile_error.txt ]; then
+            echo "COMPILE_WARNING" > /code/status.txt
+    fi
+}
 
-echo "TIME:$elapsed_time" >> /code/metrics.txt
+create_app_cds() {
+    # CDS hanya bisa mengarsipkan class dari JAR, dan classpath saat run harus
+    # sama persis dengan saat dump. Build dir di-mount juga di /build saat
+    # compile, jadi archive dibuat dengan classpath /build/app.jar.
+    # Gagal membuat archive tidak menggagalkan compile (JVM jalan tanpa AppCDS).
+    (cd /code && find . -name "*.class" | sed 's|^\./||' > /tmp/app.classes) || return 0
+    (cd /code && jar cf /tmp/app.jar @/tmp/app.classes) || return 0
+    mv /tmp/app.jar /code/app.jar
 
-if [ $exit_code -eq 124 ]; then
-    echo "TIMEOUT"  > /code/status.txt
-    exit 124
-elif [ $exit_code -ne 0 ]; then
-    echo "RUNTIME_ERROR"  > /code/status.txt
-    cat /code/error.txt
-    exit $exit_code
-fi
+    # Class list = class JDK dari image + semua class submission
+    cp /opt/seka/jdk.classlist /tmp/app.classlist
+    sed 's|\.class$||' /tmp/app.classes >> /tmp/app.classlist
+    java -Xshare:dump -XX:SharedClassListFile=/tmp/app.classlist -XX:SharedArchiveFile=/code/app.jsa \
+        -cp /build/app.jar > /dev/null 2>&1 || rm -f /code/app.jsa /code/app.jar
+}
+
+run_code() {
+    exit_code=0
+    # Batasi ukuran file yang ditulis program (SIGXFSZ / EFBIG) supaya workspace tidak penuh
+    if [ -n "$WORKSPACE_LIMIT_KB" ]; then
+        ulimit -f "$WORKSPACE_LIMIT_KB"
+    fi
+    cgroup_snapshot
+    start_time=$(date +%s%N)
+    java_cmd=(java -cp "$BUILD_DIR")
+    if [ "$JAVA_CDS" != "off" ]; then
+        java_cmd=(java $JAVA_RUN_FLAGS -cp "$BUILD_DIR")
+        if [ -f "$BUILD_DIR/app.jsa" ] && [ -f "$BUILD_DIR/app.jar" ]; then
+            java_cmd=(java $JAVA_RUN_FLAGS -XX:SharedArchiveFile="$BUILD_DIR/app.jsa" -cp "$BUILD_DIR/app.jar")
+        fi
+    fi
+    timeout 10 /usr/bin/time -f "MEM:%M" -o /code/metrics.txt "${java_cmd[@]}" "$class_name" < /code/input.txt > /code/output.txt 2> /code/error.txt || exit_code=$?
+
+    end_time=$(date +%s%N)
+    elapsed_time=$(( (end_time-start_time) / 1000000))
+
+    echo "TIME:$elapsed_time" >> /code/metrics.txt
+    cgroup_write_metrics /code/metrics.txt
+
+    if [ $exit_code -eq 124 ]; then
+        echo "TIMEOUT"  > /code/status.txt
+        exit 124
+    elif [ $exit_code -ne 0 ]; then
+        echo "RUNTIME_ERROR"  > /code/status.txt
+        cat /code/error.txt
+        exit $exit_code
+    fi
+
+    # success
+    echo "SUCCESS"  > /code/status.txt
+    cat /code/output.txt
+}
 
-# success
-echo "SUCCESS"  > /code/status.txt
-cat /code/output.txt
\ No newline at end of file
+case "$MODE" in
+    compile) compile_code; if [ "$JAVA_CDS" != "off" ]; then create_app_cds; fi ;;
+    run) run_code ;;
+    *) compile_code; run_code ;;
+esac
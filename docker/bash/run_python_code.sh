@@ -1,15 +1,61 @@
 #!/bin/bash
-set -e
+# Mode eksekusi:
+#   compile -> tidak ada (python diinterpretasi), selalu sukses
+#   run     -> jalankan /build/main.py dengan /code/input.txt
+#   check   -> jalankan /build/main.py sebagai checker:
+#              main.py input.txt contestant_output.txt expected_output.txt
+#   (kosong)-> jalankan /code/main.py (mode lama)
+#
+# Di container pool, PID 1 adalah zygote (/seka_zygote.py) yang sudah
+# import modul umum; run/check di-fork dari zygote lewat FIFO, bukan
+# menjalankan python3 baru. Tanpa zygote, fallback ke python3 biasa.
+MODE=${1:-all}
+source /cgroup_metrics.sh
+BUILD_DIR=/code
+PROGRAM_ARGS=()
+if [ "$MODE" == "run" ] || [ "$MODE" == "check" ]; then
+    BUILD_DIR=/build
+fi
+if [ "$MODE" == "check" ]; then
+    PROGRAM_ARGS=(/code/input.txt /code/contestant_output.txt /code/expected_output.txt)
+fi
+
+if [ "$MODE" == "compile" ]; then
+    exit 0
+fi
 
+ZYGOTE_DIR=/run/seka_zygote
+
+# Minta zygote fork satu child, set exit_code dan tulis MEM ke metrics
+zygote_run() {
+    local request zygote_mem
+    request=$(IFS=$'\t'; echo "$*")
+    echo "$request" > "$ZYGOTE_DIR/request"
+    read -r exit_code zygote_mem < "$ZYGOTE_DIR/response"
+    echo "MEM:$zygote_mem" > /code/metrics.txt
+}
+
+exit_code=0
+# Batasi ukuran file yang ditulis program (SIGXFSZ / EFBIG) supaya workspace tidak penuh
+if [ -n "$WORKSPACE_LIMIT_KB" ]; then
+    ulimit -f "$WORKSPACE_LIMIT_KB"
+fi
+cgroup_snapshot
 start_time=$(date +%s%N)
 
-timeout 10 /usr/bin/time -f "MEM:%M" -o /code/metrics.txt python3 /code/main.py < /code/input.txt > /code/output.txt 2> /code/error.txt
-exit_code=$?
+# FIFO selalu ada di image, jadi cek juga bahwa PID 1 memang zygote
+# (bukan `sleep infinity` saat zygote dimatikan atau fallback)
+if [ "$BUILD_DIR" == "/build" ] && [ -p "$ZYGOTE_DIR/request" ] && grep -qa seka_zygote /proc/1/cmdline 2>/dev/null; then
+    zygote_run "$BUILD_DIR/main.py" "${PROGRAM_ARGS[@]}"
+else
+    timeout 10 /usr/bin/time -f "MEM:%M" -o /code/metrics.txt python3 "$BUILD_DIR/main.py" "${PROGRAM_ARGS[@]}" < /code/input.txt > /code/output.txt 2> /code/error.txt || exit_code=$?
+fi
 
 end_time=$(date +%s%N)
 elapsed_time=$(( (end_time-start_time) / 1000000))
 
 echo "TIME:$elapsed_time" >> /code/metrics.txt
+cgroup_write_metrics /code/metrics.txt
 
 if [ $exit_code -eq 124 ]; then
     echo "TIMEOUT" > /code/status.txt
@@ -0,0 +1,53 @@
+import java.io.*;
+import java.util.*;
+import java.util.stream.*;
+
+/**
+ * Dijalankan sekali saat build image dengan -XX:DumpLoadedClassList untuk
+ * mendapatkan daftar class JDK yang umum dipakai solusi (I/O, collections,
+ * stream, format). Daftar ini menjadi isi archive CDS di runner image.
+ */
+public class CdsWarmup {
+    public static void main(String[] args) throws IOException {
+        String data = "3 1 2\nhello world\n";
+
+        Scanner scanner = new Scanner(new ByteArrayInputStream(data.getBytes()));
+        int n = scanner.nextInt();
+        scanner.nextLine();
+
+        BufferedReader reader = new BufferedReader(new InputStreamReader(new ByteArrayInputStream(data.getBytes())));
+        StringTokenizer tokenizer = new StringTokenizer(reader.readLine());
+        StreamTokenizer streamTokenizer = new StreamTokenizer(new StringReader(data));
+        streamTokenizer.nextToken();
+
+        List<Integer> list = new ArrayList<>();
+        while (tokenizer.hasMoreTokens()) {
+            list.add(Integer.parseInt(tokenizer.nextToken()));
+        }
+        Collections.sort(list);
+        int[] array = list.stream().mapToInt(Integer::intValue).toArray();
+        Arrays.sort(array);
+        long sum = Arrays.stream(array).asLongStream().sum();
+
+        Map<String, Integer> map = new HashMap<>();
+        TreeMap<Long, Long> treeMap = new TreeMap<>();
+        Set<Integer> set = new HashSet<>(list);
+        Deque<Integer> deque = new ArrayDeque<>(list);
+        PriorityQueue<Integer> heap = new PriorityQueue<>(Comparator.reverseOrder());
+        heap.addAll(set);
+        map.merge("n", n, Integer::sum);
+        treeMap.put(sum, (long) deque.size());
+        String joined = list.stream().map(String::valueOf).collect(Collectors.joining(" "));
+
+        StringBuilder builder = new StringBuilder();
+        builder.append(joined).append(' ').append(heap.peek()).append(' ').append(treeMap.firstKey());
+        builder.append(String.format(" %.3f", Math.sqrt(sum)));
+        builder.append(' ').append(new java.math.BigInteger("12345678901234567890").multiply(java.math.BigInteger.TEN));
+
+        PrintWriter writer = new PrintWriter(new BufferedWriter(new OutputStreamWriter(new ByteArrayOutputStream())));
+        writer.println(builder);
+        writer.printf("%d%n", map.get("n"));
+        writer.flush();
+        System.out.print("");
+    }
+}
@@ -0,0 +1,244 @@
+"""
+Zygote Python untuk container pool (dijalankan sebagai PID 1 container).
+
+Satu interpreter meng-import modul yang umum dipakai solusi dan compile
+main.py sekali, lalu setiap test case di-fork dari proses ini sehingga
+tidak ada startup interpreter / import site / compile ulang per test case.
+
+Protokol (dipakai run_python_code.sh, tanpa interpreter tambahan):
+    request  : "<path main.py>\\t<arg1>\\t<arg2>...\\n"  ditulis ke FIFO request
+    response : "<exit code> <max rss KB>\\n"             dibaca dari FIFO response
+stdin/stdout/stderr child diarahkan ke /code/input.txt, output.txt, error.txt.
+Exit code mengikuti shell: 124 timeout, 128 + nomor signal jika di-kill.
+
+Karena di-fork, semua child berbagi hash seed dengan zygote (hasil hash()
+str deterministik antar test case); state random di-seed ulang per child.
+
+Satu zygote melayani test case dari banyak submission, jadi child tidak boleh
+melihat state zygote: cache code object dikosongkan dan globals zygote dihapus
+sebelum kode user jalan, lalu child turun ke user ZYGOTE_USER. FIFO ada di
+directory milik root (dibuat di image, rootfs read-only) yang tidak bisa
+diakses child; jika directory tidak aman, zygote diganti `sleep infinity` dan
+runner script fallback ke python3 biasa.
+"""
+import linecache, os, pwd, resource, select, signal, stat, sys, time, types
+
+# Modul yang di-import sekali di zygote (ikut ter-fork ke setiap child)
+import array, bisect, collections, copy, decimal, fractions, functools, heapq
+import io, itertools, math, operator, random, re, statistics, string, threading
+import traceback, typing
+
+ZYGOTE_DIR = "/run/seka_zygote"
+REQUEST_FIFO = os.path.join(ZYGOTE_DIR, "request")
+RESPONSE_FIFO = os.path.join(ZYGOTE_DIR, "response")
+TIMEOUT_S = 10  # Sama dengan `timeout 10` di runner script
+CODE_CACHE_SIZE = 4  # Code object main.py yang disimpan (key = isi source)
+ZYGOTE_USER = os.environ.get("SEKA_ZYGOTE_USER", "runner")
+NOBODY_ID = 65534  # Dipakai jika ZYGOTE_USER tidak ada di image
+
+_code_cache = {}
+
+def compile_main(path):
+    with open(path, "rb") as f:
+        source = f.read()
+    code = _code_cache.get(source)
+    if code is None:
+        code = compile(source, path, "exec", dont_inherit=True)
+        if len(_code_cache) >= CODE_CACHE_SIZE:
+            _code_cache.pop(next(iter(_code_cache)))
+        _code_cache[source] = code
+    return code
+
+def run_child(path, args, code, compile_error, uid, gid):
+    """Dijalankan di proses hasil fork, tidak pernah return"""
+    # Semua yang dipakai setelah globals zygote dihapus harus berupa referensi lokal
+    _os, _sys, _traceback, _threading, _exit_status = os, sys, traceback, threading, exit_status
+    status = 1
+    try:
+        for fd, name, flags in (
+            (0, "/code/input.txt", os.O_RDONLY),
+            (1, "/code/output.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+            (2, "/code/error.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+        ):
+            target = os.open(name, flags, 0o666)
+            os.dup2(target, fd)
+            os.close(target)
+
+        # Sama dengan `ulimit -f` di runner script
+        limit_kb = os.environ.get("WORKSPACE_LIMIT_KB")
+        if limit_kb:
+            limit = int(limit_kb) * 1024
+            resource.setrlimit(resource.RLIMIT_FSIZE, (limit, limit))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+        random.seed()
+        sys.argv = [path, *args]
+        sys.path[0] = os.path.dirname(path)
+        module = types.ModuleType("__main__")
+        module.__file__ = path
+        module.__builtins__ = __builtins__
+        sys.modules["__main__"] = module
+        # Source dibaca selagi masih root supaya traceback tetap menampilkan baris kode
+        linecache.getlines(path)
+
+        scrub_zygote_state()
+        _os.setgroups([])
+        _os.setgid(gid)
+        _os.setuid(uid)
+
+        if compile_error is not None:
+            _traceback.print_exception(type(compile_error), compile_error, None)
+            return
+        try:
+            exec(code, module.__dict__)
+            status = 0
+        except SystemExit as e:
+            status = _exit_status(e, _sys.stderr)
+        except BaseException as e:
+            # Traceback tanpa frame zygote, sama seperti `python3 main.py`
+            _traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+            status = 1
+
+        for thread in _threading.enumerate():
+            if thread is not _threading.main_thread() and not thread.daemon:
+                thread.join()
+    finally:
+        try:
+            _sys.stdout.flush()
+        except Exception:
+            status = 120  # Sama dengan interpreter jika flush stdout gagal saat exit
+        try:
+            _sys.stderr.flush()
+        except Exception:
+            pass
+        _os._exit(status)
+
+def scrub_zygote_state():
+    """
+    Buang state zygote dari child sebelum kode user jalan: code object
+    submission lain di _code_cache, dan globals modul zygote (masih bisa
+    dicapai lewat frame run_child) supaya tidak ada yang tersisa selain
+    submission yang sedang dijalankan
+    """
+    _code_cache.clear()
+    globals().clear()
+
+def exit_status(e, stderr):
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code & 0xFF
+    print(e.code, file=stderr)
+    return 1
+
+def wait_child(pid):
+    """(exit code, max rss KB) child, di-kill jika melewati TIMEOUT_S"""
+    deadline = time.monotonic() + TIMEOUT_S
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        pidfd = None
+
+    while True:
+        waited, status, rusage = os.wait4(pid, os.WNOHANG)
+        if waited == pid:
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            os.kill(pid, signal.SIGKILL)
+            _, status, rusage = os.wait4(pid, 0)
+            if pidfd is not None:
+                os.close(pidfd)
+            return 124, rusage.ru_maxrss
+        if pidfd is not None:
+            select.select([pidfd], [], [], remaining)
+        else:
+            time.sleep(min(remaining, 0.001))
+
+    if pidfd is not None:
+        os.close(pidfd)
+    if os.WIFSIGNALED(status):
+        return 128 + os.WTERMSIG(status), rusage.ru_maxrss
+    return os.WEXITSTATUS(status), rusage.ru_maxrss
+
+def reap_orphans():
+    """Sebagai PID 1, zygote juga harus me-reap proses sisa job yang di-kill"""
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+def handle(request, uid, gid):
+    fields = request.rstrip("\n").split("\t")
+    path, args = fields[0], fields[1:]
+    code, compile_error = None, None
+    try:
+        code = compile_main(path)
+    except (SyntaxError, ValueError) as e:
+        # Error ditulis child ke error.txt, sama seperti interpreter biasa
+        compile_error = e
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        run_child(path, args, code, compile_error, uid, gid)
+    return wait_child(pid)
+
+def child_ids():
+    """(uid, gid) yang dipakai child setelah drop privilege"""
+    try:
+        user = pwd.getpwnam(ZYGOTE_USER)
+    except KeyError:
+        return NOBODY_ID, NOBODY_ID
+    return user.pw_uid, user.pw_gid
+
+def prepare_fifos():
+    """
+    Pastikan ZYGOTE_DIR dan FIFO milik root dan tidak bisa diakses user lain.
+    Biasanya sudah dibuat di image; dibuat di sini hanya jika rootfs writable.
+    """
+    if os.geteuid() != 0:
+        return False
+    try:
+        os.makedirs(ZYGOTE_DIR, mode=0o700, exist_ok=True)
+        for fifo in (REQUEST_FIFO, RESPONSE_FIFO):
+            if not os.path.lexists(fifo):
+                os.mkfifo(fifo, 0o600)
+    except OSError:
+        pass
+
+    for path, is_kind in ((ZYGOTE_DIR, stat.S_ISDIR), (REQUEST_FIFO, stat.S_ISFIFO), (RESPONSE_FIFO, stat.S_ISFIFO)):
+        try:
+            info = os.lstat(path)
+        except OSError:
+            return False
+        if not is_kind(info.st_mode) or info.st_uid != 0 or info.st_mode & 0o077:
+            return False
+    return True
+
+def main():
+    if not prepare_fifos():
+        print(f"seka_zygote: {ZYGOTE_DIR} tidak aman atau tidak ada, zygote dimatikan", file=sys.stderr)
+        os.execvp("sleep", ["sleep", "infinity"])
+    uid, gid = child_ids()
+
+    while True:
+        with open(REQUEST_FIFO) as f:
+            request = f.readline()
+        reap_orphans()
+        if not request.strip():
+            continue
+        try:
+            returncode, max_rss_kb = handle(request, uid, gid)
+        except Exception:
+            traceback.print_exc()
+            returncode, max_rss_kb = 1, 0
+        with open(RESPONSE_FIFO, "w") as f:
+            f.write(f"{returncode} {max_rss_kb}\n")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
-from typing import Union
+from typing import Optional, Union
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from .core.models import JudgeRequest
+from .core.models import JudgeRequest, ProblemRequest, BatchJudgeRequest, JudgeLane
 from .core.judge_engine import judge_code
 from .core.docker_executor_v2 import DockerExecutorV2, DockerExecutorRequest
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from .core.judge_engine_v2 import judge_code_v2
+from fastapi.responses import StreamingResponse, Response
+from .core.judge_engine_v2 import judge_code_v2, judge_batch_v2, has_cached_verdict_v2
+from .core.config import BATCH_MAX_SUBMISSIONS, JOB_QUEUE_BACKEND
+from .core.container_pool import container_pool
+from .core.docker_client import docker_engine
+from .core.job_queue import JobQueue
+from .core.durable_queue import DurableJobQueue
+from .core.artifact_cache import artifact_cache
+from .core.verdict_cache import verdict_cache
+from .core.submission_store import submission_store
+from .core.problem_store import problem_store
+from .core.checker import checker_registry
+from .core.admission import AdmissionRejected, Ticket, admission_controller, lane_for
+from .core import metrics
+from .core.log import get_logger, setup_logging, shutdown_logging, log_context
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import anyio
 
 import uuid
+import json
+import queue
+import threading
 import subprocess # untuk menjalankan perintah sistem
 
 origins = [
@@ -17,7 +38,31 @@ origins = [
     'http://localhost:3000'
 ]
 
-app = FastAPI()
+log = get_logger("api")
+
+# Antrian judging untuk submission async (in-memory atau durable SQLite)
+job_queue = DurableJobQueue(judge_code_v2) if JOB_QUEUE_BACKEND == "sqlite" else JobQueue(judge_code_v2)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    # Request yang menunggu slot admission memegang thread worker route sync;
+    # thread pool harus cukup besar supaya request di atas batas antrian
+    # tetap sampai ke admission control dan ditolak cepat
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(limiter.total_tokens, admission_controller.slots + admission_controller.max_queue + 16)
+    # Start warm container pool untuk runner image
+    container_pool.start()
+    submission_store.start()
+    job_queue.start()
+    yield
+    job_queue.shutdown()
+    submission_store.shutdown()
+    container_pool.shutdown()
+    docker_engine.close()
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,19 +87,253 @@ def judge(payload: JudgeRequest):
         result = judge_code(payload)
         return result
     except Exception as e:
-        print("Tipe error:", type(e).__name__)
-        print("Pesan:", e)
+        log.exception("/judge gagal")
         return {"error": str(e)}
         
+def _overloaded(e: AdmissionRejected) -> HTTPException:
+    # Antrian judge penuh: tolak cepat, client mencoba lagi setelah Retry-After
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after_s)})
+
+def _reserve(payload: JudgeRequest) -> Optional[Ticket]:
+    """
+    Reservasi slot admission, None jika hasil sudah ada di verdict cache
+    (request tidak butuh slot, jadi tidak ditolak walau antrian penuh)
+    """
+    if has_cached_verdict_v2(payload):
+        return None
+    try:
+        return admission_controller.reserve(lane_for(payload))
+    except AdmissionRejected as e:
+        raise _overloaded(e)
+
+def _release(ticket: Optional[Ticket]):
+    """
+    Lepas reservasi jika engine belum sempat melepasnya (error sebelum
+    judging mulai); Ticket.release() idempotent
+    """
+    if ticket is not None:
+        ticket.release()
+
 @app.post("/v2/judge")
 def judge_v2(payload: JudgeRequest):
+    """Judge sinkron; hasil juga bisa diambil lagi lewat GET /v2/submissions/{submission_id}"""
+    # ID yang sama dipakai submission store (lihat JudgeEngineV2.execute)
+    submission_id = str(uuid.uuid4())
+    ticket = _reserve(payload)
     try:
-        result = judge_code_v2(payload)
-        return result 
+        with log_context(submission_id=submission_id):
+            result = judge_code_v2(payload, ticket=ticket)
+        return {"submission_id": submission_id, **result.to_dict()}
     except Exception as e:
-        print("Tipe error:", type(e).__name__)
-        print("Pesan:", e)
+        log.exception("/v2/judge gagal")
         return {"error": str(e)}
+    finally:
+        _release(ticket)
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/v2/judge/stream")
+def judge_v2_stream(payload: JudgeRequest):
+    """
+    Sama seperti /v2/judge, tetapi hasil dikirim sebagai Server-Sent Events:
+    - event "test"   : TestCaseResult.to_dict() begitu satu test case selesai
+    - event "result" : submission_id dan ringkasan akhir JudgeResult (tanpa test_results)
+    - event "error"  : jika terjadi error sistem
+    """
+    submission_id = str(uuid.uuid4())
+    events = queue.Queue()
+    ticket = _reserve(payload)
+
+    def run_judge():
+        try:
+            with log_context(submission_id=submission_id):
+                result = judge_code_v2(
+                    payload,
+                    on_test_result=lambda test_result: events.put(("test", test_result.to_dict())),
+                    ticket=ticket
+                )
+            summary = {"submission_id": submission_id, **result.to_dict()}
+            summary.pop("test_results")
+            events.put(("result", summary))
+        except Exception as e:
+            log.exception("/v2/judge/stream gagal")
+            events.put(("error", {"error": str(e)}))
+        finally:
+            _release(ticket)
+            events.put(None)
+
+    try:
+        threading.Thread(target=run_judge, daemon=True).start()
+    except BaseException:
+        _release(ticket)
+        raise
+
+    def stream():
+        while True:
+            item = events.get()
+            if item is None:
+                break
+            yield _sse_event(*item)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/v2/judge/batch")
+def judge_v2_batch(payload: BatchJudgeRequest):
+    """
+    Judge banyak submission dengan satu test set, hasil dikirim sebagai
+    Server-Sent Events begitu setiap submission selesai:
+    - event "submission" : {"submission_id": ..., **JudgeResult.to_dict()}
+    - event "done"       : ringkasan batch (jumlah per verdict, waktu total)
+    - event "error"      : jika terjadi error sistem
+    """
+    if len(payload.submissions) > BATCH_MAX_SUBMISSIONS:
+        raise HTTPException(status_code=413, detail=f"Too many submissions (max {BATCH_MAX_SUBMISSIONS})")
+    if payload.problem_id:
+        _get_problem_or_404(payload.problem_id)
+    try:
+        admission_controller.check(JudgeLane.BATCH)
+    except AdmissionRejected as e:
+        raise _overloaded(e)
+
+    events = queue.Queue()
+
+    def run_batch():
+        try:
+            summary = judge_batch_v2(
+                payload,
+                on_submission_result=lambda submission_id, result: events.put(
+                    ("submission", {"submission_id": submission_id, **result.to_dict()})
+                )
+            )
+            events.put(("done", summary))
+        except Exception as e:
+            log.exception("/v2/judge/batch gagal")
+            events.put(("error", {"error": str(e)}))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run_batch, daemon=True).start()
+
+    def stream():
+        while True:
+            item = events.get()
+            if item is None:
+                break
+            yield _sse_event(*item)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/v2/submissions", status_code=202)
+def submit_v2(payload: JudgeRequest):
+    """Masukkan submission ke antrian, hasil diambil lewat GET /v2/submissions/{id}"""
+    try:
+        submission = job_queue.submit(payload)
+    except AdmissionRejected as e:
+        raise _overloaded(e)
+    return {"submission_id": submission.id, "status": submission.status}
+
+@app.get("/v2/submissions")
+def list_submissions_v2(
+    user_id: Optional[str] = None,
+    problem_id: Optional[str] = None,
+    verdict: Optional[str] = None,
+    language: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[int] = None,
+    limit: int = 50
+):
+    """
+    Riwayat submission dari submission store, terbaru dulu. Halaman
+    berikutnya diambil dengan cursor=next_cursor dari response sebelumnya.
+    """
+    return submission_store.query(
+        user_id=user_id,
+        problem_id=problem_id,
+        verdict=verdict,
+        language=language,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        cursor=cursor,
+        limit=limit
+    )
+
+@app.get("/v2/submissions/{submission_id}")
+def get_submission_v2(submission_id: str):
+    submission = job_queue.get(submission_id)
+    if submission is not None:
+        return submission.to_dict()
+    # Submission lama (atau sync/batch) dari riwayat permanen
+    stored = submission_store.get(submission_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    return stored
+
+@app.post("/v2/problems", status_code=201)
+def put_problem(payload: ProblemRequest):
+    """Upload (atau ganti) test data problem, submission cukup mengirim problem_id"""
+    try:
+        # Compile checker dulu supaya checker yang error ditolak saat upload
+        if payload.checker:
+            checker_registry.release(checker_registry.prepare(payload.checker.language, payload.checker.code))
+        problem = problem_store.put(payload.problem_id, payload.test_cases, payload.checker)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return problem.to_dict()
+
+@app.get("/v2/problems/{problem_id}")
+def get_problem(problem_id: str):
+    problem = _get_problem_or_404(problem_id)
+    return problem.to_dict()
+
+@app.delete("/v2/problems/{problem_id}")
+def delete_problem(problem_id: str):
+    _get_problem_or_404(problem_id)
+    problem_store.delete(problem_id)
+    return {"problem_id": problem_id, "deleted": True}
+
+def _get_problem_or_404(problem_id: str):
+    try:
+        problem = problem_store.get(problem_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if problem is None:
+        raise HTTPException(status_code=404, detail="Problem not found")
+    return problem
+
+@app.get("/v2/queue/stats")
+def queue_stats():
+    return job_queue.get_stats()
+
+@app.get("/v2/admission/stats")
+def admission_stats():
+    return admission_controller.get_stats()
+
+@app.get("/v2/pool/stats")
+def pool_stats():
+    return container_pool.get_stats()
+
+@app.get("/v2/artifact-cache/stats")
+def artifact_cache_stats():
+    return artifact_cache.get_stats()
+
+@app.get("/v2/verdict-cache/stats")
+def verdict_cache_stats():
+    return verdict_cache.get_stats()
+
+@app.get("/metrics")
+def metrics_endpoint():
+    # Format text exposition Prometheus, untuk di-scrape
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.get("/health")
 def health_check():
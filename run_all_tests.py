@@ -2,11 +2,22 @@
 """
 Automated Test Runner untuk Judge API
 Menjalankan semua test cases yang ada di test.md
+
+Mode load test (--load) mengirim campuran test case di bawah secara
+concurrent dan menulis laporan JSON (throughput, latency, kebenaran verdict):
+    python run_all_tests.py --load --concurrency 50 --duration 60
+    python run_all_tests.py --load --rate 20 --requests 500 --mix AC=4,WA=2,TLE=1,RTE=2,CE=1
 """
 
 import requests
+import argparse
 import json
+import math
+import random
+import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 
@@ -23,7 +34,8 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 # Base URL
-BASE_URL = "http://localhost:8000/v2/judge"
+SERVER_URL = "http://localhost:8000"
+BASE_URL = f"{SERVER_URL}/v2/judge"
 
 # Test statistics
 stats = {
@@ -151,33 +163,12 @@ def run_test(name: str, payload: Dict, expected_verdict: str, should_skip: bool
         stats["errors"] += 1
         return False
 
-def main():
-    """Main test runner"""
-    print_header("🚀 Starting Judge API Test Suite")
-    print_info(f"Target: {BASE_URL}")
-    print_info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    
-    # Check if server is running
-    try:
-        health_response = requests.get("http://localhost:8000/health", timeout=5)
-        if health_response.status_code == 200:
-            print_success("Server is running!")
-        else:
-            print_warning("Server health check returned non-200 status")
-    except:
-        print_failure("Cannot connect to server!")
-        print_warning("Please start the server first: uvicorn main:app --reload")
-        return
-    
-    # ========================================================================
-    # PYTHON TESTS
-    # ========================================================================
-    print_header("1. PYTHON TESTS")
-    
+TEST_SUITE = [
     # Test 1.1: Python - All Accepted
-    run_test(
-        "Python - All Accepted (AC)",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - All Accepted (AC)",
+        "payload": {
             "code": "a, b = map(int, input().split())\nprint(a + b)",
             "language": "python",
             "test_cases": [
@@ -188,13 +179,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 1.2: Python - Wrong Answer
-    run_test(
-        "Python - Wrong Answer (WA)",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - Wrong Answer (WA)",
+        "payload": {
             "code": "a, b = map(int, input().split())\nprint(a * b)",
             "language": "python",
             "test_cases": [
@@ -205,13 +196,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "WA"
-    )
-    
+        "expected": "WA"
+    },
     # Test 1.3: Python - Time Limit Exceeded (SKIP - takes too long)
-    run_test(
-        "Python - Time Limit Exceeded (TLE)",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - Time Limit Exceeded (TLE)",
+        "payload": {
             "code": "while True:\n    pass",
             "language": "python",
             "test_cases": [
@@ -220,14 +211,14 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "TLE",
-        should_skip=True  # Skip TLE tests to save time
-    )
-    
+        "expected": "TLE",
+        "skip": True  # Skip TLE tests to save time
+    },
     # Test 1.4: Python - Runtime Error (Division by Zero)
-    run_test(
-        "Python - Runtime Error - Division by Zero",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - Runtime Error - Division by Zero",
+        "payload": {
             "code": "print(1 / 0)",
             "language": "python",
             "test_cases": [
@@ -236,13 +227,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 1.5: Python - Runtime Error (Index Out of Range)
-    run_test(
-        "Python - Runtime Error - Index Out of Range",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - Runtime Error - Index Out of Range",
+        "payload": {
             "code": "arr = [1, 2, 3]\nprint(arr[10])",
             "language": "python",
             "test_cases": [
@@ -251,13 +242,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 1.6: Python - Syntax Error
-    run_test(
-        "Python - Syntax Error (becomes RE)",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - Syntax Error (becomes RE)",
+        "payload": {
             "code": "print('Hello World'",
             "language": "python",
             "test_cases": [
@@ -266,13 +257,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 1.7: Python - Partial Accepted
-    run_test(
-        "Python - Partial Accepted",
-        {
+    {
+        "section": "1. PYTHON TESTS",
+        "name": "Python - Partial Accepted",
+        "payload": {
             "code": "a, b = map(int, input().split())\nif a == 2:\n    print(a + b)\nelse:\n    print(a * b)",
             "language": "python",
             "test_cases": [
@@ -283,18 +274,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "WA"  # Because only 1 out of 3 passes
-    )
-    
-    # ========================================================================
-    # C TESTS
-    # ========================================================================
-    print_header("2. C TESTS")
-    
+        "expected": "WA"  # Because only 1 out of 3 passes
+    },
     # Test 2.1: C - All Accepted
-    run_test(
-        "C - All Accepted (AC)",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - All Accepted (AC)",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    int a, b;\n    scanf(\"%d %d\", &a, &b);\n    printf(\"%d\\n\", a + b);\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -305,13 +291,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 2.2: C - Wrong Answer
-    run_test(
-        "C - Wrong Answer (WA)",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - Wrong Answer (WA)",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    int a, b;\n    scanf(\"%d %d\", &a, &b);\n    printf(\"%d\\n\", a * b);\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -322,13 +308,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "WA"
-    )
-    
+        "expected": "WA"
+    },
     # Test 2.3: C - TLE (SKIP)
-    run_test(
-        "C - Time Limit Exceeded (TLE)",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - Time Limit Exceeded (TLE)",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    while(1) {}\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -337,14 +323,14 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "TLE",
-        should_skip=True
-    )
-    
+        "expected": "TLE",
+        "skip": True
+    },
     # Test 2.4: C - Runtime Error (Division by Zero)
-    run_test(
-        "C - Runtime Error - Division by Zero",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - Runtime Error - Division by Zero",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    int x = 5 / 0;\n    printf(\"%d\\n\", x);\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -353,13 +339,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 2.5: C - Runtime Error (Segmentation Fault)
-    run_test(
-        "C - Runtime Error - Segmentation Fault",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - Runtime Error - Segmentation Fault",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    int *ptr = NULL;\n    printf(\"%d\\n\", *ptr);\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -368,13 +354,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 2.6: C - Compilation Error
-    run_test(
-        "C - Compilation Error (CE)",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - Compilation Error (CE)",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    printf(\"Hello World\"\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -383,13 +369,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "CE"
-    )
-    
+        "expected": "CE"
+    },
     # Test 2.7: C - Compilation Error (Undefined Function)
-    run_test(
-        "C - Compilation Error - Undefined Function",
-        {
+    {
+        "section": "2. C TESTS",
+        "name": "C - Compilation Error - Undefined Function",
+        "payload": {
             "code": "#include <stdio.h>\nint main() {\n    undefinedFunction();\n    return 0;\n}",
             "language": "c",
             "test_cases": [
@@ -398,18 +384,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "CE"
-    )
-    
-    # ========================================================================
-    # C++ TESTS
-    # ========================================================================
-    print_header("3. C++ TESTS")
-    
+        "expected": "CE"
+    },
     # Test 3.1: C++ - All Accepted
-    run_test(
-        "C++ - All Accepted (AC)",
-        {
+    {
+        "section": "3. C++ TESTS",
+        "name": "C++ - All Accepted (AC)",
+        "payload": {
             "code": "#include <iostream>\nusing namespace std;\nint main() {\n    int a, b;\n    cin >> a >> b;\n    cout << a + b << endl;\n    return 0;\n}",
             "language": "cpp",
             "test_cases": [
@@ -420,13 +401,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 3.2: C++ - Wrong Answer
-    run_test(
-        "C++ - Wrong Answer (WA)",
-        {
+    {
+        "section": "3. C++ TESTS",
+        "name": "C++ - Wrong Answer (WA)",
+        "payload": {
             "code": "#include <iostream>\nusing namespace std;\nint main() {\n    int a, b;\n    cin >> a >> b;\n    cout << a - b << endl;\n    return 0;\n}",
             "language": "cpp",
             "test_cases": [
@@ -436,13 +417,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "WA"
-    )
-    
+        "expected": "WA"
+    },
     # Test 3.3: C++ - TLE (SKIP)
-    run_test(
-        "C++ - Time Limit Exceeded (TLE)",
-        {
+    {
+        "section": "3. C++ TESTS",
+        "name": "C++ - Time Limit Exceeded (TLE)",
+        "payload": {
             "code": "#include <iostream>\nusing namespace std;\nint main() {\n    while(true) {}\n    return 0;\n}",
             "language": "cpp",
             "test_cases": [
@@ -451,14 +432,14 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "TLE",
-        should_skip=True
-    )
-    
+        "expected": "TLE",
+        "skip": True
+    },
     # Test 3.4: C++ - Runtime Error (Exception)
-    run_test(
-        "C++ - Runtime Error - Exception",
-        {
+    {
+        "section": "3. C++ TESTS",
+        "name": "C++ - Runtime Error - Exception",
+        "payload": {
             "code": "#include <iostream>\n#include <stdexcept>\nusing namespace std;\nint main() {\n    throw runtime_error(\"Error!\");\n    return 0;\n}",
             "language": "cpp",
             "test_cases": [
@@ -467,13 +448,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 3.5: C++ - Compilation Error
-    run_test(
-        "C++ - Compilation Error (CE)",
-        {
+    {
+        "section": "3. C++ TESTS",
+        "name": "C++ - Compilation Error (CE)",
+        "payload": {
             "code": "#include <iostream>\nusing namespace std;\nint main() {\n    cout << \"Hello\" << end;\n    return 0;\n}",
             "language": "cpp",
             "test_cases": [
@@ -482,13 +463,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "CE"
-    )
-    
+        "expected": "CE"
+    },
     # Test 3.6: C++ - Compilation Error (Missing Semicolon)
-    run_test(
-        "C++ - Compilation Error - Missing Semicolon",
-        {
+    {
+        "section": "3. C++ TESTS",
+        "name": "C++ - Compilation Error - Missing Semicolon",
+        "payload": {
             "code": "#include <iostream>\nusing namespace std;\nint main() {\n    int x = 5\n    cout << x << endl;\n    return 0;\n}",
             "language": "cpp",
             "test_cases": [
@@ -497,18 +478,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "CE"
-    )
-    
-    # ========================================================================
-    # JAVA TESTS
-    # ========================================================================
-    print_header("4. JAVA TESTS")
-    
+        "expected": "CE"
+    },
     # Test 4.1: Java - All Accepted
-    run_test(
-        "Java - All Accepted (AC)",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - All Accepted (AC)",
+        "payload": {
             "code": "import java.util.Scanner;\npublic class Main {\n    public static void main(String[] args) {\n        Scanner sc = new Scanner(System.in);\n        int a = sc.nextInt();\n        int b = sc.nextInt();\n        System.out.println(a + b);\n        sc.close();\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -519,13 +495,13 @@ def main():
             "time_limit_ms": 2000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 4.2: Java - Wrong Answer
-    run_test(
-        "Java - Wrong Answer (WA)",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - Wrong Answer (WA)",
+        "payload": {
             "code": "import java.util.Scanner;\npublic class Main {\n    public static void main(String[] args) {\n        Scanner sc = new Scanner(System.in);\n        int a = sc.nextInt();\n        int b = sc.nextInt();\n        System.out.println(a * b);\n        sc.close();\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -536,13 +512,13 @@ def main():
             "time_limit_ms": 2000,
             "memory_limit_kb": 262144
         },
-        "WA"
-    )
-    
+        "expected": "WA"
+    },
     # Test 4.3: Java - TLE (SKIP)
-    run_test(
-        "Java - Time Limit Exceeded (TLE)",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - Time Limit Exceeded (TLE)",
+        "payload": {
             "code": "public class Main {\n    public static void main(String[] args) {\n        while(true) {}\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -551,14 +527,14 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "TLE",
-        should_skip=True
-    )
-    
+        "expected": "TLE",
+        "skip": True
+    },
     # Test 4.4: Java - Runtime Error (Division by Zero)
-    run_test(
-        "Java - Runtime Error - Division by Zero",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - Runtime Error - Division by Zero",
+        "payload": {
             "code": "public class Main {\n    public static void main(String[] args) {\n        int x = 5 / 0;\n        System.out.println(x);\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -567,13 +543,13 @@ def main():
             "time_limit_ms": 2000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 4.5: Java - Runtime Error (NullPointerException)
-    run_test(
-        "Java - Runtime Error - NullPointerException",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - Runtime Error - NullPointerException",
+        "payload": {
             "code": "public class Main {\n    public static void main(String[] args) {\n        String str = null;\n        System.out.println(str.length());\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -582,13 +558,13 @@ def main():
             "time_limit_ms": 2000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 4.6: Java - Runtime Error (ArrayIndexOutOfBoundsException)
-    run_test(
-        "Java - Runtime Error - ArrayIndexOutOfBoundsException",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - Runtime Error - ArrayIndexOutOfBoundsException",
+        "payload": {
             "code": "public class Main {\n    public static void main(String[] args) {\n        int[] arr = {1, 2, 3};\n        System.out.println(arr[10]);\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -597,13 +573,13 @@ def main():
             "time_limit_ms": 2000,
             "memory_limit_kb": 262144
         },
-        "RTE"
-    )
-    
+        "expected": "RTE"
+    },
     # Test 4.7: Java - Compilation Error
-    run_test(
-        "Java - Compilation Error (CE)",
-        {
+    {
+        "section": "4. JAVA TESTS",
+        "name": "Java - Compilation Error (CE)",
+        "payload": {
             "code": "public class Main {\n    public static void main(String[] args) {\n        System.out.println(\"Hello\")\n    }\n}",
             "language": "java",
             "test_cases": [
@@ -612,18 +588,13 @@ def main():
             "time_limit_ms": 2000,
             "memory_limit_kb": 262144
         },
-        "CE"
-    )
-    
-    # ========================================================================
-    # EDGE CASES
-    # ========================================================================
-    print_header("5. EDGE CASES")
-    
+        "expected": "CE"
+    },
     # Test 5.1: Empty Input
-    run_test(
-        "Empty Input",
-        {
+    {
+        "section": "5. EDGE CASES",
+        "name": "Empty Input",
+        "payload": {
             "code": "print('Hello World')",
             "language": "python",
             "test_cases": [
@@ -632,13 +603,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 5.2: Empty Output
-    run_test(
-        "Empty Output",
-        {
+    {
+        "section": "5. EDGE CASES",
+        "name": "Empty Output",
+        "payload": {
             "code": "input()",
             "language": "python",
             "test_cases": [
@@ -647,13 +618,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 5.3: Multiple Lines Output
-    run_test(
-        "Multiple Lines Output",
-        {
+    {
+        "section": "5. EDGE CASES",
+        "name": "Multiple Lines Output",
+        "payload": {
             "code": "n = int(input())\nfor i in range(1, n+1):\n    print(i)",
             "language": "python",
             "test_cases": [
@@ -663,13 +634,13 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
-    
+        "expected": "AC"
+    },
     # Test 5.4: Output Format with Extra Spaces
-    run_test(
-        "Output Format - Extra Spaces",
-        {
+    {
+        "section": "5. EDGE CASES",
+        "name": "Output Format - Extra Spaces",
+        "payload": {
             "code": "a, b = map(int, input().split())\nprint(a + b, ' ')",
             "language": "python",
             "test_cases": [
@@ -679,8 +650,39 @@ def main():
             "time_limit_ms": 1000,
             "memory_limit_kb": 262144
         },
-        "AC"
-    )
+        "expected": "AC"
+    },
+]
+
+def check_server(server_url: str = SERVER_URL) -> bool:
+    """Cek /health sebelum mulai mengirim test"""
+    try:
+        health_response = requests.get(f"{server_url}/health", timeout=5)
+        if health_response.status_code == 200:
+            print_success("Server is running!")
+        else:
+            print_warning("Server health check returned non-200 status")
+        return True
+    except requests.exceptions.RequestException:
+        print_failure("Cannot connect to server!")
+        print_warning("Please start the server first: uvicorn main:app --reload")
+        return False
+
+def run_suite():
+    """Jalankan TEST_SUITE satu per satu dan cek verdict"""
+    print_header("🚀 Starting Judge API Test Suite")
+    print_info(f"Target: {BASE_URL}")
+    print_info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    if not check_server():
+        return
+    
+    section = None
+    for test in TEST_SUITE:
+        if test["section"] != section:
+            section = test["section"]
+            print_header(section)
+        run_test(test["name"], test["payload"], test["expected"], test.get("skip", False))
     
     # ========================================================================
     # PRINT SUMMARY
@@ -713,5 +715,308 @@ def main():
         print(f"\n{Colors.OKGREEN}All tests passed! 🎉{Colors.ENDC}")
         exit(0)
 
+# ============================================================================
+# LOAD TEST
+# ============================================================================
+
+# Alias verdict di argumen --mix
+VERDICT_ALIASES = {"RE": "RTE"}
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse --mix: "AC=4,WA=2,RE=1" -> {"AC": 4.0, "WA": 2.0, "RTE": 1.0}"""
+    weights = {}
+    for item in mix.split(","):
+        verdict, _, weight = item.strip().partition("=")
+        verdict = verdict.strip().upper()
+        weights[VERDICT_ALIASES.get(verdict, verdict)] = float(weight or 1)
+    return weights
+
+def build_workload(languages: Optional[List[str]], mix: Dict[str, float]) -> List[tuple]:
+    """
+    (test, bobot) untuk setiap test case TEST_SUITE yang cocok dengan
+    bahasa dan verdict di mix. Bobot satu verdict dibagi rata ke semua test
+    case dengan verdict itu, jadi proporsi verdict mengikuti --mix.
+    """
+    candidates = [
+        test for test in TEST_SUITE
+        if test["expected"] in mix and (not languages or test["payload"]["language"] in languages)
+    ]
+    per_verdict = {}
+    for test in candidates:
+        per_verdict[test["expected"]] = per_verdict.get(test["expected"], 0) + 1
+    return [(test, mix[test["expected"]] / per_verdict[test["expected"]]) for test in candidates]
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile dari list yang sudah di-sort"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+def latency_summary(latencies: List[float]) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 2) if values else None,
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "max_ms": round(values[-1], 2) if values else None
+    }
+
+class LoadTest:
+    """
+    Kirim request ke /v2/judge secara concurrent.
+    - concurrency (closed loop): N worker, masing-masing langsung kirim
+      request berikutnya begitu respons diterima
+    - rate (open loop): request dijadwalkan setiap 1/rate detik tanpa
+      menunggu respons; latency dihitung dari waktu terjadwal, sehingga
+      antrian di sisi client ikut terukur saat server tidak sanggup
+    Berhenti setelah max_requests request atau duration detik.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        workload: List[tuple],
+        concurrency: int,
+        rate: Optional[float],
+        duration: Optional[float],
+        max_requests: Optional[int],
+        request_timeout: float,
+        seed: Optional[int]
+    ):
+        self.url = f"{server_url}/v2/judge"
+        self.tests = [test for test, _ in workload]
+        self.weights = [weight for _, weight in workload]
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.max_requests = max_requests
+        self.request_timeout = request_timeout
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._local = threading.local()
+        self.samples = []
+
+    def run(self) -> float:
+        """Jalankan load test, return durasi (detik)"""
+        self._deadline = time.perf_counter() + self.duration if self.duration else None
+        start = time.perf_counter()
+        if self.rate:
+            self._run_open_loop()
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for _ in range(self.concurrency):
+                    pool.submit(self._closed_loop_worker)
+        return time.perf_counter() - start
+
+    def _next_test(self) -> Optional[dict]:
+        """Test berikutnya, None jika batas request / durasi tercapai"""
+        with self._lock:
+            if self.max_requests is not None and self._sent >= self.max_requests:
+                return None
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                return None
+            self._sent += 1
+            return self._random.choices(self.tests, self.weights)[0]
+
+    def _closed_loop_worker(self):
+        while True:
+            test = self._next_test()
+            if test is None:
+                return
+            self._send(test, time.perf_counter())
+
+    def _run_open_loop(self):
+        interval = 1.0 / self.rate
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            scheduled = time.perf_counter()
+            while True:
+                test = self._next_test()
+                if test is None:
+                    break
+                pool.submit(self._send, test, scheduled)
+                scheduled += interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, test: dict, scheduled: float):
+        sample = {
+            "name": test["name"],
+            "language": test["payload"]["language"],
+            "expected": test["expected"],
+            "verdict": None,
+            "status_code": None,
+            "error": None
+        }
+        try:
+            response = self._session().post(self.url, json=test["payload"], timeout=self.request_timeout)
+            sample["status_code"] = response.status_code
+            if response.status_code == 200:
+                result = response.json()
+                if "error" in result:
+                    sample["error"] = result["error"]
+                else:
+                    sample["verdict"] = result.get("verdict")
+            else:
+                sample["error"] = f"HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            sample["error"] = type(e).__name__
+        sample["latency_ms"] = (time.perf_counter() - scheduled) * 1000
+        with self._lock:
+            self.samples.append(sample)
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def build_report(load_test: LoadTest, elapsed_s: float, config: dict) -> dict:
+    samples = load_test.samples
+    completed = [s for s in samples if s["verdict"] is not None]
+    correct = [s for s in completed if s["verdict"] == s["expected"]]
+
+    def group(key: str) -> dict:
+        groups = {}
+        for sample in samples:
+            groups.setdefault(sample[key], []).append(sample)
+        return {
+            name: {
+                **latency_summary([s["latency_ms"] for s in items]),
+                "correct": sum(1 for s in items if s["verdict"] == s["expected"]),
+                "errors": sum(1 for s in items if s["verdict"] is None)
+            }
+            for name, items in sorted(groups.items())
+        }
+
+    mismatches = {}
+    for sample in completed:
+        if sample["verdict"] != sample["expected"]:
+            key = f'{sample["name"]}: expected {sample["expected"]}, got {sample["verdict"]}'
+            mismatches[key] = mismatches.get(key, 0) + 1
+
+    status_codes = {}
+    errors = {}
+    for sample in samples:
+        status = str(sample["status_code"])
+        status_codes[status] = status_codes.get(status, 0) + 1
+        if sample["error"]:
+            errors[sample["error"]] = errors.get(sample["error"], 0) + 1
+
+    return {
+        "started_at": config.pop("started_at"),
+        "git_revision": git_revision(),
+        "config": config,
+        "elapsed_s": round(elapsed_s, 3),
+        "requests": len(samples),
+        "completed": len(completed),
+        "throughput_rps": round(len(completed) / elapsed_s, 3) if elapsed_s > 0 else None,
+        "latency": latency_summary([s["latency_ms"] for s in completed]),
+        "correctness": {
+            "correct": len(correct),
+            "incorrect": len(completed) - len(correct),
+            "rate": round(len(correct) / len(completed), 4) if completed else None,
+            "mismatches": mismatches
+        },
+        "status_codes": status_codes,
+        "errors": errors,
+        "by_language": group("language"),
+        "by_expected_verdict": group("expected")
+    }
+
+def run_load_test(args: argparse.Namespace) -> int:
+    languages = [language.strip() for language in args.languages.split(",")] if args.languages else None
+    mix = parse_mix(args.mix)
+    workload = build_workload(languages, mix)
+    if not workload:
+        print_failure("Tidak ada test case yang cocok dengan --languages / --mix")
+        return 2
+    if args.requests is None and args.duration is None:
+        args.duration = 30.0
+
+    print_header("🔥 Judge API Load Test")
+    print_info(f"Target: {args.url}/v2/judge")
+    mode = f"open loop {args.rate} req/s (max {args.concurrency} in flight)" if args.rate else f"closed loop, concurrency {args.concurrency}"
+    limit = f"{args.requests} requests" if args.requests is not None else f"{args.duration}s"
+    print_info(f"Mode: {mode} | Stop after: {limit}")
+    print_info(f"Workload: {len(workload)} test cases, mix {mix}")
+    if not check_server(args.url):
+        return 2
+
+    config = {
+        "started_at": datetime.now().isoformat(),
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "duration_s": args.duration,
+        "max_requests": args.requests,
+        "languages": languages,
+        "mix": mix,
+        "seed": args.seed
+    }
+    load_test = LoadTest(
+        args.url,
+        workload,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        max_requests=args.requests,
+        request_timeout=args.timeout,
+        seed=args.seed
+    )
+    elapsed = load_test.run()
+    report = build_report(load_test, elapsed, config)
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print_header("📊 LOAD TEST SUMMARY")
+    latency = report["latency"]
+    correctness = report["correctness"]
+    print(f"Requests:      {report['requests']} ({report['completed']} completed) in {report['elapsed_s']}s")
+    print(f"Throughput:    {report['throughput_rps']} req/s")
+    print(f"Latency:       p50 {latency['p50_ms']}ms | p95 {latency['p95_ms']}ms | p99 {latency['p99_ms']}ms | max {latency['max_ms']}ms")
+    print(f"Correct:       {correctness['correct']}/{report['completed']}")
+    for mismatch, count in correctness["mismatches"].items():
+        print_failure(f"{count}x {mismatch}")
+    for error, count in report["errors"].items():
+        print_warning(f"{count}x {error}")
+    print_info(f"Report: {args.report}")
+
+    return 0 if correctness["incorrect"] == 0 and not report["errors"] else 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Test runner dan load tester untuk Judge API")
+    parser.add_argument("--load", action="store_true", help="Mode load test (concurrent) alih-alih test suite sequential")
+    parser.add_argument("--url", default=SERVER_URL, help="URL server judge")
+    parser.add_argument("--concurrency", type=int, default=10, help="Jumlah request bersamaan (maksimal in flight pada mode --rate)")
+    parser.add_argument("--rate", type=float, help="Target request per detik (open loop); tanpa ini closed loop sesuai --concurrency")
+    parser.add_argument("--duration", type=float, help="Lama load test (detik), default 30 jika --requests tidak diisi")
+    parser.add_argument("--requests", type=int, help="Jumlah request total")
+    parser.add_argument("--languages", help="Bahasa yang dipakai, misal python,cpp (default semua)")
+    parser.add_argument("--mix", default="AC=4,WA=2,TLE=1,RTE=2,CE=1", help="Bobot verdict yang diharapkan, misal AC=4,WA=2,TLE=1,RE=2,CE=1")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout per request (detik)")
+    parser.add_argument("--seed", type=int, help="Seed pemilihan test case (supaya urutan bisa diulang)")
+    parser.add_argument("--report", default="load_report.json", help="File laporan JSON")
+    args = parser.parse_args()
+
+    if args.load:
+        exit(run_load_test(args))
+    run_suite()
+
 if __name__ == "__main__":
     main()
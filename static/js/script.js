@@ -173,7 +173,8 @@ async function sendCodeToJudge(){
   const payload = {
     code: code,
     language: language,
-    test_cases: testCases
+    test_cases: testCases,
+    lane: "interactive"
   }
 
   let loadingInterval;
@@ -193,7 +194,7 @@ async function sendCodeToJudge(){
     // Tampilkan loading state
     loadingInterval = showLoadingState();
 
-    const response = await fetch("/v2/judge", {
+    const response = await fetch("/v2/judge/stream", {
       method: "POST",
       headers: {
         "Content-Type": "application/json"
@@ -206,16 +207,18 @@ async function sendCodeToJudge(){
       throw new Error(errorData.detail || errorData.error || `HTTP ${response.status}: ${response.statusText}`);
     }
 
-    const result = await response.json();
-    console.log(result);
-
     // Clear loading interval
     if (loadingInterval) {
       clearInterval(loadingInterval);
     }
 
-    // Display hasil
-    displayResults(result);
+    // Hasil test case ditampilkan satu per satu begitu selesai
+    showResultSkeleton(testCases.length);
+    await readJudgeStream(response, {
+      test: displayTestResult,
+      result: displaySummary,
+      error: (data) => { throw new Error(data.error); }
+    });
     
   }catch(error){
     console.error("Error sending code to judge:", error);
@@ -242,49 +245,111 @@ async function sendCodeToJudge(){
 
   runButton.addEventListener("click", sendCodeToJudge);
 
-  // Fungsi untuk menampilkan hasil dengan format yang lebih baik
-function displayResults(result) {
-  if (result.status === "compile_error") {
-    resultContainer.innerHTML = `
-      <div class="text-red-600 p-4 border border-red-300 rounded bg-red-50">
-        <h3 class="font-bold">Compile Error</h3>
-        <pre class="mt-2 text-sm whitespace-pre-wrap">${result.error_message || 'Compilation failed'}</pre>
-      </div>
-    `;
-    return;
+  // Membaca response Server-Sent Events dari /v2/judge/stream
+async function readJudgeStream(response, handlers) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // setiap event dipisahkan oleh baris kosong
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let eventName = "message";
+      let data = "";
+      rawEvent.split("\n").forEach(line => {
+        if (line.startsWith("event:")) eventName = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      });
+
+      if (handlers[eventName] && data) {
+        handlers[eventName](JSON.parse(data));
+      }
+    }
+  }
+}
+
+function escapeHtml(text) {
+  const div = document.createElement("div");
+  div.textContent = text ?? "";
+  return div.innerHTML;
+}
+
+let completedTestCount = 0;
+
+// Kerangka hasil sebelum test case pertama selesai
+function showResultSkeleton(totalCases) {
+  completedTestCount = 0;
+  resultContainer.innerHTML = `
+    <div id="results-summary" class="results-summary p-4 border rounded mb-4 bg-blue-50 border-blue-200">
+      <h3 class="font-bold text-lg text-blue-700">Judging...</h3>
+      <p>Completed: <span id="results-progress" class="font-semibold">0</span>/${totalCases}</p>
+    </div>
+    <div id="test-results" class="test-results"></div>
+  `;
+}
+
+// Tampilkan satu test case, disisipkan sesuai nomor case
+function displayTestResult(testResult) {
+  const container = document.getElementById("test-results");
+  if (!container) return;
+
+  let statusColor = "text-red-600";
+  let statusBg = "bg-red-50 border-red-300";
+  if (testResult.verdict === "AC") {
+    statusColor = "text-green-600";
+    statusBg = "bg-green-50 border-green-300";
+  } else if (testResult.verdict === "SKIPPED") {
+    statusColor = "text-gray-500";
+    statusBg = "bg-gray-50 border-gray-300";
   }
 
-  let html = `
-    <div class="results-summary p-4 border rounded mb-4">
-      <h3 class="font-bold text-lg">Results Summary</h3>
-      <p>Status: <span class="font-semibold">${result.status}</span></p>
-      <p>Total Test Cases: <span class="font-semibold">${result.total_case}</span></p>
-      <p>Passed: <span class="font-semibold text-green-600">${result.total_case_benar}</span></p>
+  const card = document.createElement("div");
+  card.className = `test-result mb-3 p-3 border rounded ${statusBg}`;
+  card.dataset.caseNumber = testResult.case_number;
+  card.innerHTML = `
+    <h4 class="font-semibold ${statusColor}">Test Case ${testResult.case_number} - ${testResult.verdict}</h4>
+    <div class="mt-2 text-sm">
+      <p><strong>Input:</strong> <code>${escapeHtml(testResult.input_data)}</code></p>
+      <p><strong>Expected:</strong> <code>${escapeHtml(testResult.expected_output)}</code></p>
+      <p><strong>Actual:</strong> <code>${escapeHtml(testResult.actual_output)}</code></p>
+      <p><strong>Time:</strong> ${testResult.time_ms}ms | <strong>Memory:</strong> ${testResult.memory_kb}KB${testResult.checker_time_ms ? ` | <strong>Checker:</strong> ${testResult.checker_time_ms}ms` : ''}</p>
+      ${testResult.error_message ? `<pre class="mt-1 text-xs whitespace-pre-wrap">${escapeHtml(testResult.error_message)}</pre>` : ''}
     </div>
-    <div class="test-results">
   `;
 
-  result.results.forEach((testResult, index) => {
-    const statusColor = testResult.passed ? 'text-green-600' : 'text-red-600';
-    const statusBg = testResult.passed ? 'bg-green-50 border-green-300' : 'bg-red-50 border-red-300';
-    
-    html += `
-      <div class="test-result mb-3 p-3 border rounded ${statusBg}">
-        <h4 class="font-semibold ${statusColor}">Test Case ${index + 1} - ${testResult.status.toUpperCase()}</h4>
-        <div class="mt-2 text-sm">
-          <p><strong>Input:</strong> <code>${testResult.input}</code></p>
-          <p><strong>Expected:</strong> <code>${testResult.expected_output}</code></p>
-          <p><strong>Actual:</strong> <code>${testResult.actual_output}</code></p>
-          ${testResult.execution_time ? `<p><strong>Time:</strong> ${testResult.execution_time}ms</p>` : ''}
-        </div>
-      </div>
-    `;
-  });
+  const nextCard = Array.from(container.children)
+    .find(child => Number(child.dataset.caseNumber) > testResult.case_number);
+  container.insertBefore(card, nextCard || null);
 
-  html += '</div>';
-  resultContainer.innerHTML = html;
+  completedTestCount++;
+  const progress = document.getElementById("results-progress");
+  if (progress) progress.textContent = completedTestCount;
 }
 
+// Ringkasan akhir setelah semua test case selesai
+function displaySummary(result) {
+  const summary = document.getElementById("results-summary");
+  if (!summary) return;
+
+  const accepted = result.verdict === "AC";
+  summary.className = `results-summary p-4 border rounded mb-4 ${accepted ? 'bg-green-50 border-green-300' : 'bg-red-50 border-red-300'}`;
+  summary.innerHTML = `
+    <h3 class="font-bold text-lg ${accepted ? 'text-green-700' : 'text-red-700'}">Verdict: ${result.verdict}</h3>
+    <p>Score: <span class="font-semibold">${result.score}/100</span></p>
+    <p>Passed: <span class="font-semibold text-green-600">${result.passed_cases}</span>/${result.total_cases}</p>
+    <p>Max Time: ${result.max_time_ms}ms | Max Memory: ${result.max_memory_kb}KB</p>
+    <p>Compile: ${result.compile_time_ms}ms | Run: ${result.execution_time_ms}ms${result.checker_time_ms ? ` | Checker: ${result.checker_time_ms}ms` : ''}</p>
+    ${result.verdict === "CE" && result.error_message ? `<pre class="mt-2 text-sm whitespace-pre-wrap">${escapeHtml(result.error_message)}</pre>` : ''}
+  `;
+}
   
 
 })
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Worker judging standalone untuk antrian durable (SEKA_JOB_QUEUE=sqlite).
+
+Mengambil submission dari database antrian yang sama dengan proses API
+(SEKA_JOB_QUEUE_DB), menjalankan judge, lalu menulis hasilnya kembali.
+Bisa dijalankan beberapa proses/host sekaligus selama semuanya memakai
+file database yang sama (SQLite/WAL di filesystem lokal atau volume yang
+di-share). SIGTERM/SIGINT: berhenti mengambil job baru dan menyelesaikan
+job yang sedang jalan; job dari worker yang mati diambil ulang setelah
+lease-nya habis.
+
+    python worker.py [--threads 4] [--db data/jobs.sqlite3] [--id worker-1]
+"""
+import argparse, os, signal, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.config import JUDGE_WORKERS, JOB_QUEUE_DB
+from core.container_pool import container_pool
+from core.docker_client import docker_engine
+from core.durable_queue import DurableJobQueue
+from core.judge_engine_v2 import judge_code_v2
+from core.submission_store import submission_store
+from core.log import get_logger, fields, setup_logging, shutdown_logging
+
+log = get_logger("worker")
+
+def main():
+    parser = argparse.ArgumentParser(description="Seka durable queue judge worker")
+    parser.add_argument("--db", default=JOB_QUEUE_DB, help="path database antrian (default SEKA_JOB_QUEUE_DB)")
+    parser.add_argument("--threads", type=int, default=max(1, JUDGE_WORKERS), help="jumlah job yang di-judge bersamaan")
+    parser.add_argument("--id", help="ID worker di kolom worker_id (default hostname:pid)")
+    args = parser.parse_args()
+
+    setup_logging()
+    job_queue = DurableJobQueue(judge_code_v2, path=args.db, worker_count=args.threads, worker_id=args.id)
+
+    def stop(signum, frame):
+        log.info("shutdown, menyelesaikan job yang sedang jalan", extra=fields(signal=signum))
+        job_queue.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    container_pool.start()
+    submission_store.start()
+    log.info("worker start", extra=fields(worker_id=job_queue.worker_id, threads=args.threads, db=args.db))
+    try:
+        job_queue.run_forever()
+    finally:
+        # Tunggu job yang sedang jalan selesai (lease tetap diperpanjang)
+        job_queue.shutdown()
+        submission_store.shutdown()
+        container_pool.shutdown()
+        docker_engine.close()
+        log.info("worker stop", extra=fields(worker_id=job_queue.worker_id))
+        shutdown_logging()
+
+if __name__ == "__main__":
+    main()